@@ -11,6 +11,7 @@ from pynusmv.exception import PyNuSMVError
 
 from pynusmv_tools.arctl.parsing import parseArctl
 from pynusmv_tools.arctl.check import checkArctl
+from pynusmv_tools.utils import fixpoints
 
 from pyparsing import ParseException
 
@@ -107,6 +108,21 @@ class ARCTLshell(cmd.Cmd):
                 print("[ERROR]", e)
                 
                 
+    def do_fixpoint(self, arg):
+        """
+        Set the strategy of least fixpoints (full, frontier or chaining),
+        or print the current one.
+        usage: fixpoint [STRATEGY]
+        """
+        if arg == "":
+            print(fixpoints.get_strategy())
+        else:
+            try:
+                fixpoints.set_strategy(arg)
+            except ValueError as e:
+                print("[ERROR]", e)
+                
+                
     def do_fsm(self, arg):
         """
         Print the path to the currently read FSM.
@@ -7,6 +7,8 @@ from pyparsing import ParseException
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
 
+from ..utils.fixpoints import least_fixpoint
+from ..utils import profiler
 from .parsing import parseArctl
 
 from .ast import (TrueExp, FalseExp,
@@ -111,45 +113,54 @@ def _fp(funct, start):
     
     old = start
     new = funct(start)
+    profiler.iteration(new)
     while old != new:
         old = new
         new = funct(old)
+        profiler.iteration(new)
     return old
     
     
+@profiler.profiled("ex")
 def _ex(fsm, alpha, phi):
     """_ex(a, p) is pre of p through transitions satisfying a"""
     return fsm.pre(phi, alpha)
     
     
+@profiler.profiled("eu")
 def _eu(fsm, alpha, phi, psi):
     """_eu(a, p, q) = muZ. (q | (p & _ex(a, Z)))"""
-    return _fp(lambda Z: (psi | (phi & _ex(fsm, alpha, Z))),
-               BDD.false(fsm.bddEnc.DDmanager))
+    return least_fixpoint(psi, lambda Z: _ex(fsm, alpha, Z), restrict=phi,
+                          name="arctl.eu")
     
     
+@profiler.profiled("eg")
 def _eg(fsm, alpha, phi):
     """_eg(a, p) = nuZ. (p & _ex(a, Z))"""
     return _fp(lambda Z: (phi & _ex(fsm, alpha, Z)),
                BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("eax")
 def eax(fsm, alpha, phi):
     """eax(a, p) = _ex(a, p)"""
     return _ex(fsm, alpha, phi)
     
     
+@profiler.profiled("aax")
 def aax(fsm, alpha, phi):
     """aax(a, p) = _ex(a, true) & ~_ex(a, ~p)"""
     return (_ex(fsm, alpha, BDD.true(fsm.bddEnc.DDmanager)) &
           (~_ex(fsm, alpha, (~phi))))
     
     
+@profiler.profiled("eau")
 def eau(fsm, alpha, phi, psi):
     """eau(a, p, q) = _eu(a, p, q)"""
     return _eu(fsm, alpha, phi, psi)
     
     
+@profiler.profiled("aau")
 def aau(fsm, alpha, phi, psi):
     """aau(a, p, q) = ~_eu(a, ~q, ~q & (~p | ~_ex(a, true))) & ~_eg(a, ~q)"""
     return (
@@ -174,11 +185,13 @@ def aau(fsm, alpha, phi, psi):
            )
     
 
+@profiler.profiled("eaf")
 def eaf(fsm, alpha, phi):
     """eaf(a, p) = _eu(a, true, p)"""
     return _eu(fsm, alpha, BDD.true(fsm.bddEnc.DDmanager), phi)
     
     
+@profiler.profiled("aaf")
 def aaf(fsm, alpha, phi):
     """aaf(a, p) = ~_eu(a, ~p, ~p & ~_ex(a, true)) & ~_eg(a, ~p)"""
     true = BDD.true(fsm.bddEnc.DDmanager)
@@ -195,6 +208,7 @@ def aaf(fsm, alpha, phi):
            )
     
     
+@profiler.profiled("eag")
 def eag(fsm, alpha, phi):
     """eag(a, p) = _eu(a, p, p & ~_ex(a, true)) | _eg(a, p)"""
     return _eu(fsm, alpha, phi, (phi &
@@ -202,17 +216,20 @@ def eag(fsm, alpha, phi):
                 _eg(fsm, alpha, phi))
     
     
+@profiler.profiled("aag")
 def aag(fsm, alpha, phi):
     """aag(a, p) = ~_eu(a, true, ~p)"""
     return ~_eu(fsm, alpha, BDD.true(fsm.bddEnc.DDmanager), ~phi)
 
   
+@profiler.profiled("eaw")
 def eaw(fsm, alpha, phi, psi):
     """eaw(a, p, q) = ~aau(a, ~q, ~p & ~q)"""
     # TODO Discuss this equivalence with Charles
     return ~aau(fsm, alpha, ~psi, (~phi) & (~psi))
     
     
+@profiler.profiled("aaw")
 def aaw(fsm, alpha, phi, psi):    
     # TODO Discuss this equivalence with Charles
     """aaw(a, p, q) = ~eau(a, ~q, ~p & ~q)"""
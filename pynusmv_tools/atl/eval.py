@@ -4,7 +4,8 @@ ATL evaluation functions.
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from .ast import (TrueExp, FalseExp,
                   Atom, Not, And, Or, Implies, Iff,
@@ -105,6 +106,7 @@ def evalATL(fsm, spec):
         return None
               
               
+@profiler.profiled("cex")
 def cex(fsm, agents, phi):
     """
     Return the set of states of fsm satisfying <agents> X phi.
@@ -116,6 +118,7 @@ def cex(fsm, agents, phi):
     return fsm.pre_strat(phi, agents)
     
 
+@profiler.profiled("ceu")
 def ceu(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying <agents>[phi U psi].
@@ -129,6 +132,7 @@ def ceu(fsm, agents, phi, psi):
               BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew")
 def cew(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying <agents>[phi W psi].
@@ -142,6 +146,7 @@ def cew(fsm, agents, phi, psi):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg")
 def ceg(fsm, agents, phi):
     """
     Return the set of states of fsm satisfying <agents> G phi.
@@ -1,11 +1,55 @@
 """
 AST classes for ATLK formulas representation.
+
+ASTs are hash-consed: building a formula structurally equal to an existing
+one returns the existing object. Formulas keep identity-based equality and
+hashing, but equal sub-formulas of different formulas are the same object,
+and thus share the entries of caches keyed on formulas.
 """
 
 from collections import namedtuple
+from inspect import signature
+from weakref import WeakValueDictionary
+
+# The existing formulas, indexed by their class and arguments
+_specs = WeakValueDictionary()
+
+def _key(arg):
+    """
+    Return a hashable key for arg, a constructor argument of a Spec:
+    either a Spec, a string, or a group (an iterable of Atoms).
+    """
+    if isinstance(arg, (Spec, str)):
+        return arg
+    else:
+        return tuple(arg)
+
+class _HashConsed(type):
+    """
+    Metaclass of Spec, returning the existing equal formula if any.
+    Keyword arguments are accepted, and bound to the positional ones first,
+    such that Not(child=p) and Not(p) are the same formula.
+    """
+    def __call__(cls, *args, **kwargs):
+        if kwargs:
+            bound = signature(cls.__init__).bind(None, *args, **kwargs)
+            if bound.kwargs:
+                raise TypeError(cls.__name__ + "() got unexpected keyword "
+                                "arguments " + ", ".join(bound.kwargs) + ".")
+            args = bound.args[1:]
+        key = (cls,) + tuple(_key(arg) for arg in args)
+        spec = _specs.get(key)
+        if spec is None:
+            spec = super(_HashConsed, cls).__call__(*args)
+            spec._args = key[1:]
+            _specs[key] = spec
+        return spec
 
-class Spec:
+class Spec(metaclass=_HashConsed):
     """A Spec is represents a ATLK formula."""
+    def __reduce__(self):
+        # Unpickled formulas are rebuilt, and thus hash-consed, as well
+        return (type(self), self._args)
     def subformulas(self):
         """Return the set of sub-formulas of this formula, including itself."""
         raise NotImplementedError("Should be implemented by subclasses.")
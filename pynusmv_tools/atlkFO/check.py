@@ -6,6 +6,8 @@ from .parsing import parseATLK
 from .eval import evalATLK
 from pyparsing import ParseException
 from pynusmv.exception import PyNuSMVError
+
+from ..utils import fixpoints
     
     
 def check(mas, spec):
@@ -35,7 +37,13 @@ def process(allargs):
     parser.add_argument('model', help='the MAS as an SMV model')
     parser.add_argument('-p', dest='property', help='the property check',
                         default=None)
+    parser.add_argument('-fp', dest='fixpoint',
+                        choices=fixpoints.STRATEGIES,
+                        help='the strategy of least fixpoints '
+                             '(default: full)',
+                        default="full")
     args = parser.parse_args(allargs)
+    fixpoints.set_strategy(args.fixpoint)
     
     # Initialize the model
     glob.load_from_file(args.model)
@@ -4,8 +4,11 @@ ATLK with full observability evaluation functions.
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 
+from ..utils.fairness import memoize_fair_states
+from ..utils.fixpoints import least_fixpoint
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 from .ast import (TrueExp, FalseExp, Init, Reachable,
                   Atom, Not, And, Or, Implies, Iff, 
                   AF, AG, AX, AU, AW, EF, EG, EX, EU, EW,
@@ -210,15 +213,19 @@ def evalATLK(fsm, spec):
         print("[ERROR] evalATLK: unrecognized specification type", spec)
         return None
     
+@profiler.profiled("fair_states")
+@memoize_fair_states
 def fair_states(fsm):
     """
     Return the set of fair states of the model.
+    The result is memoized per model (see pynusmv_tools.utils.fairness).
     
     fsm - the model
     """
     return eg(fsm, BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ex")
 def ex(fsm, phi):
     """
     Return the set of states of fsm satisfying EX phi.
@@ -231,6 +238,7 @@ def ex(fsm, phi):
     return fsm.pre(phi & fair_states(fsm))
     
     
+@profiler.profiled("eg")
 def eg(fsm, phi):
     """
     Return the set of states of fsm satisfying EG phi.
@@ -265,6 +273,7 @@ def eg(fsm, phi):
                 .forsome(fsm.bddEnc.inputsCube))
     
     
+@profiler.profiled("eu")
 def eu(fsm, phi, psi):
     """
     Return the set of states of fsm satisfying E[ phi U psi ].
@@ -276,11 +285,12 @@ def eu(fsm, phi, psi):
     
     phi = phi.forsome(fsm.bddEnc.inputsCube) & fsm.bddEnc.statesMask
     psi = psi.forsome(fsm.bddEnc.inputsCube) & fsm.bddEnc.statesMask
-    return fp(lambda X : (psi & fair_states(fsm) & fsm.reachable_states) |
-                               (phi & ex(fsm, X)),
-                    BDD.false(fsm.bddEnc.DDmanager))
+    return least_fixpoint(psi & fair_states(fsm) & fsm.reachable_states,
+                          lambda X : ex(fsm, X), restrict=phi,
+                          name="atlkFO.eu")
     
     
+@profiler.profiled("nk")
 def nk(fsm, agent, phi):
     """
     Return the set of states of fsm satisfying nK<'agent'> phi
@@ -296,6 +306,7 @@ def nk(fsm, agent, phi):
                                  frozenset({agent}))
     
 
+@profiler.profiled("ne")
 def ne(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nE<group> phi
@@ -313,6 +324,7 @@ def ne(fsm, group, phi):
     return result
     
     
+@profiler.profiled("nd")
 def nd(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nD<group> phi
@@ -325,6 +337,7 @@ def nd(fsm, group, phi):
                                  frozenset(group))
     
     
+@profiler.profiled("nc")
 def nc(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nC<group> phi
@@ -341,6 +354,7 @@ def nc(fsm, group, phi):
               BDD.false(fsm.bddEnc.DDmanager))
               
               
+@profiler.profiled("cax")
 def cax(fsm, agents, phi):
     """
     Return the set of states of fsm satisfying [agents] X phi.
@@ -352,6 +366,7 @@ def cax(fsm, agents, phi):
     return fsm.pre_nstrat(phi & fair_gamma_states(fsm, agents), agents)
     
 
+@profiler.profiled("cau")
 def cau(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying [agents][phi U psi].
@@ -366,6 +381,7 @@ def cau(fsm, agents, phi, psi):
               BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("caw")
 def caw(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying [agents][phi W psi].
@@ -393,6 +409,7 @@ def caw(fsm, agents, phi, psi):
         return fp(inner, BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("cag")
 def cag(fsm, agents, phi):
     """
     Return the set of states of fsm satisfying [agents] G phi.
@@ -417,6 +434,7 @@ def cag(fsm, agents, phi):
     
     
 __fair_gamma_states = {}
+@profiler.profiled("fair_gamma_states")
 def fair_gamma_states(fsm, agents):
     """
     Return the set of states in which agents cannot avoid a fair path.
@@ -436,6 +454,7 @@ def fair_gamma_states(fsm, agents):
     #return _fair_gamma_states[agents]
     
     
+@profiler.profiled("cex")
 def cex(fsm, agents, phi):
     """
     Return the set of states of fsm satisfying <agents> X phi.
@@ -449,6 +468,7 @@ def cex(fsm, agents, phi):
     return fsm.pre_strat(phi | nfair_gamma_states(fsm, agents), agents)
     
 
+@profiler.profiled("ceu")
 def ceu(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying <agents>[phi U psi].
@@ -480,6 +500,7 @@ def ceu(fsm, agents, phi, psi):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew")
 def cew(fsm, agents, phi, psi):
     """
     Return the set of states of fsm satisfying [agents][phi W psi].
@@ -500,6 +521,7 @@ def cew(fsm, agents, phi, psi):
     
     
 __nfair_gamma_states = {}
+@profiler.profiled("nfair_gamma_states")
 def nfair_gamma_states(fsm, agents):
     """
     Return the set of states in which agents cann avoid fair paths.
@@ -22,6 +22,9 @@ Top-level parameters are sub-parameters of config.
         threshold (int): the threshold for early termination with threshold
     caching (boolean): whether or not caching states satisfying or not
                        sub-formulas
+    caching_budget (int): the maximal number of BDD nodes kept by the cache
+                          of sub-formulas, least recently used entries being
+                          evicted first; None for no bound
     filtering (boolean): activate filtering
     separation: separating Z states into sub-sets to check one at a time
         type (string): type of separation
@@ -29,6 +32,13 @@ Top-level parameters are sub-parameters of config.
             - random: pick a random state in Z and take its equivalence class
             - reach: pick first reachable state from initial ones and take
                      its equivalence class
+    parallel: parallel exploration of uniform strategies (generator
+              implementation, SF variant)
+        processes (int): the maximal number of processes exploring the
+                         strategies, at most one by split of the first
+                         conflicting equivalence class; None or 1 for no
+                         parallel exploration
+        model (string): the path to the SMV model, loaded by every process
     garbage: explicit call to garbage collection
         type (string): type to garbage collection calls
             - None: no explicit call to garbage collection
@@ -99,6 +109,11 @@ config.partial.early.threshold = 0.75
 # Whether or not perform caching through accumulation of truth values
 config.partial.caching = False
 
+# Maximal number of BDD nodes kept in the cache; the least recently used
+# sub-formulas are forgotten (and recomputed when needed) above this bound.
+# None for an unbounded cache
+config.partial.caching_budget = None
+
 
 # Pre-filtering out losing moves
 # ------------------------------
@@ -130,4 +145,17 @@ config.partial.alternate = AttrDict()
 #   univ: perform universal filtering
 #   strat: perform full-observability-based filtering
 # This parameter should contain at least one of the two values
-config.partial.alternate.type = {"univ", "strat"}
\ No newline at end of file
+config.partial.alternate.type = {"univ", "strat"}
+
+
+# ----------------------------------------------------------
+# Parallel exploration of strategies related variables
+# ----------------------------------------------------------
+config.parallel = AttrDict()
+
+# Number of processes exploring the uniform strategies in parallel
+# (generator implementation, SF variant); None or 1 for no parallelism
+config.parallel.processes = None
+
+# Path to the SMV model of the system, loaded by each process
+config.parallel.model = None
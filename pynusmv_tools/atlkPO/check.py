@@ -1,8 +1,14 @@
 import sys
 import argparse
+import time
+from contextlib import contextmanager
+from functools import reduce
 from pynusmv.init import init_nusmv, deinit_nusmv
 from ..mas import glob
 from ..atlkFO.parsing import parseATLK
+from ..atlkFO.ast import (Spec, EX, AX, EF, EG, EU, EW, AF, AG, AU, AW,
+                          nK, nE, nD, nC, K, E, D, C,
+                          CEX, CEF, CEG, CEU, CEW, CAX, CAF, CAG, CAU, CAW)
 from .eval import evalATLK as evalATLK_naive
 from .evalGen import evalATLK as evalATLK_gen
 from .evalOpt import evalATLK as evalATLK_opt
@@ -11,9 +17,12 @@ from .evalSymb import evalATLK as evalATLK_symb
 from .evalPartial import evalATLK as evalATLK_partial
 from .evalGenSI import evalATLK as evalATLK_genSI
 from .evalPartialSI import evalATLK as evalATLK_partialSI
+from .evalPartial import reach, get_equiv_class, agents_in_group
 from pyparsing import ParseException
 from pynusmv.exception import PyNuSMVError
 
+from ..utils import fairness, cache, fixpoints
+from ..utils.results import ResultCache
 from . import config
 
 __implementations = {"naive" : evalATLK_naive,
@@ -68,6 +77,169 @@ def check(mas, spec, variant="SF", semantics="group", implem="generator"):
     else:
         sat = evalATLK_gen(mas, spec, variant=variant)
     return (~sat & mas.bddEnc.statesInputsMask & mas.init).is_false()
+
+def check_batch(mas, specs, variant="SF", semantics="group",
+                implem="generator"):
+    """
+    Check all the ATLK specifications of specs on the system and return
+    the list of (spec, satisfied, seconds) triples, in the order of specs.
+    
+    mas -- the system
+    specs -- a list of AST-based specifications
+    variant, semantics, implem -- as for check
+    
+    The specifications form one DAG of sub-formulas, equal sub-formulas of
+    different specifications being the same node since formulas are
+    hash-consed. Every strategic node of the DAG is evaluated once, children
+    first, before checking the specifications:
+    * "partial" and "partialSI" evaluate a formula on the states it is needed
+      for; a strategic node is evaluated on the union of the states all its
+      parents need, propagated down the DAG from the initial states, and the
+      results are kept by their cache, enabled during the whole batch;
+    * the other implementations evaluate formulas on all states; a strategic
+      node is evaluated once and its result is reused by all its parents
+      during the batch.
+    The seconds of a specification do not include the evaluation of its
+    strategic sub-formulas, shared with the other specifications.
+    """
+    if implem not in __implementations:
+        implem = "generator"
+    evaluate = __implementations[implem]
+    nodes = _dag(specs)
+    strategic = [node for node in reversed(nodes)
+                 if type(node) in _STRATEGIC]
+    
+    if implem in _DEMAND_DRIVEN:
+        demand = {spec: mas.init for spec in specs}
+        for node in nodes:
+            states = _children_states(mas, node, demand[node], semantics)
+            for child in _children(node):
+                if child in demand:
+                    demand[child] = demand[child] | states
+                else:
+                    demand[child] = states
+        
+        caching = config.partial.caching
+        config.partial.caching = True
+        try:
+            for node in strategic:
+                evaluate(mas, node, demand[node], variant=variant,
+                         semantics=semantics)
+            results = {}
+            for spec in set(specs):
+                start = time.time()
+                satisfied = check(mas, spec, variant=variant,
+                                  semantics=semantics, implem=implem)
+                results[spec] = (satisfied, time.time() - start)
+        finally:
+            config.partial.caching = caching
+    
+    else:
+        with _memoized(sys.modules[evaluate.__module__]) as evaluate:
+            for node in strategic:
+                evaluate(mas, node, variant=variant, semantics=semantics)
+            results = {}
+            for spec in set(specs):
+                start = time.time()
+                sat = evaluate(mas, spec, variant=variant, semantics=semantics)
+                satisfied = (~sat & mas.bddEnc.statesInputsMask &
+                             mas.init).is_false()
+                results[spec] = (satisfied, time.time() - start)
+    
+    return [(spec,) + results[spec] for spec in specs]
+
+# The implementations evaluating formulas on the states they are needed for
+_DEMAND_DRIVEN = {"partial", "partialSI"}
+
+_STRATEGIC = {CEX, CEF, CEG, CEU, CEW, CAX, CAF, CAG, CAU, CAW}
+
+def _children(spec):
+    """Return the direct sub-formulas of spec."""
+    return [getattr(spec, name) for name in ("child", "left", "right")
+            if isinstance(getattr(spec, name, None), Spec)]
+
+def _dag(specs):
+    """
+    Return the nodes of the DAG of sub-formulas of specs, every node before
+    all its sub-formulas.
+    """
+    order = []
+    visited = set()
+    for spec in specs:
+        stack = [(spec, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+            elif node not in visited:
+                visited.add(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in _children(node))
+    order.reverse()
+    return order
+
+def _children_states(mas, spec, states, semantics):
+    """
+    Return a superset of the states the sub-formulas of spec are evaluated on
+    by evalPartial, when evaluating spec on states. A state missed here is
+    only evaluated later, when it is needed.
+    """
+    if type(spec) in {EX, AX}:
+        return mas.post(states)
+    
+    elif type(spec) in {EF, EG, EU, EW, AF, AG, AU, AW}:
+        return reach(mas, states)
+    
+    elif type(spec) in {nK, K}:
+        return mas.equivalent_states(states, frozenset({spec.agent.value}))
+    
+    elif type(spec) in {nD, D}:
+        return mas.equivalent_states(states,
+                                     frozenset(a.value for a in spec.group))
+    
+    elif type(spec) in {nE, E, nC, C}:
+        return get_equiv_class(mas, {a.value for a in spec.group}, states,
+                               semantics="individual")
+    
+    elif type(spec) in _STRATEGIC:
+        # As eval_strat, extend with equivalent states, then the strategies
+        # reach sub-formulas from them
+        agents = {atom.value for atom in spec.group}
+        if semantics == "individual":
+            agents = reduce(lambda a, b: a | b,
+                            (agents_in_group(mas, group) for group in agents))
+            for agent in agents:
+                states = states | get_equiv_class(mas, {agent}, states,
+                                                  semantics="group")
+        else:
+            states = get_equiv_class(mas, agents, states, semantics=semantics)
+        return reach(mas, states)
+    
+    else:
+        return states
+
+@contextmanager
+def _memoized(module):
+    """
+    Memoize the evalATLK function of module, an implementation evaluating
+    formulas on all states, in the context; its recursive calls are memoized
+    as well.
+    
+    Yield the memoized function.
+    """
+    original = module.evalATLK
+    memo = {}
+    def evalATLK(fsm, spec, variant="SF", semantics="group"):
+        key = (spec, variant, semantics)
+        if key not in memo:
+            memo[key] = original(fsm, spec, variant=variant,
+                                 semantics=semantics)
+        return memo[key]
+    module.evalATLK = evalATLK
+    try:
+        yield evalATLK
+    finally:
+        module.evalATLK = original
     
 def process(allargs):
     """
@@ -83,8 +255,14 @@ def process(allargs):
     parser = argparse.ArgumentParser(description='ATLK model checker.')
     # Populate arguments: for now, only the model
     parser.add_argument('model', help='the MAS as an SMV model')
-    parser.add_argument('-p', dest='property', help='the property check',
-                        default=None)
+    properties = parser.add_mutually_exclusive_group()
+    properties.add_argument('-p', dest='property',
+                            help='the property check',
+                            default=None)
+    properties.add_argument('-b', dest='batch',
+                            help='a file of properties to check together, '
+                                 'one by line',
+                            default=None)
     parser.add_argument('-v', dest='variant',
                         help='the variant to use (SF, FS, FSF)',
                         default="SF")
@@ -105,25 +283,81 @@ def process(allargs):
                         default=None)
     parser.add_argument('-pc', dest='caching', help='activate caching',
                         action='store_true', default=False)
+    parser.add_argument('-pcb', dest='caching_budget', type=int,
+                        help='maximal number of BDD nodes kept in cache '
+                             '(default: None)',
+                        default=None)
     parser.add_argument('-pf', dest='filtering', help='activate filtering',
                         action='store_true', default=False)
     parser.add_argument('-ps', dest='separation',
                         help='activate separation of states for partial '
                              'strategies: random, reach (default: None)',
                         default=None)
+    parser.add_argument('-j', dest='processes', type=int,
+                        help='maximal number of processes exploring '
+                             'strategies in parallel (generator '
+                             'implementation), at most one by split of the '
+                             'first conflicting equivalence class '
+                             '(default: None)',
+                        default=None)
     parser.add_argument('-g', dest='garbage',
                         help='activate explicit garbage collection: '
                         'each or step (int) (default: None)', default=None)
+    parser.add_argument('-cache', dest='cache',
+                        help='the directory of the results cache '
+                             '(default: None)',
+                        default=None)
+    parser.add_argument('-pj', dest='projection',
+                        help='compute equivalent states by projection '
+                             'instead of epistemic relations '
+                             '(default: deactivated)',
+                        action='store_true', default=False)
+    parser.add_argument('-pt', dest='partitioned',
+                        help='use a partitioned transition relation for '
+                             'strategic pre-images (default: deactivated)',
+                        action='store_true', default=False)
+    parser.add_argument('-fp', dest='fixpoint',
+                        choices=fixpoints.STRATEGIES,
+                        help='the strategy of least fixpoints '
+                             '(default: full)',
+                        default="full")
     
     
     args = parser.parse_args(allargs)
     
-    # Initialize the model
-    glob.load_from_file(args.model)
-    mas = glob.mas()
+    # Initialize the model only when needed, cached results do not need it
+    def get_mas():
+        nonlocal mas
+        if mas is None:
+            glob.load_from_file(args.model)
+            mas = glob.mas(projection=args.projection)
+            mas.partitioned = args.partitioned
+        return mas
+    mas = None
+    
+    # Results cache, keyed by the model, specification and algorithm
+    if args.cache is not None:
+        results = ResultCache(args.cache)
+        with open(args.model, "rb") as f:
+            model = f.read()
+        def key(spec):
+            return results.key(model, "atlk_po", str(spec), args.variant,
+                               "group", args.implementation)
+    
+    def check_cached(spec):
+        if args.cache is not None:
+            satisfied = results.get(key(spec))
+            if satisfied is not None:
+                return satisfied
+        satisfied = check(get_mas(), spec, variant=args.variant,
+                          implem=args.implementation)
+        if args.cache is not None:
+            results.put(key(spec), satisfied)
+        return satisfied
     
     # Configure model checking
     config.debug = args.debug
+    fixpoints.set_strategy(args.fixpoint)
     try:
         config.garbage.step = int(args.garbage)
         config.garbage.type = "step"
@@ -135,8 +369,11 @@ def process(allargs):
     except:
         config.partial.early.type = args.early
     config.partial.caching = args.caching
+    config.partial.caching_budget = args.caching_budget
     config.partial.filtering = args.filtering
     config.partial.separation.type = args.separation
+    config.parallel.processes = args.processes
+    config.parallel.model = args.model
     
     # Warnings for FS variant with partial implementation
     if args.variant == "FS" and args.implementation == "partial":
@@ -148,13 +385,56 @@ def process(allargs):
         if not config.partial.filtering:
             print("Warning: filtering is always used for partial FS variant.")
     
+    # Check given batch of properties, if any
+    if args.batch:
+        specs = []
+        with open(args.batch, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    specs.append(parseATLK(line)[0])
+                except ParseException as e:
+                    print("[ERROR] Cannot parse specification:", str(e))
+        try:
+            start = time.time()
+            cached = {}
+            if args.cache is not None:
+                for spec in specs:
+                    satisfied = results.get(key(spec))
+                    if satisfied is not None:
+                        cached[spec] = satisfied
+            unknown = [spec for spec in specs if spec not in cached]
+            checked = iter(check_batch(get_mas(), unknown,
+                                       variant=args.variant,
+                                       implem=args.implementation)
+                           if unknown else [])
+            for spec in specs:
+                if spec in cached:
+                    satisfied, seconds = cached[spec], 0
+                else:
+                    _, satisfied, seconds = next(checked)
+                    if args.cache is not None:
+                        results.put(key(spec), satisfied)
+                print('Specification', str(spec), 'is', str(satisfied),
+                      '({:.3f}s)'.format(seconds))
+            print('Checked', len(specs), 'specifications in',
+                  '{:.3f}s'.format(time.time() - start))
+            if config.debug:
+                print("Fair states cache:", fairness.stats())
+                print("Sub-formulas caches:", cache.stats())
+        except PyNuSMVError as e:
+            print("[ERROR]", str(e))
+    
     # Check given property, if any
-    if args.property:
+    elif args.property:
         try:
             spec = parseATLK(args.property)[0]
-            satisfied = check(mas, spec, variant=args.variant,
-                              implem=args.implementation)
+            satisfied = check_cached(spec)
             print('Specification', str(spec), 'is', str(satisfied))
+            if config.debug:
+                print("Fair states cache:", fairness.stats())
+                print("Sub-formulas caches:", cache.stats())
         except ParseException as e:
             print("[ERROR] Cannot parse specification:", str(e))
         except PyNuSMVError as e:
@@ -167,9 +447,11 @@ def process(allargs):
             try:
                 spec = parseATLK(line)[0]
             
-                satisfied = check(mas, spec, variant=args.variant,
-                                  implem=args.implementation)
+                satisfied = check_cached(spec)
                 print('Specification', str(spec), 'is', str(satisfied))
+                if config.debug:
+                    print("Fair states cache:", fairness.stats())
+                    print("Sub-formulas caches:", cache.stats())
             except ParseException as e:
                 print("[ERROR] Cannot parse specification:", str(e))
             except PyNuSMVError as e:
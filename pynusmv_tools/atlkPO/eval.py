@@ -4,7 +4,6 @@ ATLK with partial observability evaluation functions.
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 from pynusmv.exception import PyNuSMVError
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
@@ -15,6 +14,9 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           
 
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 
 def evalATLK(fsm, spec, variant="SF", semantics="group"):
@@ -184,6 +186,7 @@ def evalATLK(fsm, spec, variant="SF", semantics="group"):
 
 
 
+@profiler.profiled("cex")
 def cex(fsm, agents, phi, strat=None):
     """
     Return the set of states of strat satisfying <agents> X phi
@@ -200,6 +203,7 @@ def cex(fsm, agents, phi, strat=None):
     return fsm.pre_strat(phi | nfair, agents, strat)
     
 
+@profiler.profiled("ceu")
 def ceu(fsm, agents, phi, psi, strat=None):
     """
     Return the set of states of strat satisfying <agents>[phi U psi]
@@ -234,6 +238,7 @@ def ceu(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew")
 def cew(fsm, agents, phi, psi, strat=None):
     """
     Return the set of states of strat satisfying <agents>[phi W psi]
@@ -254,6 +259,7 @@ def cew(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg")
 def ceg(fsm, agents, phi, strat=None):
     """
     Return the set of states of strat satisfying <agents> G phi
@@ -272,6 +278,7 @@ def ceg(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma")
 def nfair_gamma(fsm, agents, strat=None):
     """
     Return the set of states of strat
@@ -298,6 +305,7 @@ def nfair_gamma(fsm, agents, strat=None):
             return res
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
         
+@profiler.profiled("split")
 def split(fsm, strats, gamma):
     """
     Split strats into all its non-conflicting greatest subsets.
@@ -358,6 +366,7 @@ def eval_strat(fsm, spec):
     nbstrats = 0
     for strat in strats:
         nbstrats += 1
+        counters.increment("strategies")
         if type(spec) is CEX:
 #            winning = cex(fsm, agents, evalATLK(fsm, spec.child), strat)
             winning = cex_si(fsm, agents,
@@ -460,6 +469,7 @@ def eval_strat(fsm, spec):
 
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -480,6 +490,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi U psi]
@@ -521,6 +532,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi W psi]
@@ -547,6 +559,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -570,6 +583,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -735,6 +749,8 @@ def eval_strat_improved(fsm, spec, strat=None):
         return sat
 
 
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, strat=None, variant="SF"):
     """
     Returns the subset SA of strat (or the whole system if strat is None),
@@ -843,6 +859,7 @@ def eval_strat_FSF(fsm, spec):
     nbstrats = 0
     for strat in strats:
         nbstrats += 1
+        counters.increment("strategies")
         # Second filtering
         winning = filter_strat(fsm, spec, strat, variant="FSF")
         
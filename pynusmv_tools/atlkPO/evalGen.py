@@ -6,13 +6,19 @@ decrease the memory consumption of the implementation.
 """
 
 import gc
+import multiprocessing
 from functools import reduce
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
+from pynusmv.init import init_nusmv
 
+from ..mas import glob
 from ..mas.mas import Agent, Group
+from ..utils import dump, cache, fixpoints
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           Atom, Not, And, Or, Implies, Iff, 
@@ -268,6 +274,7 @@ def evalATLK(fsm, spec, variant="SF", semantics="group"):
 
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -288,6 +295,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi U psi]
@@ -329,6 +337,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi W psi]
@@ -355,6 +364,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -378,6 +388,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -603,6 +614,7 @@ def split_one(fsm, strats, gamma, semantics="group"):
         yield (common, strats, strats)
 
 
+@profiler.profiled("split")
 def split(fsm, strats, gamma, semantics="group"):
     """
     Split strats into all its non-conflicting greatest subsets.
@@ -627,6 +639,30 @@ def split(fsm, strats, gamma, semantics="group"):
                 yield (common | strat | splitted)
 
 
+def split_share(fsm, splits, gamma, semantics="group"):
+    """
+    Split a share of the non-conflicting greatest subsets of some strats.
+    
+    fsm -- the model
+    splits -- a list of (common, split, rest) triples generated by
+              split_one(fsm, strats, gamma, semantics=semantics)
+    gamma -- a set of agents of fsm
+    semantics -- the semantic to use for splitting (group or individual)
+    
+    Disjoint sublists of the triples of split_one (computed once) thus
+    generate disjoint shares of the subsets generated by split.
+    
+    Return a generator of the non-conflicting greatest subsets of strats
+    built upon the given splits.
+    
+    """
+    for common, splitted, rest in splits:
+        for strat in split(fsm, rest, gamma, semantics=semantics):
+            yield (common | strat | splitted)
+
+
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, strat=None, variant="SF", semantics="group"):
     """
     Returns the subset SA of strat (or the whole system if strat is None),
@@ -744,27 +780,52 @@ def agents_in_group(fsm, group):
     return agents
 
 
-def eval_strat(fsm, spec, semantics="group"):
+def _strategic_protocol(fsm, spec, semantics="group"):
     """
-    Return the BDD representing the set of states of fsm satisfying spec.
-    spec is a strategic operator <G> pi.
+    Return the agents of the strategic operator spec and their protocol,
+    restricted to reachable states to avoid splitting useless equivalence
+    classes.
     
     fsm -- a MAS representing the system;
     spec -- an AST-based ATLK specification with a top strategic operator.
     semantics -- the semantics to use (group or individual)
     
     """
-    sat = BDD.false(fsm.bddEnc.DDmanager)
     agents = {atom.value for atom in spec.group}
     
     if semantics == "individual":
         agents = reduce(lambda a, b: a | b,
                         (agents_in_group(fsm, group) for group in agents))
     
-    # Restrict protocol to reachable states to avoid splitting useless
-    # equivalence classes
-    protocol = fsm.protocol(agents) & fsm.reachable_states
-    strats = split(fsm, protocol, agents, semantics=semantics)
+    return agents, fsm.protocol(agents) & fsm.reachable_states
+
+
+def eval_strat(fsm, spec, semantics="group", splits=None):
+    """
+    Return the BDD representing the set of states of fsm satisfying spec.
+    spec is a strategic operator <G> pi.
+    
+    fsm -- a MAS representing the system;
+    spec -- an AST-based ATLK specification with a top strategic operator.
+    semantics -- the semantics to use (group or individual)
+    splits -- if not None, a list of triples of split_one for the protocol
+              of the agents of spec: only the strategies built upon them
+              are considered (see split_share).
+    
+    If splits is None and config.parallel.processes is greater than 1,
+    the strategies are explored in parallel (see eval_strat_parallel).
+    
+    """
+    if (splits is None and config.parallel.processes is not None and
+        config.parallel.processes > 1 and config.parallel.model is not None):
+        return eval_strat_parallel(fsm, spec, semantics=semantics)
+    
+    sat = BDD.false(fsm.bddEnc.DDmanager)
+    agents, protocol = _strategic_protocol(fsm, spec, semantics=semantics)
+    if splits is None:
+        strats = split(fsm, protocol, agents, semantics=semantics)
+    else:
+        strats = split_share(fsm, splits, agents, semantics=semantics)
     nbstrats = 0
     
     if config.debug:
@@ -774,6 +835,7 @@ def eval_strat(fsm, spec, semantics="group"):
     
     for strat in strats:
         nbstrats += 1
+        counters.increment("strategies")
         winning = (filter_strat(fsm, spec, strat, variant="SF").
                     forsome(fsm.bddEnc.inputsCube))
         sat = sat | all_equiv_sat(fsm, winning, agents, semantics=semantics)
@@ -795,6 +857,99 @@ def eval_strat(fsm, spec, semantics="group"):
     return sat
 
 
+def _eval_strat_share(args):
+    """
+    Evaluate a share of the strategies for spec in a fresh NuSMV instance
+    and return the satisfying states, dumped with utils.dump.
+    
+    args -- a (model, spec, semantics, data, settings) tuple where model is
+            the path to the SMV model of the system, data the dump of the
+            triples of split_one of the share, and settings the parameters
+            of the parent process (see _settings).
+    """
+    model, spec, semantics, data, settings = args
+    # Spawned processes start with the default configuration
+    config.debug = settings["debug"]
+    config.garbage.update(settings["garbage"])
+    fixpoints.set_strategy(settings["fixpoint"])
+    for name, budget in settings["budgets"].items():
+        cache.set_budget(budget, prefix=name)
+    with init_nusmv():
+        glob.load_from_file(model)
+        fsm = glob.mas(projection=settings["projection"])
+        fsm.partitioned = settings["partitioned"]
+        fsm.image_caching = settings["image_caching"]
+        bdds = dump.loads(fsm, data)
+        splits = [tuple(bdds[i:i + 3]) for i in range(0, len(bdds), 3)]
+        sat = eval_strat(fsm, spec, semantics=semantics, splits=splits)
+        data = dump.dumps(fsm, [sat])
+        del sat, splits, bdds
+        glob.reset_globals()
+    return data
+
+
+def _settings(fsm):
+    """
+    Return the parameters of this process the processes exploring shares of
+    strategies need: the debug and garbage parameters of config, the
+    fixpoint strategy, the budgets of caches, and the projection,
+    partitioned and image_caching attributes of fsm.
+    """
+    return {"debug": config.debug, "garbage": dict(config.garbage),
+            "fixpoint": fixpoints.get_strategy(),
+            "budgets": cache.budgets(),
+            "projection": fsm.projection, "partitioned": fsm.partitioned,
+            "image_caching": fsm.image_caching}
+
+
+def eval_strat_parallel(fsm, spec, semantics="group"):
+    """
+    Return the BDD representing the set of states of fsm satisfying spec.
+    spec is a strategic operator <G> pi.
+    
+    The triples of split_one for the protocol of the agents of spec are
+    computed once, in this process, and dealt into config.parallel.processes
+    shares (see split_share), each of them being explored by a separate
+    process loading config.parallel.model, the path to the SMV model of fsm.
+    The shares are sent as dumps, in which variables are identified by their
+    names: they do not depend on the variables order of the processes.
+    The processes use the same settings as this one (see _settings).
+    
+    The strategies are dealt by splits of the first conflicting equivalence
+    class: at most as many processes as there are such splits are used,
+    whatever config.parallel.processes.
+    
+    fsm -- a MAS representing the system;
+    spec -- an AST-based ATLK specification with a top strategic operator.
+    semantics -- the semantics to use (group or individual)
+    
+    """
+    agents, protocol = _strategic_protocol(fsm, spec, semantics=semantics)
+    splits = list(split_one(fsm, protocol, agents, semantics=semantics))
+    shares = min(config.parallel.processes, len(splits))
+    settings = _settings(fsm)
+    tasks = [(config.parallel.model, spec, semantics,
+              dump.dumps(fsm, [bdd for triple in splits[share::shares]
+                                   for bdd in triple]),
+              settings)
+             for share in range(shares)]
+    if config.debug:
+        print("Eval strategies (SF): {} processes for {} splits"
+              .format(shares, len(splits)))
+    del splits
+    
+    # Spawned processes do not inherit the NuSMV instance of this one
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(shares) as pool:
+        results = pool.map(_eval_strat_share, tasks)
+    
+    sat = BDD.false(fsm.bddEnc.DDmanager)
+    for data in results:
+        sat = sat | dump.loads(fsm, data)[0]
+    
+    return sat
+
+
 def eval_strat_improved(fsm, spec, toSplit=None, toKeep=None,
                         semantics="group"):
     """
@@ -848,6 +1003,7 @@ def eval_strat_improved(fsm, spec, toSplit=None, toKeep=None,
             sat = sat | all_equiv_sat(fsm, common, agents, semantics=semantics)
             global __strategies
             __strategies[spec] += 1
+            counters.increment("strategies")
             
             # Collect to avoid memory overflow
             if (config.garbage.type == "each" or
@@ -908,6 +1064,7 @@ def eval_strat_FSF(fsm, spec, semantics="group"):
     nbstrats = 0
     for strat in split(fsm, winning, agents, semantics=semantics):
         nbstrats += 1
+        counters.increment("strategies")
         
         if config.debug and nbstrats % 1000 == 0:
             print("Eval strategies (FSF): {} strateg{} checked so far"
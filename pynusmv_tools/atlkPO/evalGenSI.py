@@ -10,7 +10,6 @@ from functools import reduce
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 from pynusmv.exception import PyNuSMVError
 
 from ..mas.mas import Agent, Group
@@ -23,6 +22,9 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           
 
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from . import config
 
@@ -259,6 +261,7 @@ def evalATLK(fsm, spec, variant="SF", semantics="group"):
 
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -279,6 +282,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi U psi]
@@ -320,6 +324,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi W psi]
@@ -346,6 +351,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -369,6 +375,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -497,6 +504,7 @@ def split_one(fsm, strats, gamma):
         yield (common, strats, strats)
 
 
+@profiler.profiled("split")
 def split(fsm, strats, gamma, semantics="group"):
     """
     Split strats into all its non-conflicting greatest subsets.
@@ -530,6 +538,8 @@ def split(fsm, strats, gamma, semantics="group"):
                     yield (common | strat | splitted)
 
 
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, strat=None, variant="SF", semantics="group"):
     """
     Returns the subset SA of strat (or the whole system if strat is None),
@@ -677,6 +687,7 @@ def eval_strat(fsm, spec, semantics="group"):
     
     for strat in strats:
         nbstrats += 1
+        counters.increment("strategies")
         winning = (filter_strat(fsm, spec, strat, variant="SF").
                     forsome(fsm.bddEnc.inputsCube))
         sat = sat | all_equiv_sat(fsm, winning, agents, semantics=semantics)
@@ -742,6 +753,7 @@ def eval_strat_FSF(fsm, spec, semantics="group"):
     nbstrats = 0
     for strat in split(fsm, winning, agents, semantics=semantics):
         nbstrats += 1
+        counters.increment("strategies")
         
         if config.debug and nbstrats % 1000 == 0:
             print("Eval strategies (FSF): {} strateg{} checked so far"
@@ -10,7 +10,6 @@ import gc
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 from pynusmv.exception import PyNuSMVError
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
@@ -22,6 +21,9 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
 from . import config
 
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 
 def evalATLK(fsm, spec, variant="SF", semantics="group"):
@@ -225,6 +227,7 @@ def evalATLK(fsm, spec, variant="SF", semantics="group"):
         return None
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -245,6 +248,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi U psi]
@@ -286,6 +290,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi W psi]
@@ -312,6 +317,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -335,6 +341,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -366,6 +373,8 @@ def nfair_gamma_si(fsm, agents, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, strat=None, variant="SF"):
     """
     Returns the subset SA of strat (or the whole system if strat is None),
@@ -568,6 +577,7 @@ def eval_strat(fsm, spec):
         gc.collect()
         
         nbstrats += 1
+        counters.increment("strategies")
     
     if config.debug:
         print("[DEBUG] Eval strat Mem: {} strats checked".format(nbstrats))
@@ -7,7 +7,6 @@ from functools import reduce
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 from pynusmv.exception import PyNuSMVError
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
@@ -17,6 +16,11 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils.fairness import memoize_fair_states
+from ..utils.cache import BddCache
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from . import config
 
@@ -257,6 +261,7 @@ def evalATLK(fsm, spec, states=None, variant="SF", semantics="group"):
         return None
 
 
+@profiler.profiled("reach")
 def reach(fsm, states):
     """
     Return the set of states reachable from states in fsm.
@@ -267,6 +272,7 @@ def reach(fsm, states):
     return fp(lambda Z: states | fsm.post(Z), BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("Eequiv")
 def Eequiv(fsm, states, agents):
     """
     Return the set of fsm that equivalent to states w.r.t. group knowledge of
@@ -282,6 +288,7 @@ def Eequiv(fsm, states, agents):
     return result
     
 
+@profiler.profiled("Dequiv")
 def Dequiv(fsm, states, agents):
     """
     Return the set of fsm that equivalent to states w.r.t. distributed
@@ -294,6 +301,7 @@ def Dequiv(fsm, states, agents):
     return fsm.equivalent_states(states, frozenset({agents}))
     
 
+@profiler.profiled("Cequiv")
 def Cequiv(fsm, states, agents):
     """
     Return the set of fsm that equivalent to states w.r.t. group knowledge of
@@ -306,6 +314,7 @@ def Cequiv(fsm, states, agents):
     return fp(lambda Z: Eequiv(fsm, states | Z, agents),
               BDD.false(fsm.bddEnc.DDmanager))
 
+@profiler.profiled("fair_states_sub")
 def fair_states_sub(fsm, subsystem=None):
     """
     Return the set of fair states of the subsystem.
@@ -317,9 +326,16 @@ def fair_states_sub(fsm, subsystem=None):
     
     if len(fsm.fairness_constraints) == 0:
         return BDD.true(fsm.bddEnc.DDmanager)
+    elif subsystem is None:
+        return _fair_states_full(fsm)
     else:
         return eg_sub(fsm, BDD.true(fsm.bddEnc.DDmanager), subsystem=subsystem)
 
+@memoize_fair_states
+def _fair_states_full(fsm):
+    return eg_sub(fsm, BDD.true(fsm.bddEnc.DDmanager))
+
+@profiler.profiled("reachable_sub")
 def reachable_sub(fsm, init=None, subsystem=None):
     """
     Return the set of states reachable from init in the subsystem.
@@ -342,8 +358,10 @@ def reachable_sub(fsm, init=None, subsystem=None):
         old = new
         new = ((old | fsm.post(old, subsystem=subsystem)) &
                fsm.bddEnc.statesMask)
+        profiler.iteration(new)
     return new
     
+@profiler.profiled("ex_sub")
 def ex_sub(fsm, phi, subsystem=None):
     """
     Return the set of states of fsm satisfying EX phi in subsystem.
@@ -362,6 +380,7 @@ def ex_sub(fsm, phi, subsystem=None):
                    subsystem=subsystem)
     
     
+@profiler.profiled("eg_sub")
 def eg_sub(fsm, phi, subsystem=None):
     """
     Return the set of states of fsm satisfying EG phi in subsystem.
@@ -394,6 +413,7 @@ def eg_sub(fsm, phi, subsystem=None):
                 .forsome(fsm.bddEnc.inputsCube))
     
     
+@profiler.profiled("eu_sub")
 def eu_sub(fsm, phi, psi, subsystem=None):
     """
     Return the set of states of fsm satisfying E[ phi U psi ] in subsystem.
@@ -413,6 +433,7 @@ def eu_sub(fsm, phi, psi, subsystem=None):
                     BDD.false(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -433,6 +454,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying
@@ -474,6 +496,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying
@@ -500,6 +523,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -523,6 +547,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -714,6 +739,7 @@ def split_one(fsm, strats, gamma, pustrat):
         yield (common, strats, strats)
 
 
+@profiler.profiled("split")
 def split(fsm, strats, gamma, pustrat=None, semantics="group"):
     """
     Split strats into all its non-conflicting greatest subsets.
@@ -784,6 +810,8 @@ def all_equiv_sat(fsm, winning, agents, semantics="group"):
                  fsm.reachable_states, frozenset(agents))) & winning
              
              
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, states, strat=None, variant="SF",
                  semantics="group"):
     """
@@ -1040,6 +1068,7 @@ def eval_strat(fsm, spec, states, semantics="group"):
                                             semantics=semantics):
                 # Check the strategy
                 nbstrats += 1
+                counters.increment("strategies")
                 winning = (filter_strat(fsm, spec, states, strat,
                                         variant="SF", semantics=semantics).
                            forsome(fsm.bddEnc.inputsCube))
@@ -1367,6 +1396,7 @@ def eval_strat_alternate(fsm, spec, gamma, states, pstrat, subsystem,
                fsm.bddEnc.inputsCube) & fsm.bddEnc.statesMask
         if new.is_false():
             __strategies[spec] += 1
+            counters.increment("strategies")
 
             if config.debug and __strategies[spec] % 1000 == 0:
                 print("Partial strategies (FS): {} strateg{} checked so far"
@@ -1402,18 +1432,17 @@ def eval_strat_alternate(fsm, spec, gamma, states, pstrat, subsystem,
 # CACHING FUNCTIONS AND MANIPULATIONS
 # -----------------------------------------------------------------------------
 
-__evalATLK_cache = {}
+__evalATLK_cache = BddCache("atlkPO.evalPartialSI")
 __orig_evalATLK = evalATLK
 def __cached_evalATLK(fsm, spec, states=None, variant="SF", semantics="group"):
     if config.partial.caching:
         if states is None:
             states = fsm.init
         
-        if (fsm, spec, semantics) in __evalATLK_cache.keys():
-            sat, unsat = __evalATLK_cache[(fsm, spec, semantics)]
-        else:
-            false = BDD.false(fsm.bddEnc.DDmanager)
-            sat, unsat = false, false
+        __evalATLK_cache.budget = config.partial.caching_budget
+        false = BDD.false(fsm.bddEnc.DDmanager)
+        sat, unsat = __evalATLK_cache.get((fsm, spec, semantics),
+                                          (false, false))
 
         remaining = states - (sat + unsat)
     
@@ -1421,8 +1450,8 @@ def __cached_evalATLK(fsm, spec, states=None, variant="SF", semantics="group"):
             remsat = __orig_evalATLK(fsm, spec, remaining, variant,
                                      semantics=semantics)
             remunsat = remaining - remsat
-            __evalATLK_cache[(fsm, spec, semantics)] = (sat + remsat,
-                                                        unsat + remunsat)
+            __evalATLK_cache.put((fsm, spec, semantics), (sat + remsat,
+                                                          unsat + remunsat))
         else:
             remsat = BDD.false(fsm.bddEnc.DDmanager)
     
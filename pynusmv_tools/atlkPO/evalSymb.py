@@ -12,7 +12,6 @@ from collections import OrderedDict
 from pynusmv.dd import BDD, dynamic_reordering_enabled, reorder
 from pynusmv.fsm import BddTrans
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
 from pynusmv import node, glob
 from pynusmv.exception import PyNuSMVError
 
@@ -25,6 +24,10 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 
 from ..atlkFO.eval import nk, ne, nc
+from ..utils.fairness import memoize_fair_states
+from ..utils import counters
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from . import config
 
@@ -226,6 +229,8 @@ def evalATLK(fsm, spec, variant="SF", semantics="group"):
         return None
 
 
+@profiler.profiled("_fair")
+@memoize_fair_states
 def _fair(fsm):
     if len(fsm.fairness_constraints) <= 0:
         return BDD.true(fsm.bddEnc.DDmanager)
@@ -241,16 +246,19 @@ def _fair(fsm):
         return fp(inner, BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("ex")
 def ex(fsm, phi):
     run = fsm.trans
     return run.pre(phi & _fair(fsm))
 
+@profiler.profiled("eu")
 def eu(fsm, phi, psi):
     run = fsm.trans
     return fp(lambda Y : (psi & _fair(fsm)) | (phi & run.pre(Y)),
               BDD.false(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("ew")
 def ew(fsm, phi, psi):
     run = fsm.trans
     if len(fsm.fairness_constraints) <= 0:
@@ -267,6 +275,7 @@ def ew(fsm, phi, psi):
         return fp(inner, BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("cex_si")
 def cex_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> X phi
@@ -287,6 +296,7 @@ def cex_si(fsm, agents, phi, strat=None):
                             agents, strat)
     
 
+@profiler.profiled("ceu_si")
 def ceu_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying
@@ -329,6 +339,7 @@ def ceu_si(fsm, agents, phi, psi, strat=None):
         return fp(inner, BDD.false(fsm.bddEnc.DDmanager))
     
 
+@profiler.profiled("cew_si")
 def cew_si(fsm, agents, phi, psi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents>[phi W psi]
@@ -355,6 +366,7 @@ def cew_si(fsm, agents, phi, psi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("ceg_si")
 def ceg_si(fsm, agents, phi, strat=None):
     """
     Return the set of state/inputs pairs of strat satisfying <agents> G phi
@@ -378,6 +390,7 @@ def ceg_si(fsm, agents, phi, strat=None):
               BDD.true(fsm.bddEnc.DDmanager))
 
 
+@profiler.profiled("nfair_gamma_si")
 def nfair_gamma_si(fsm, agents, strat=None):
     """
     Return the set of state/inputs pairs of strat
@@ -433,6 +446,7 @@ def _ifair(fsm, name):
     return res
 
 
+@profiler.profiled("_nfair")
 def _nfair(fsm, name):
     """
     Return a mu-calculus translation of non-fair states of fsm under uniform
@@ -456,6 +470,7 @@ def _nfair(fsm, name):
     return res
 
 
+@profiler.profiled("cex_symbolic")
 def cex_symbolic(fsm, name, child):
     jump = fsm.transitions[name + "_jump"]
     equiv = fsm.transitions[name + "_equiv"]
@@ -474,6 +489,7 @@ def cex_symbolic(fsm, name, child):
                         ~follow.pre(~(child | _nfair(fsm, name)))))))
 
 
+@profiler.profiled("ceu_symbolic")
 def ceu_symbolic(fsm, name, left, right):
     jump = fsm.transitions[name + "_jump"]
     equiv = fsm.transitions[name + "_equiv"]
@@ -517,6 +533,7 @@ def ceu_symbolic(fsm, name, left, right):
                         fp(inner, BDD.false(fsm.bddEnc.DDmanager))))))
 
 
+@profiler.profiled("cew_symbolic")
 def cew_symbolic(fsm, name, left, right):
     jump = fsm.transitions[name + "_jump"]
     equiv = fsm.transitions[name + "_equiv"]
@@ -737,6 +754,7 @@ def split_one(fsm, strats, gamma, semantics="group"):
         yield (common, strats, strats)
 
 
+@profiler.profiled("split")
 def split(fsm, strats, gamma, semantics="group"):
     """
     Split strats into all its non-conflicting greatest subsets.
@@ -761,6 +779,8 @@ def split(fsm, strats, gamma, semantics="group"):
                 yield (common | strat | splitted)
 
 
+@profiler.profiled("filter_strat")
+@counters.counted("filterings")
 def filter_strat(fsm, spec, strat=None, variant="SF", semantics="group"):
     """
     Returns the subset SA of strat (or the whole system if strat is None),
@@ -12,6 +12,8 @@ from pynusmv.init import init_nusmv
 
 from pynusmv_tools.mas import glob
 from pynusmv_tools.atlkFO.parsing import parseATLK
+from pynusmv_tools.utils import cache, profiler
+from pynusmv_tools.utils.results import ResultCache
 from . import check as checkATLK
 
 
@@ -45,6 +47,28 @@ def main():
     parser.add_argument('-pf', dest='filtering',
                         help='activate pre-filtering (default: deactivated)',
                         action='store_true', default=False)
+    parser.add_argument('-cb', dest='cache_budget', type=int,
+                        help='maximal number of BDD nodes kept in the cache '
+                             'of sub-formulas (default: unbounded)',
+                        default=None)
+    parser.add_argument('-cache', dest='cache',
+                        help='the directory of the results cache '
+                             '(default: None)',
+                        default=None)
+    parser.add_argument('-pj', dest='projection',
+                        help='compute equivalent states by projection '
+                             'instead of epistemic relations '
+                             '(default: deactivated)',
+                        action='store_true', default=False)
+    parser.add_argument('-pt', dest='partitioned',
+                        help='use a partitioned transition relation for '
+                             'strategic pre-images (default: deactivated)',
+                        action='store_true', default=False)
+    parser.add_argument('-profile', dest='profile',
+                        help='profile the operators and write the results '
+                             'in PROFILE.json and PROFILE.stacks '
+                             '(a flame graph stack file) (default: None)',
+                        default=None)
 
     # Variables-order-related arguments
     parser.add_argument('-rbdd-order', dest="initial_ordering",
@@ -59,22 +83,44 @@ def main():
                              '(default: sift)', default="sift")
 
     args = parser.parse_args(sys.argv[1:])
+    if args.cache_budget is not None:
+        # only the sub-formulas caches, the images cache keeps its own budget
+        cache.set_budget(args.cache_budget, prefix="atlk_irf.")
 
     check = lambda mas, formula: checkATLK(mas,
                                            formula,
                                            implementation=args.implementation,
                                            pre_filtering=args.filtering)
 
+    # Generate the model
+    try:
+        mod = importlib.import_module(args.model)
+        model = mod.model()
+    except ImportError:
+        mod = None
+        with open(args.model, "r") as f:
+            model = f.read()
+
+    # Look for the result in the cache;
+    # agents are given by the module, if any
+    spec = parseATLK(args.property)[0]
+    if args.cache is not None:
+        results = ResultCache(args.cache)
+        ordering = None
+        if args.initial_ordering is not None:
+            with open(args.initial_ordering, "r") as f:
+                ordering = f.read()
+        key = results.key(model, "atlk_irf",
+                          args.model if mod is not None else None,
+                          ordering, str(spec), args.implementation)
+        satisfied = results.get(key)
+        if satisfied is not None:
+            print(str(spec) + ' is ' + str(satisfied))
+            return
+
     # Check
     with tempfile.NamedTemporaryFile(suffix=".smv") as tmp:
-        # Generate the model
-        try:
-            mod = importlib.import_module(args.model)
-            tmp.write(mod.model().encode("UTF-8"))
-        except ImportError:
-            mod = None
-            with open(args.model, "r") as f:
-                tmp.write(f.read().encode("UTF-8"))
+        tmp.write(model.encode("UTF-8"))
         tmp.flush()
         MODELFILE = tmp.name
 
@@ -92,13 +138,22 @@ def main():
             else:
                 agents = None
             mas = glob.mas(agents=agents,
-                           initial_ordering=args.initial_ordering)
+                           initial_ordering=args.initial_ordering,
+                           projection=args.projection)
+            mas.partitioned = args.partitioned
         
             # Check the property
-            spec = parseATLK(args.property)[0]
-        
             # Measure execution time and save it
-            print(str(spec) + ' is ' + str(check(mas, spec)))
+            if args.profile is not None:
+                with profiler.profiling() as profile:
+                    satisfied = check(mas, spec)
+                profile.write_json(args.profile + ".json")
+                profile.write_stacks(args.profile + ".stacks")
+            else:
+                satisfied = check(mas, spec)
+            print(str(spec) + ' is ' + str(satisfied))
+            if args.cache is not None:
+                results.put(key, satisfied)
         
             # Close PyNuSMV
             glob.reset_globals()
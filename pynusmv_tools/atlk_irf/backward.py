@@ -6,7 +6,6 @@ import gc
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           Atom, Not, And, Or, Implies, Iff, 
@@ -14,6 +13,9 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           nK, nE, nD, nC, K, E, D, C,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils import counters
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 from .common import *
 from .common import pre_ce_moves, is_conflicting, split_conflicting
@@ -414,6 +416,7 @@ def eval_backward_ceu(mas, agents, strat, states, sub_1, sub_2, exclude):
     """
     global nb_strats
     nb_strats += 1
+    counters.increment("strategies")
     if nb_strats % GC_FREQUENCE == 0:
         gc.collect()
     
@@ -520,6 +523,7 @@ def split_agent_all(mas, agents, agent, moves):
                 yield nc | strat
 
 
+@profiler.profiled("split_all")
 def split_all(mas, agents, moves):
     """
     Split the given moves for agents into all its non-conflicting greatest
@@ -6,7 +6,10 @@ The common functions needed by the approaches.
 """
 
 from pynusmv.dd import BDD
-from pynusmv.utils import fixpoint
+
+from ..utils import counters
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 
 __all__ = ["filter_cex", "filter_ceu", "filter_cew",
@@ -27,6 +30,11 @@ def pre_ce(mas, agents, states, moves):
     states -- a subset of states of mas;
     moves -- a set of moves for agents.
     """
+    return mas.cached_image("pre_ce", (frozenset(agents), states, moves),
+                            lambda: _pre_ce(mas, agents, states, moves))
+
+
+def _pre_ce(mas, agents, states, moves):
     agents_cube = mas.inputs_cube_for_agents(agents)
     others_cube = mas.bddEnc.inputsCube - agents_cube
     
@@ -41,11 +49,9 @@ def pre_ce(mas, agents, states, moves):
     moves = moves & mas.bddEnc.statesInputsMask
     
     return (
-            (
-             ~(mas.weak_pre(nstates).forsome(others_cube))
-             &
-             mas.weak_pre(states)
-            ).forsome(others_cube)
+            ~mas.weak_pre_forsome(nstates, others_cube)
+            &
+            mas.weak_pre_forsome(states, others_cube)
             &
             moves
            ).forsome(mas.bddEnc.inputsCube)
@@ -71,6 +77,7 @@ def stay_ce(mas, agents, states_1, states_2, moves):
                     BDD.true(mas))
 
 
+@profiler.profiled("nfair_ce")
 def nfair_ce(mas, agents, moves):
     """
     mas -- a multi-agent system;
@@ -93,6 +100,8 @@ def nfair_ce(mas, agents, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_cex")
+@counters.counted("filterings")
 def filter_cex(mas, agents, states, moves):
     """
     Return the set of states of mas for which there exists a strategy for
@@ -107,6 +116,8 @@ def filter_cex(mas, agents, states, moves):
     return pre_ce(mas, agents, states | nfair_ce(mas, agents, moves), moves)
 
 
+@profiler.profiled("filter_ceu")
+@counters.counted("filterings")
 def filter_ceu(mas, agents, states_1, states_2, moves):
     """
     Return the set of states of mas for which there exists a strategy for
@@ -150,6 +161,8 @@ def filter_ceu(mas, agents, states_1, states_2, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_cew")
+@counters.counted("filterings")
 def filter_cew(mas, agents, states_1, states_2, moves):
     """
     Return the set of states of mas for which there exists a strategy for
@@ -194,6 +207,11 @@ def pre_ce_moves(mas, agents, target, moves):
     target -- a subset of moves for agents;
     moves -- a set of moves for agents.
     """ 
+    return mas.cached_image("pre_ce_moves", (frozenset(agents), target, moves),
+                            lambda: _pre_ce_moves(mas, agents, target, moves))
+
+
+def _pre_ce_moves(mas, agents, target, moves):
     agents_cube = mas.inputs_cube_for_agents(agents)
     others_cube = mas.bddEnc.inputsCube - agents_cube
     
@@ -208,11 +226,9 @@ def pre_ce_moves(mas, agents, target, moves):
     moves = moves & mas.bddEnc.statesInputsMask
     
     return (
-            (
-             ~(mas.weak_pre(nstates).forsome(others_cube))
-             &
-             mas.weak_pre(states)
-            ).forsome(others_cube)
+            ~mas.weak_pre_forsome(nstates, others_cube)
+            &
+            mas.weak_pre_forsome(states, others_cube)
             &
             moves
            ).forsome(others_cube)
@@ -241,6 +257,7 @@ def stay_ce_moves(mas, agents, moves_1, moves_2, moves):
                     BDD.true(mas))
 
 
+@profiler.profiled("nfair_ce_moves")
 def nfair_ce_moves(mas, agents, moves):
     """
     mas -- a multi-agent system;
@@ -268,6 +285,8 @@ def nfair_ce_moves(mas, agents, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_cex_moves")
+@counters.counted("filterings")
 def filter_cex_moves(mas, agents, target, moves):
     """
     mas -- a multi-agent system;
@@ -281,6 +300,8 @@ def filter_cex_moves(mas, agents, target, moves):
                         nfair_ce_moves(mas, agents, moves), moves)
 
 
+@profiler.profiled("filter_ceu_moves")
+@counters.counted("filterings")
 def filter_ceu_moves(mas, agents, moves_1, moves_2, moves):
     """
     mas -- a multi-agent system;
@@ -327,6 +348,8 @@ def filter_ceu_moves(mas, agents, moves_1, moves_2, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_cew_moves")
+@counters.counted("filterings")
 def filter_cew_moves(mas, agents, moves_1, moves_2, moves):
     """
     mas -- a multi-agent system;
@@ -377,7 +400,7 @@ def get_equiv_class(mas, agents, states):
     
     res = states
     for agent in agents:
-        res |= (mas.equivalent_states(states, {agent}) & mas.reachable_states)
+        res |= mas.equivalence_class(states, {agent})
     return res
 
 
@@ -444,11 +467,8 @@ def split_one(mas, agents, agent, moves):
     else:
         common = BDD.false(mas.bddEnc.DDmanager)
         
-        while moves.isnot_false():
+        for eqs in mas.iter_equivalence_classes(moves, {agent}):
             # Get one equivalence class
-            si = mas.pick_one_state_inputs(moves)
-            s = si.forsome(mas.bddEnc.inputsCube)
-            eqs = get_equiv_class(mas, [agent], s)
             eqcl = moves & eqs
             
             # Remove it from strats
@@ -490,6 +510,7 @@ def split_agent(mas, agents, agent, moves):
                 yield common | nc | strat
 
 
+@profiler.profiled("split")
 def split(mas, agents, moves):
     """
     Split the given moves for agents into all its non-conflicting greatest
@@ -574,12 +595,8 @@ def compatible_moves_for_agent(mas, agents, agent, moves, filtered):
     others_cube = mas.bddEnc.inputsCube - agent_cube
     
     compatible = BDD.false(mas)
-    while moves.isnot_false():
+    for eqs in mas.iter_equivalence_classes(moves, {agent}):
         # Get one equivalence class of states from moves
-        si = mas.pick_one_state_inputs(moves)
-        s = si.forsome(mas.bddEnc.inputsCube)
-        eqs = get_equiv_class(mas, {agent}, s)
-        
         # Get the corresponding moves and remove them from moves
         eqcl = moves & eqs
         moves -= eqcl
@@ -6,7 +6,6 @@ import gc
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           Atom, Not, And, Or, Implies, Iff, 
@@ -14,6 +13,10 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           nK, nE, nD, nC, K, E, D, C,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils.cache import BddCache
+from ..utils import counters
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 from .common import *
 from .utils import *
@@ -455,6 +458,7 @@ def eval_alt(mas,
     """
     global nb_strats
     nb_strats += 1
+    counters.increment("strategies")
     if nb_strats % GC_FREQUENCE == 0:
         gc.collect()
     
@@ -625,6 +629,7 @@ def stay_univ(mas, agents, states_1, states_2, moves):
                     BDD.true(mas))
 
 
+@profiler.profiled("nfair_univ")
 def nfair_univ(mas, agents, moves):
     """
     mas -- a multi-agent system;
@@ -647,6 +652,7 @@ def nfair_univ(mas, agents, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_ax")
 def filter_ax(mas, agents, states, moves):
     """
     Return the set of states of mas for which all fair paths in moves have
@@ -663,6 +669,7 @@ def filter_ax(mas, agents, states, moves):
                     moves)
 
 
+@profiler.profiled("filter_au")
 def filter_au(mas, agents, states_1, states_2, moves):
     """
     Return the set of states of mas for which all fair paths in moves
@@ -705,6 +712,7 @@ def filter_au(mas, agents, states_1, states_2, moves):
         return fixpoint(inner, BDD.false(mas))
 
 
+@profiler.profiled("filter_aw")
 def filter_aw(mas, agents, states_1, states_2, moves):
     """
     Return the set of states of mas for which all fair paths in moves
@@ -738,17 +746,14 @@ def filter_aw(mas, agents, states_1, states_2, moves):
 
 # ----- caching ---------------------------------------------------------------
 
-__evalATLK_cache = {}
+__evalATLK_cache = BddCache("atlk_irf.early")
 __orig_evalATLK = evalATLK
 def __cached_evalATLK(mas, formula, states=None, pre_filtering=False):
     if states is None:
         states = mas.init
     
-    if (mas, formula) in __evalATLK_cache.keys():
-        sat, unsat = __evalATLK_cache[(mas, formula)]
-    else:
-        false = BDD.false(mas)
-        sat, unsat = false, false
+    false = BDD.false(mas)
+    sat, unsat = __evalATLK_cache.get((mas, formula), (false, false))
     
     remaining = states - (sat | unsat)
     
@@ -758,7 +763,7 @@ def __cached_evalATLK(mas, formula, states=None, pre_filtering=False):
                                  states=remaining,
                                  pre_filtering=pre_filtering)
         remunsat = remaining - remsat
-        __evalATLK_cache[(mas, formula)] = (sat + remsat, unsat + remunsat)
+        __evalATLK_cache.put((mas, formula), (sat + remsat, unsat + remunsat))
     else:
         remsat = BDD.false(mas)
     
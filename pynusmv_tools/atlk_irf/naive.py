@@ -13,6 +13,8 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           nK, nE, nD, nC, K, E, D, C,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils.cache import BddCache
+from ..utils import counters
 
 from .common import *
 from .utils import agents_in_list
@@ -277,17 +279,19 @@ def eval_strat(mas, formula, pre_filtering=False):
         sat |= all_equiv_sat(mas, agents, winning)
         
         nb_strats += 1
+        counters.increment("strategies")
         if nb_strats % GC_FREQUENCE == 0:
             gc.collect()
     
     return sat
 
 
-__evalATLK_cache = {}
+__evalATLK_cache = BddCache("atlk_irf.naive")
 __orig_evalATLK = evalATLK
 def __cached_evalATLK(mas, formula, pre_filtering=False):
-    if (mas, formula) not in __evalATLK_cache:
+    sat = __evalATLK_cache.get((mas, formula))
+    if sat is None:
         sat = __orig_evalATLK(mas, formula, pre_filtering=pre_filtering)
-        __evalATLK_cache[(mas, formula)] = sat
-    return __evalATLK_cache[(mas, formula)]
+        __evalATLK_cache.put((mas, formula), sat)
+    return sat
 evalATLK = __cached_evalATLK
@@ -6,7 +6,6 @@ import gc
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint
 
 from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           Atom, Not, And, Or, Implies, Iff, 
@@ -14,6 +13,9 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           nK, nE, nD, nC, K, E, D, C,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 from ..atlkFO.eval import (fair_states, ex, eg, eu, nk, ne, nd, nc)
+from ..utils.cache import BddCache
+from ..utils import counters
+from ..utils.profiler import fixpoint
 
 from .common import *
 from .utils import *
@@ -439,6 +441,7 @@ def eval_strat(mas, formula, states, pre_filtering=False):
         sat |= all_equiv_sat(mas, agents, winning) & states
         
         nb_strats += 1
+        counters.increment("strategies")
         if nb_strats % GC_FREQUENCE == 0:
             gc.collect()
     
@@ -487,17 +490,14 @@ def partial_strategies_filtered(mas, agents, states, filtered):
 
 # ----- caching ---------------------------------------------------------------
 
-__evalATLK_cache = {}
+__evalATLK_cache = BddCache("atlk_irf.partial")
 __orig_evalATLK = evalATLK
 def __cached_evalATLK(mas, formula, states=None, pre_filtering=False):
     if states is None:
         states = mas.init
     
-    if (mas, formula) in __evalATLK_cache.keys():
-        sat, unsat = __evalATLK_cache[(mas, formula)]
-    else:
-        false = BDD.false(mas)
-        sat, unsat = false, false
+    false = BDD.false(mas)
+    sat, unsat = __evalATLK_cache.get((mas, formula), (false, false))
     
     remaining = states - (sat | unsat)
     
@@ -507,7 +507,7 @@ def __cached_evalATLK(mas, formula, states=None, pre_filtering=False):
                                  states=remaining,
                                  pre_filtering=pre_filtering)
         remunsat = remaining - remsat
-        __evalATLK_cache[(mas, formula)] = (sat + remsat, unsat + remunsat)
+        __evalATLK_cache.put((mas, formula), (sat + remsat, unsat + remunsat))
     else:
         remsat = BDD.false(mas)
     
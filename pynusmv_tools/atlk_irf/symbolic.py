@@ -9,7 +9,6 @@ from collections import OrderedDict
 from pynusmv.dd import BDD
 from pynusmv.fsm import BddTrans
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint
 from pynusmv import model
 from pynusmv import glob
 from pynusmv import node
@@ -20,6 +19,10 @@ from ..atlkFO.ast import (TrueExp, FalseExp, Init, Reachable,
                           nK, nE, nD, nC, K, E, D, C,
                           CEF, CEG, CEX, CEU, CEW, CAF, CAG, CAX, CAU, CAW)
 from ..atlkFO.eval import (fair_states, nk, ne, nd, nc)
+from ..utils.fairness import memoize_fair_states
+from ..utils.cache import BddCache
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 from .common import *
 from .utils import *
@@ -599,6 +602,7 @@ def equivalence_relation(mas, agent):
 
 # ----- eval algorithms -------------------------------------------------------
 
+@profiler.profiled("_nfair")
 def _nfair(mas, formula, agents):
     """
     Return the set of states in which the given agents cannot avoid a fair path
@@ -628,6 +632,7 @@ def _nfair(mas, formula, agents):
         return res
 
 
+@profiler.profiled("eval_cex")
 def eval_cex(mas, formula, agents, states):
     jump = mas.transitions[formula]["jump"]
     equiv = mas.transitions[formula]["equiv"]
@@ -647,6 +652,7 @@ def eval_cex(mas, formula, agents, states):
                                       _nfair(mas, formula, agents)))))))
 
 
+@profiler.profiled("eval_ceu")
 def eval_ceu(mas, formula, agents, states_1, states_2):
     jump = mas.transitions[formula]["jump"]
     equiv = mas.transitions[formula]["equiv"]
@@ -694,6 +700,7 @@ def eval_ceu(mas, formula, agents, states_1, states_2):
                         fixpoint(inner, BDD.false(mas))))))
 
 
+@profiler.profiled("eval_cew")
 def eval_cew(mas, formula, agents, states_1, states_2):
     jump = mas.transitions[formula]["jump"]
     equiv = mas.transitions[formula]["equiv"]
@@ -723,6 +730,8 @@ def eval_cew(mas, formula, agents, states_1, states_2):
 
 # ----- CTL algorithms --------------------------------------------------------
 
+@profiler.profiled("_fair")
+@memoize_fair_states
 def _fair(mas):
     if not mas.fairness_constraints:
         return BDD.true(mas)
@@ -739,10 +748,12 @@ def _fair(mas):
         return fixpoint(inner, BDD.true(mas))
 
 
+@profiler.profiled("ex")
 def ex(mas, states):
     run = mas.trans
     return run.pre(states & _fair(mas))
 
+@profiler.profiled("eu")
 def eu(mas, states_1, states_2):
     run = mas.trans
     return fixpoint(lambda Y : (states_2 & _fair(mas)) |
@@ -750,6 +761,7 @@ def eu(mas, states_1, states_2):
                     BDD.false(mas))
 
 
+@profiler.profiled("ew")
 def ew(mas, states_1, states_2):
     run = mas.trans
     if not mas.fairness_constraints:
@@ -771,11 +783,12 @@ def ew(mas, states_1, states_2):
 
 # ----- caching ---------------------------------------------------------------
 
-__evalATLK_cache = {}
+__evalATLK_cache = BddCache("atlk_irf.symbolic")
 __orig_evalATLK = evalATLK
 def __cached_evalATLK(mas, formula, pre_filtering=False):
-    if (mas, formula) not in __evalATLK_cache:
+    sat = __evalATLK_cache.get((mas, formula))
+    if sat is None:
         sat = __orig_evalATLK(mas, formula, pre_filtering=pre_filtering)
-        __evalATLK_cache[(mas, formula)] = sat
-    return __evalATLK_cache[(mas, formula)]
+        __evalATLK_cache.put((mas, formula), sat)
+    return sat
 evalATLK = __cached_evalATLK
@@ -3,7 +3,8 @@ Utils functions.
 """
 
 from pynusmv.dd import BDD
-from pynusmv.utils import fixpoint
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 def agents_in_group(mas, group):
     """
@@ -43,6 +44,7 @@ def agents_in_list(mas, agents):
     return result
 
 
+@profiler.profiled("Eequiv")
 def Eequiv(mas, agents, states):
     """
     Return the set of states of mas that are equivalent to some state in states
@@ -58,6 +60,7 @@ def Eequiv(mas, agents, states):
     return result
     
 
+@profiler.profiled("Dequiv")
 def Dequiv(mas, agents, states):
     """
     Return the set of states of mas that are equivalent to some state in states
@@ -70,6 +73,7 @@ def Dequiv(mas, agents, states):
     return mas.equivalent_states(states, {agents}) & mas.reachable_states
     
 
+@profiler.profiled("Cequiv")
 def Cequiv(mas, agents, states):
     """
     Return the set of states of mas that are equivalent to some state in states
@@ -82,6 +86,7 @@ def Cequiv(mas, agents, states):
     return fixpoint(lambda Z: Eequiv(mas, agents, states | Z),
                     BDD.false(fsm.bddEnc.DDmanager))
 
+@profiler.profiled("reach")
 def reach(mas, states):
     """
     Return the set of states reachable from states in mas.
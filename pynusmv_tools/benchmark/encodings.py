@@ -0,0 +1,205 @@
+"""
+Compare the encodings of the bounded semantics of LTL on the families of
+models of the models module, and record, for every model, formula, encoding
+and bound:
+ - the number of clauses and variables of the CNF of the BMC problem;
+ - the wall time of the generation of the problem and of its solving;
+ - whether the problem is satisfiable (a violation of the formula exists);
+ - whether the result is the same as with the first encoding.
+
+Four encodings are compared:
+ - loops, the encoding of bmcLTL.ast.Formula.bounded_semantics, unfolding
+   the formula for every loop;
+ - linear, the linear encoding of bmcLTL.linear, with loop selectors;
+ - li, the encoding of bmc_ltl_li (bmcLTL.bmc_ltl_li.generate_sat_problem,
+   using NuSMV's bounded_semantics_at_offset);
+ - nusmv, NuSMV's complete problem (pynusmv.bmc.ltlspec.generate_ltl_problem,
+   as in bmc_ltl).
+
+The formulas are written over the constraints of the families of the nested
+benchmark (c1 stands for the first one and cn for the last one):
+ - recurrence: [] <> c1
+ - persistence: <> [] c1
+ - response: [] (c1 => <> cn)
+ - until: !cn U c1
+
+Usage:
+    python -m pynusmv_tools.benchmark.encodings -f tree counters -s 2 3 \\
+        -k 5 10 20 -o results.csv
+"""
+
+import sys
+import csv
+import time
+import argparse
+import tempfile
+
+from pynusmv.init import init_nusmv
+from pynusmv.glob import load
+from pynusmv.node import Node
+from pynusmv.parser import parse_ltl_spec
+from pynusmv.sat import SatSolverFactory, SatSolverResult, Polarity
+from pynusmv.bmc.glob import BmcSupport, master_be_fsm
+from pynusmv.bmc import ltlspec
+
+from ..bmcLTL.parsing import parseLTL
+from ..bmcLTL.ast import encoding_cache
+from ..bmcLTL.gen import generate_problem
+from ..bmcLTL.linear import loop_variable
+from ..bmcLTL.bmc_ltl_li import generate_sat_problem
+from . import models
+from .nested import CONSTRAINTS
+
+# The compared encodings, in order
+ENCODINGS = ["loops", "linear", "li", "nusmv"]
+
+# The formulas, by name, as functions of the first and last constraints
+# returning the texts of the formula in bmcLTL and NuSMV syntaxes
+FORMULAS = {"recurrence":
+                lambda c1, cn: ("[] <> ({})".format(c1),
+                                "G F ({})".format(c1)),
+            "persistence":
+                lambda c1, cn: ("<> [] ({})".format(c1),
+                                "F G ({})".format(c1)),
+            "response":
+                lambda c1, cn: ("[] (({}) => <> ({}))".format(c1, cn),
+                                "G (({}) -> F ({}))".format(c1, cn)),
+            "until":
+                lambda c1, cn: ("!({}) U ({})".format(cn, c1),
+                                "!({}) U ({})".format(cn, c1))}
+
+# The fields of the results, in order
+FIELDS = ["family", "size", "formula", "encoding", "bound", "clauses",
+          "variables", "generation", "solving", "result", "status"]
+
+
+def solve(problem):
+    """
+    Solve the BMC problem, a Be expression, and return a dictionary with the
+    clauses, variables, solving and result FIELDS.
+    """
+    cnf = problem.to_cnf(Polarity.POSITIVE)
+    start = time.time()
+    solver = SatSolverFactory.create()
+    solver += cnf
+    solver.polarity(cnf, Polarity.POSITIVE)
+    satisfiable = solver.solve() == SatSolverResult.SATISFIABLE
+    return {"clauses": cnf.clauses_number,
+            "variables": cnf.vars_number,
+            "solving": time.time() - start,
+            "result": "violation" if satisfiable else "ok"}
+
+
+def problems(encoding, fsm, formula, bounds):
+    """
+    Generate, for every bound of bounds, the (bound, problem, generation
+    time) of formula, a pair of texts in bmcLTL and NuSMV syntaxes, with the
+    given encoding.
+    """
+    ltl, smv = formula
+    if encoding == "li":
+        node = Node.from_ptr(parse_ltl_spec(smv))
+        for k in bounds:
+            start = time.time()
+            problem = generate_sat_problem(fsm, node, k)
+            yield k, problem, time.time() - start
+    elif encoding == "nusmv":
+        node = Node.from_ptr(parse_ltl_spec(smv))
+        for k in bounds:
+            start = time.time()
+            problem = ltlspec.generate_ltl_problem(fsm, node, k)
+            yield k, problem, time.time() - start
+    elif encoding == "linear":
+        fml = parseLTL(ltl)
+        with encoding_cache(), loop_variable(fsm) as loop_var:
+            for k in bounds:
+                start = time.time()
+                problem = generate_problem(fml, fsm, k, loop_var=loop_var)
+                yield k, problem, time.time() - start
+    else:
+        fml = parseLTL(ltl)
+        with encoding_cache():
+            for k in bounds:
+                start = time.time()
+                problem = generate_problem(fml, fsm, k)
+                yield k, problem, time.time() - start
+
+
+def run(family, size, bounds):
+    """
+    Check the formulas on the model family(size), with all encodings, for
+    all bounds, and return the list of rows of results, as dictionaries of
+    FIELDS.
+    """
+    rows = []
+    with tempfile.NamedTemporaryFile(suffix=".smv") as tmp:
+        tmp.write(models.FAMILIES[family](size).encode("UTF-8"))
+        tmp.flush()
+        with init_nusmv():
+            load(tmp.name)
+            with BmcSupport():
+                fsm = master_be_fsm()
+                constraints = CONSTRAINTS[family](size)
+                for name in sorted(FORMULAS):
+                    formula = FORMULAS[name](constraints[0], constraints[-1])
+                    expected = {}
+                    for encoding in ENCODINGS:
+                        for k, problem, generation in problems(encoding, fsm,
+                                                               formula,
+                                                               bounds):
+                            row = {"family": family, "size": size,
+                                   "formula": name, "encoding": encoding,
+                                   "bound": k, "generation": generation}
+                            row.update(solve(problem))
+                            expected.setdefault(k, row["result"])
+                            row["status"] = ("ok"
+                                             if row["result"] == expected[k]
+                                             else "wrong")
+                            rows.append(row)
+                del fsm
+    return rows
+
+
+def write_csv(rows, path):
+    """Write the rows of results in the CSV file at path."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LTL bounded semantics '
+                                                 'encodings benchmark.')
+    parser.add_argument('-f', dest='families', nargs='+',
+                        help='the families of models (' +
+                             ', '.join(sorted(CONSTRAINTS)) + ') '
+                             '(default: all)',
+                        default=sorted(CONSTRAINTS))
+    parser.add_argument('-s', dest='sizes', nargs='+', type=int,
+                        help='the sizes of the models (default: 2 3)',
+                        default=[2, 3])
+    parser.add_argument('-k', dest='bounds', nargs='+', type=int,
+                        help='the bounds of the problems (default: 5 10)',
+                        default=[5, 10])
+    parser.add_argument('-o', dest='output',
+                        help='the CSV file to write results to '
+                             '(default: None)',
+                        default=None)
+    args = parser.parse_args(sys.argv[1:])
+
+    rows = []
+    for family in args.families:
+        for size in args.sizes:
+            for row in run(family, size, args.bounds):
+                rows.append(row)
+                print("{family} {size} {formula} {encoding} k={bound}: "
+                      "{status} ({result}, {clauses} clauses, "
+                      "{generation:.3f}s + {solving:.3f}s)".format(**row))
+
+    if args.output is not None:
+        write_csv(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
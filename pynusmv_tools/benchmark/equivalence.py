@@ -0,0 +1,101 @@
+"""
+Compare the two implementations of MAS.equivalent_states.
+
+For every given model, and every agent of the model (and the group of all
+agents), the equivalence class of every reachable state is computed with
+epistemic trans images and with projections, checking that both give the
+same result, and the time taken by each implementation is reported.
+
+Usage:
+    python -m pynusmv_tools.benchmark.equivalence MODEL [MODEL ...]
+e.g. with the models of tests/pynusmv_tools/atlkPO/models.
+"""
+
+import sys
+import time
+import argparse
+
+from pynusmv.init import init_nusmv
+
+from ..mas import glob
+
+
+def _time_classes(mas, states, agents, projection):
+    """
+    Return the list of equivalence classes of states for agents and the time
+    taken to compute them.
+    """
+    mas.projection = projection
+    start = time.time()
+    classes = [mas.equivalent_states(state, agents) for state in states]
+    return classes, time.time() - start
+
+
+def _bench_mas(mas, limit):
+    states = []
+    for state in mas.pick_all_states(mas.reachable_states):
+        if limit is not None and len(states) >= limit:
+            break
+        states.append(state)
+
+    groups = [{agent} for agent in sorted(mas.agents)]
+    if len(mas.agents) > 1:
+        groups.append(set(mas.agents))
+
+    rows = []
+    for agents in groups:
+        # Build the epistemic trans and the cube before measuring
+        mas.projection = False
+        mas.equivalent_states(mas.init, agents)
+        mas.projection = True
+        mas.equivalent_states(mas.init, agents)
+
+        images, image_time = _time_classes(mas, states, agents, False)
+        projs, proj_time = _time_classes(mas, states, agents, True)
+        if images != projs:
+            raise AssertionError("Different equivalence classes for " +
+                                 str(sorted(agents)) + ".")
+        rows.append((agents, len(states), image_time, proj_time))
+    mas.projection = False
+    return rows
+
+
+def bench(path, limit=None):
+    """
+    Return the list of (agents, number of states, image time, projection time)
+    quadruples for the model at path.
+
+    path -- the path of the SMV model;
+    limit -- the maximal number of reachable states to compute the class of,
+             or None for all of them.
+    """
+    with init_nusmv():
+        glob.load_from_file(path)
+        rows = _bench_mas(glob.mas(), limit)
+        glob.reset_globals()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the image and '
+                                                 'projection based '
+                                                 'equivalent_states.')
+    parser.add_argument('models', nargs='+', help='the SMV models of MAS')
+    parser.add_argument('-l', dest='limit', type=int,
+                        help='the maximal number of states by model '
+                             '(default: all reachable states)',
+                        default=None)
+    args = parser.parse_args(sys.argv[1:])
+
+    print("{:<40} {:<24} {:>7} {:>10} {:>10}".format("model", "agents",
+                                                    "states", "image (s)",
+                                                    "proj. (s)"))
+    for path in args.models:
+        for agents, count, image_time, proj_time in bench(path, args.limit):
+            print("{:<40} {:<24} {:>7} {:>10.4f} {:>10.4f}".format(
+                  path.rpartition("/")[2], ",".join(sorted(agents)), count,
+                  image_time, proj_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Parametrised families of multi-agent systems, as SMV models.
+
+Every family is a function taking a size (a positive integer) and returning
+the text of an SMV model whose top-level module instances are the agents,
+as expected by mas.glob.mas. Agents observe their own variables and the
+ones given as arguments to their module, so these models can be checked by
+both atlk_po and atlk_irf.
+
+To use a family with the -m option of atlk_irf, write a module with a
+model() function returning, e.g., tree(4).
+"""
+
+
+def transmission(size):
+    """
+    Return a lossy transmission of size messages: the sender can send a
+    message, and the transmitter can transmit or block it. Neither of them
+    observes the number of received messages.
+    """
+    return """
+MODULE Sender()
+    IVAR action : {{send, wait}};
+
+MODULE Transmitter()
+    IVAR action : {{transmit, block}};
+
+MODULE main
+    VAR received : 0..{size};
+        sender : Sender();
+        transmitter : Transmitter();
+
+    INIT received = 0
+
+    TRANS next(received) = (sender.action = send &
+                            transmitter.action = transmit &
+                            received < {size} ? received + 1 : received);
+""".format(size=size)
+
+
+def tree(size):
+    """
+    Return a binary tree of depth size, explored by an agent choosing the
+    left or right child of the current node, but observing only the depth
+    of the node. Nodes are numbered in breadth-first order, from 0.
+    """
+    return """
+MODULE Agent(level)
+    IVAR action : {{left, right}};
+
+MODULE main
+    VAR level : 0..{size};
+        node : 0..{last};
+        agent : Agent(level);
+
+    INIT level = 0 & node = 0
+
+    TRANS next(level) = (level < {size} ? level + 1 : level);
+
+    TRANS next(node) = case level < {size} & agent.action = left :
+                                node * 2 + 1;
+                            level < {size} : node * 2 + 2;
+                            TRUE : node;
+                       esac;
+""".format(size=size, last=2 ** (size + 1) - 2)
+
+
+def counters(size, bound=2):
+    """
+    Return size agents, each of them incrementing (or not) its own counter
+    from 0 to bound, and observing only its counter.
+    """
+    instances = "\n".join("        a{i} : Agent();".format(i=i)
+                          for i in range(1, size + 1))
+    return """
+MODULE Agent()
+    IVAR action : {{inc, wait}};
+    VAR c : 0..{bound};
+
+    INIT c = 0
+
+    TRANS next(c) = (action = inc & c < {bound} ? c + 1 : c);
+
+MODULE main
+    VAR
+{instances}
+""".format(bound=bound, instances=instances)
+
+
+# The families, by name
+FAMILIES = {"transmission": transmission,
+            "tree": tree,
+            "counters": counters}
@@ -0,0 +1,160 @@
+"""
+Evaluate nested mu-calculus fixpoints on the families of models of the
+models module, with and without warm starts of the fixpoints (see
+mucalculus.formula.EvalCache), and record, for every model, formula and mode:
+ - the wall time of the evaluation (without building the model);
+ - the number of evaluated sub-formulas (the misses of the cache);
+ - the number of fixpoints started from their last approximant;
+ - whether the result is the same as without warm starts.
+
+Two formulas are evaluated on every model, with the fairness constraints
+f_1, ..., f_n of its family:
+ - fair, the fair states (EG true under fairness):
+       nu Z. /\\_i <> mu X. (Z & f_i) | <> X
+   whose inner least fixpoints alternate with the outer greatest one, and
+   are restarted at every outer iteration;
+ - chain, the states reaching f_n through any sequence of constraints:
+       mu Y. f_n | \\/_i <> mu X. (Y & f_i) | <> X
+   whose inner least fixpoints are started from their last approximant.
+
+Usage:
+    python -m pynusmv_tools.benchmark.nested -f tree counters -s 2 3 4 \\
+        -o results.csv
+"""
+
+import sys
+import csv
+import time
+import argparse
+import tempfile
+from functools import reduce
+
+from pynusmv.init import init_nusmv
+
+from ..mucalculus import model
+from ..mucalculus.formula import (Atom, Variable, And, Or, Diamond, Mu, Nu,
+                                  EvalCache)
+from . import models
+
+# The fairness constraints of the families, by name
+CONSTRAINTS = {"transmission":
+                   lambda size: ["received = 0",
+                                 "received = {}".format(size)],
+               "tree":
+                   lambda size: ["level = 0", "level = {}".format(size)],
+               "counters":
+                   lambda size: ["a{}.c = 0".format(i)
+                                 for i in range(1, size + 1)]}
+
+# The fields of the results, in order
+FIELDS = ["family", "size", "formula", "warm_start", "time", "evaluations",
+          "warm_starts", "status"]
+
+
+def fair(constraints):
+    """
+    Return the mu-calculus formula of the fair states under the
+    constraints, a list of simple expressions.
+    """
+    Z, X = Variable("Z"), Variable("X")
+    return Nu(Z, reduce(And, (Diamond(Mu(X, Or(And(Z, Atom(constraint)),
+                                               Diamond(X))))
+                              for constraint in constraints)))
+
+
+def chain(constraints):
+    """
+    Return the mu-calculus formula of the states reaching the last of the
+    constraints, a list of simple expressions, through any sequence of
+    constraints.
+    """
+    Y, X = Variable("Y"), Variable("X")
+    return Mu(Y, reduce(Or, (Diamond(Mu(X, Or(And(Y, Atom(constraint)),
+                                              Diamond(X))))
+                             for constraint in constraints),
+                        Atom(constraints[-1])))
+
+
+# The benchmarked formulas, by name
+FORMULAS = {"fair": fair, "chain": chain}
+
+
+def run(family, size):
+    """
+    Evaluate the formulas on the model family(size), with and without warm
+    starts, and return the list of rows of results, as dictionaries of
+    FIELDS.
+    """
+    rows = []
+    with tempfile.NamedTemporaryFile(suffix=".smv") as tmp:
+        tmp.write(models.FAMILIES[family](size).encode("UTF-8"))
+        tmp.flush()
+        with init_nusmv():
+            model.load_from_file(tmp.name)
+            fsm = model.bddModel()
+            constraints = CONSTRAINTS[family](size)
+            for name in sorted(FORMULAS):
+                formula = FORMULAS[name](constraints)
+                expected = None
+                for warm_start in [False, True]:
+                    cache = EvalCache("benchmark.nested", budget=None,
+                                      warm_start=warm_start)
+                    start = time.time()
+                    result = formula.eval(fsm, cache=cache)
+                    elapsed = time.time() - start
+                    if expected is None:
+                        expected = result
+                    rows.append({"family": family, "size": size,
+                                 "formula": name, "warm_start": warm_start,
+                                 "time": elapsed,
+                                 "evaluations": cache.misses,
+                                 "warm_starts": cache.warm_starts,
+                                 "status": ("ok" if result == expected
+                                            else "wrong")})
+                    del result, cache
+                del expected
+            del fsm
+            model.reset_globals()
+    return rows
+
+
+def write_csv(rows, path):
+    """Write the rows of results in the CSV file at path."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Nested mu-calculus '
+                                                 'fixpoints benchmark.')
+    parser.add_argument('-f', dest='families', nargs='+',
+                        help='the families of models (' +
+                             ', '.join(sorted(CONSTRAINTS)) + ') '
+                             '(default: all)',
+                        default=sorted(CONSTRAINTS))
+    parser.add_argument('-s', dest='sizes', nargs='+', type=int,
+                        help='the sizes of the models (default: 2 3)',
+                        default=[2, 3])
+    parser.add_argument('-o', dest='output',
+                        help='the CSV file to write results to '
+                             '(default: None)',
+                        default=None)
+    args = parser.parse_args(sys.argv[1:])
+
+    rows = []
+    for family in args.families:
+        for size in args.sizes:
+            for row in run(family, size):
+                rows.append(row)
+                print("{family} {size} {formula} warm_start={warm_start}: "
+                      "{status} ({time:.3f}s, {evaluations} evaluations, "
+                      "{warm_starts} warm starts)".format(**row))
+
+    if args.output is not None:
+        write_csv(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Run the ATLK_irF model checkers on the families of models of the models
+module, with the specifications of the specs module, and record, for every
+model, specification, engine, implementation and variant:
+ - the verdict, and whether it is the expected one;
+ - the wall time of the check (without building the model);
+ - the peak resident set size of the process, in kilobytes;
+ - the number of BDD nodes allocated in CUDD at the end of the check
+   (including dead nodes not collected yet);
+ - the number of strategies and filterings, as counted by utils.counters.
+
+Every check runs in a fresh process, such that peak memory is measured for
+this check only, and can be stopped after a timeout.
+
+Usage:
+    python -m pynusmv_tools.benchmark.run -f tree -s 2 3 4 \\
+        -e atlk_irf -i naive symbolic -o results.csv
+"""
+
+import sys
+import csv
+import json
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+from pynusmv.init import init_nusmv
+from pynusmv_lower_interface.nusmv.dd import dd as nsdd
+
+from ..mas import glob
+from ..atlkFO.parsing import parseATLK
+from ..atlkPO.check import check as check_po
+from ..atlk_irf import check as check_irf
+from ..utils import counters
+from . import models, specs
+
+# The implementations of each engine
+IMPLEMENTATIONS = {"atlk_po": ["naive", "generator", "optimized", "memory",
+                               "partial", "symbolic", "generatorSI",
+                               "partialSI"],
+                   "atlk_irf": ["naive", "partial", "early", "symbolic",
+                                "backward"]}
+# The variants of each engine
+VARIANTS = {"atlk_po": ["SF", "FS", "FSF"],
+            "atlk_irf": [None]}
+
+# The fields of the results, in order
+FIELDS = ["family", "size", "spec", "expected", "engine", "implementation",
+          "variant", "status", "satisfied", "time", "max_rss", "dd_nodes",
+          "strategies", "filterings"]
+
+
+def _check(task):
+    """
+    Check a specification on a model and return the measures of the check.
+
+    task -- a (family, size, spec, engine, implementation, variant) tuple.
+    """
+    family, size, spec, engine, implementation, variant = task
+    with tempfile.NamedTemporaryFile(suffix=".smv") as tmp:
+        tmp.write(models.FAMILIES[family](size).encode("UTF-8"))
+        tmp.flush()
+        with init_nusmv():
+            glob.load_from_file(tmp.name)
+            mas = glob.mas()
+            formula = parseATLK(spec)[0]
+
+            counters.reset()
+            start = time.time()
+            if engine == "atlk_po":
+                satisfied = check_po(mas, formula, variant=variant,
+                                     implem=implementation)
+            else:
+                satisfied = check_irf(mas, formula,
+                                      implementation=implementation)
+            elapsed = time.time() - start
+            nodes = nsdd.get_dd_nodes_allocated(mas.bddEnc.DDmanager._ptr)
+
+            del mas
+            glob.reset_globals()
+
+    stats = counters.stats()
+    return {"satisfied": satisfied,
+            "time": elapsed,
+            "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "dd_nodes": nodes,
+            "strategies": stats.get("strategies", 0),
+            "filterings": stats.get("filterings", 0)}
+
+
+def tasks(families, sizes, engines, implementations=None, variants=None):
+    """
+    Generate the (family, size, spec, expected, engine, implementation,
+    variant) tuples of the benchmark.
+
+    families -- the names of the families of models;
+    sizes -- the sizes of the models;
+    engines -- the names of the engines (atlk_po, atlk_irf);
+    implementations -- if not None, the implementations to restrict to;
+    variants -- if not None, the variants of atlk_po to restrict to.
+    """
+    for family in families:
+        for size in sizes:
+            for spec, expected in specs.specs(family, size):
+                for engine in engines:
+                    for implementation in IMPLEMENTATIONS[engine]:
+                        if (implementations is not None and
+                                implementation not in implementations):
+                            continue
+                        for variant in VARIANTS[engine]:
+                            if (variant is not None and
+                                    variants is not None and
+                                    variant not in variants):
+                                continue
+                            yield (family, size, spec, expected, engine,
+                                   implementation, variant)
+
+
+def run(task, timeout=None):
+    """
+    Run the given task, as generated by tasks, in a new process, and return
+    the corresponding row of results, as a dictionary of FIELDS.
+
+    timeout -- the maximal number of seconds of the check, or None.
+    """
+    family, size, spec, expected, engine, implementation, variant = task
+    row = {"family": family, "size": size, "spec": spec,
+           "expected": expected, "engine": engine,
+           "implementation": implementation, "variant": variant}
+
+    # spawn gives a fresh process, with its own NuSMV and peak memory
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(processes=1)
+    try:
+        result = pool.apply_async(_check, ((family, size, spec, engine,
+                                            implementation, variant),))
+        row.update(result.get(timeout))
+        row["status"] = ("ok" if row["satisfied"] == expected
+                         else "wrong")
+    except multiprocessing.TimeoutError:
+        row["status"] = "timeout"
+    except Exception as e:
+        row["status"] = "error: " + str(e)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return {field: row.get(field) for field in FIELDS}
+
+
+def write_csv(rows, path):
+    """Write the rows of results in the CSV file at path."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, path):
+    """Write the rows of results in the JSON file at path."""
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ATLK_irF model checkers '
+                                                 'benchmark.')
+    parser.add_argument('-f', dest='families', nargs='+',
+                        help='the families of models (' +
+                             ', '.join(sorted(models.FAMILIES)) + ') '
+                             '(default: all)',
+                        default=sorted(models.FAMILIES))
+    parser.add_argument('-s', dest='sizes', nargs='+', type=int,
+                        help='the sizes of the models (default: 2 3)',
+                        default=[2, 3])
+    parser.add_argument('-e', dest='engines', nargs='+',
+                        help='the engines (atlk_po, atlk_irf) '
+                             '(default: all)',
+                        default=sorted(IMPLEMENTATIONS))
+    parser.add_argument('-i', dest='implementations', nargs='+',
+                        help='the implementations (default: all)',
+                        default=None)
+    parser.add_argument('-v', dest='variants', nargs='+',
+                        help='the variants of atlk_po (SF, FS, FSF) '
+                             '(default: all)',
+                        default=None)
+    parser.add_argument('-t', dest='timeout', type=float,
+                        help='the timeout of each check, in seconds '
+                             '(default: None)',
+                        default=None)
+    parser.add_argument('-o', dest='output',
+                        help='the file to write results to, as JSON if it '
+                             'ends with .json, as CSV otherwise '
+                             '(default: None)',
+                        default=None)
+    args = parser.parse_args(sys.argv[1:])
+
+    rows = []
+    for task in tasks(args.families, args.sizes, args.engines,
+                      implementations=args.implementations,
+                      variants=args.variants):
+        row = run(task, timeout=args.timeout)
+        rows.append(row)
+        print("{family} {size} {engine} {implementation} {variant}: "
+              "{spec} -> {status}".format(**row), end="")
+        if row["time"] is not None:
+            print(" ({:.3f}s, {} KB, {} strategies, {} filterings)"
+                  .format(row["time"], row["max_rss"], row["strategies"],
+                          row["filterings"]))
+        else:
+            print()
+
+    if args.output is not None:
+        if args.output.endswith(".json"):
+            write_json(rows, args.output)
+        else:
+            write_csv(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Catalogue of ATLK specifications for the families of the models module.
+
+specs(family, size) returns the list of (specification, expected verdict)
+pairs for the model family(size); the expected verdicts hold for the
+ATLK_irF semantics, with group knowledge (the default of atlk_po and
+atlk_irf).
+"""
+
+def _transmission(size):
+    return [("<'sender','transmitter'> F 'received = {}'".format(size), True),
+            ("<'sender'> F 'received = {}'".format(size), False),
+            ("<'transmitter'> G 'received < {}'".format(size), True),
+            ("['sender'] X 'received <= 1'", True)]
+
+
+def _tree(size):
+    last = 2 ** (size + 1) - 2
+    return [("<'agent'> F 'node = {}'".format(last), True),
+            ("<'agent'> F 'level = {}'".format(size), True),
+            ("<'agent'> F K<'agent'> 'node = {}'".format(last), False),
+            ("['agent'] G 'node <= {}'".format(last), True)]
+
+
+def _counters(size):
+    # Counters have the default bound of models.counters
+    agents = ",".join("'a{}'".format(i) for i in range(1, size + 1))
+    goal = " & ".join("'a{}.c = 2'".format(i) for i in range(1, size + 1))
+    specs = [("<{}> F ({})".format(agents, goal), True),
+             ("<'a1'> F 'a1.c = 2'", True),
+             ("<'a1'> G 'a1.c < 2'", True)]
+    if size > 1:
+        specs.append(("<'a1'> F 'a2.c = 2'", False))
+    return specs
+
+
+# The specifications of the families, by name
+SPECS = {"transmission": _transmission,
+         "tree": _tree,
+         "counters": _counters}
+
+
+def specs(family, size):
+    """
+    Return the list of (specification, expected verdict) pairs of the
+    catalogue for the model family(size).
+
+    family -- the name of a family of the models module;
+    size -- the size of the model.
+    """
+    return SPECS[family](size)
@@ -17,6 +17,9 @@ compose an LTL abstract syntax tree.
 
                 Biere et al - ``Bounded Model Checking'' - 2003
 """
+from collections          import OrderedDict
+from contextlib           import contextmanager
+
 from pynusmv.bmc.glob      import master_be_fsm
 from pynusmv.be.expression import Be
 from pynusmv.wff           import Wff
@@ -25,13 +28,142 @@ from pynusmv.parser import parse_simple_expression
 ###############################################################################
 # Memoization Utility functions:
 ###############################################################################
-# The global cache of memoized values
-MEMOIZER = {}
+class EncodingCache:
+    """
+    A cache of the memoized values _l[[fml]]^i_k of the semantic functions,
+    and of the negation normal forms of the checked formulas.
+
+    The Be expressions are only valid as long as their manager exists: a cache
+    is meant to be used for one model (and typically one formula), see 
+    `encoding_cache`. It can be bounded with `max_entries`, in which case the
+    least recently used entries are dropped first.
+    """
+    def __init__(self, max_entries=None):
+        """
+        :param max_entries: the maximum number of memoized values, or None for
+            no limit.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._nnf = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Retrieves a memoized entry by its key.
+
+        :param key: the key (created with MEMOIZER_key) of the value to retrieve
+        :return: the memoized value corresponding to key or none if nothing was found
+        """
+        res = self._entries.get(key)
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.max_entries is not None:
+                self._entries.move_to_end(key)
+        return res
+
+    def put(self, key, value):
+        """
+        Memoises `value` and associates it with `key`.
+
+        :param key: the key (created with MEMOIZER_key) of the value to store
+        :param value: the value to store
+        """
+        self._entries[key] = value
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def nnf(self, fml, negated):
+        """
+        Returns `fml.nnf(negated)`, computed once: the memoized values are
+        attached to the nodes of the AST, hence the successive bounds must
+        use the same nnf to share them.
+
+        :param fml: the formula to put in negation normal form
+        :param negated: a flag telling whether fml is negated
+        :return: the nnf version of fml
+        """
+        key = (fml, negated)
+        if key not in self._nnf:
+            self._nnf[key] = fml.nnf(negated)
+        return self._nnf[key]
+
+    def clear(self):
+        """Drops all the memoized values and resets the statistics."""
+        self._entries.clear()
+        self._nnf.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns a dictionary with the number of memoized entries, the number
+        of distinct Be nodes they refer to (entries shared between bounds or
+        loops refer to the same node), the hits and the misses.
+
+        .. note::
+            The reduced boolean circuits below the memoized nodes are not
+            accessible through PyNuSMV, hence only the memoized nodes are
+            counted.
+        """
+        return {"entries": len(self._entries),
+                "nodes"  : len(set(self._entries.values())),
+                "hits"   : self.hits,
+                "misses" : self.misses}
+
+# The cache of memoized values, used by the semantic functions
+MEMOIZER = EncodingCache()
+
+@contextmanager
+def encoding_cache(cache=None):
+    """
+    Makes the semantic functions use `cache` (a fresh EncodingCache if None)
+    in the context, and restores the previous cache afterwards.
+
+    :param cache: the EncodingCache to use
+    :return: the used EncodingCache
+    """
+    global MEMOIZER
+    previous = MEMOIZER
+    MEMOIZER = EncodingCache() if cache is None else cache
+    try:
+        yield MEMOIZER
+    finally:
+        MEMOIZER = previous
+
+def reset():
+    """Drops all the values memoized in the current cache."""
+    MEMOIZER.clear()
+
+def nnf(fml, negated):
+    """
+    Returns the negation normal form of `fml` memoized in the current cache
+    (see EncodingCache.nnf).
+
+    :param fml: the formula to put in negation normal form
+    :param negated: a flag telling whether fml is negated
+    :return: the nnf version of fml
+    """
+    return MEMOIZER.nnf(fml, negated)
 
 # creates a key for a cache entry
 def MEMOIZER_key(fml, i, k, l):
     """
     Creates a key for a cache entry.
+
+    The key does not depend on the bound (or the loop) when the value does not:
+        - the values of a formula without temporal operator only depend on
+          the time index;
+        - without loop, the value of a formula whose horizon is h (X nested h
+          times) is the same for all the bounds k >= i + h.
+    Such values are hence shared between the bounds (and the loops).
     
     :param fml: the formula object (typically 'self').
     :param i: the time index.
@@ -39,6 +171,12 @@ def MEMOIZER_key(fml, i, k, l):
     :param l: the loop position. Set this value to -1 in the stright path case.
     :return: a key for the memoized entry _l[[fml]]^i_k
     """
+    horizon = fml.horizon
+    if horizon is not None:
+        if horizon == 0:
+            l = -1
+        if l == -1:
+            k = min(k, i + horizon)
     return (fml, i, k, l)
 
 def MEMOIZER_get(key):
@@ -57,13 +195,13 @@ def MEMOIZE_put(key, value):
     :param key: the key (created with MEMOIZER_key) of the value to store
     :param value: the value to store
     """
-    MEMOIZER[key] = value
+    MEMOIZER.put(key, value)
 
 def memoize_with_loop(fun):
     """
     The decorator to be applied on semantic_with_loop functions to activate the
     memoisation (makes the reduction to SAT linear).
-    
+
     :param fun: the decorated function. (should be of the form:
         fun(fml, enc, i, k, l)
     """
@@ -80,7 +218,7 @@ def memoize_no_loop(fun):
     """
     The decorator to be applied on semantic_no_loop functions to activate the
     memoisation (makes the reduction to SAT linear).
-    
+
     :param fun: the decorated function. (should be of the form:
         fun(fml, enc, i, k)
     """
@@ -91,7 +229,7 @@ def memoize_no_loop(fun):
             res = fun(fml, enc, i, k)
             MEMOIZE_put(key, res)
         return res
-    return memoized   
+    return memoized
 
 ###############################################################################
 # LTL Utility functions:
@@ -275,6 +413,66 @@ class Formula:
         """
         pass
 
+    def linear_semantics(self, encoding, i):
+        """
+        All nodes of the AST must implement this function.
+        Concretely, the role of this function is to generate a propositional
+        equivalent to the bounded LTL semantic of this node at time i in the
+        linear encoding (see :mod:`pynusmv_tools.bmcLTL.linear`), where the
+        loop (if any) is given by the loop selectors of `encoding`.
+
+        ..math::
+            |[self]|_{k}^{i}
+
+        .. note::
+            The semantics of the subformulas must be obtained through
+            `encoding.semantics(fml, time)` (which memoizes them), where time
+            may be k+1: the successor of k, on the loop.
+
+        :param encoding: the LinearEncoding of the problem
+        :param i: the time at which the generated expression will be
+            considered (0 <= i <= k)
+        :return: a boolean expression conform to the ltl bounded semantics of
+            this node
+        """
+        pass
+
+    def linear_auxiliary(self, encoding, i):
+        """
+        Generates the second pass of this node on the loop (from the loop
+        start to k) in the linear encoding, which is needed by the nodes whose
+        semantics at k+1 depends on the whole loop.
+
+        ..math::
+            <<self>>_{k}^{i}
+
+        :param encoding: the LinearEncoding of the problem
+        :param i: the time at which the generated expression will be
+            considered (1 <= i <= k+1)
+        :return: a boolean expression giving the semantics of this node on the
+            loop; by default, the semantics of this node at time i.
+        """
+        return encoding.semantics(self, i)
+
+    @property
+    def horizon(self):
+        """
+        The number of steps after which the semantics without loop of this
+        formula no longer depends on the bound (the nesting depth of X
+        operators), 0 for a formula without temporal operator, or None when
+        the semantics depends on the bound anyway.
+        """
+        if not hasattr(self, "_horizon"):
+            self._horizon = self._get_horizon()
+        return self._horizon
+
+    def _get_horizon(self):
+        """
+        Computes the horizon of this formula (see `horizon`). The nodes whose
+        semantics does not depend on the bound must override this function.
+        """
+        return None
+
     def nnf(self, negated):
         """
         All nodes of the AST must implement this function.
@@ -295,6 +493,9 @@ class Atomic(Formula):
     def __repr__(self):
         return "{}({})".format(type(self).__name__, self.id)
 
+    def _get_horizon(self):
+        return 0
+
 class Unary(Formula):
     """An abstract base class representing AST of an unary proposition"""
     def __init__(self, prop):
@@ -312,6 +513,11 @@ class Binary(Formula):
     def __repr__(self):
         return "({} {} {})".format(self.lhs, type(self).__name__, self.rhs)
 
+    def _get_horizon(self):
+        lhs = self.lhs.horizon
+        rhs = self.rhs.horizon
+        return None if lhs is None or rhs is None else max(lhs, rhs)
+
 ###############################################################################
 # Propositional logic ast nodes
 ###############################################################################
@@ -325,6 +531,9 @@ class Constant(Atomic):
     def semantic_with_loop(self, enc, i, k, l):
         return self.semantic_no_loop(enc, i, k)
 
+    def linear_semantics(self, encoding, i):
+        return self.semantic_no_loop(encoding.enc, i, encoding.k)
+
     def nnf(self, negated):
         if not negated:
             return self
@@ -335,6 +544,13 @@ class Proposition(Atomic):
     def __init__(self, x):
         super().__init__(x)
         self._booleanized = None
+
+    def __getstate__(self):
+        # the booleanized expression belongs to the NuSMV instance of this
+        # process, it is recomputed when needed by another one
+        state = dict(self.__dict__)
+        state["_booleanized"] = None
+        return state
         
     def _booleanize(self):
         """
@@ -385,10 +601,16 @@ class Proposition(Atomic):
     def semantic_with_loop(self, enc, i, k, l):
         return self.semantic_no_loop(enc, i, k)
 
+    def linear_semantics(self, encoding, i):
+        return self._at_time(i)
+
     def nnf(self, negated):
         return self if not negated else Not(self)
 
 class Not(Unary):
+    def _get_horizon(self):
+        return self.prop.horizon
+
     @memoize_no_loop
     def semantic_no_loop(self, enc, i, k):
         return - self.prop.semantic_no_loop(enc, i, k)
@@ -397,6 +619,9 @@ class Not(Unary):
     def semantic_with_loop(self, enc, i, k, l):
         return -self.prop.semantic_with_loop(enc, i, k, l)
 
+    def linear_semantics(self, encoding, i):
+        return -encoding.semantics(self.prop, i)
+
     def nnf(self, negated):
         # double negation removes itself altogether
         return self.prop.nnf(True) if not negated else self.prop.nnf(False)
@@ -414,6 +639,11 @@ class And(Binary):
         rhs = self.rhs.semantic_with_loop(enc, i, k, l)
         return lhs & rhs
 
+    def linear_semantics(self, encoding, i):
+        lhs = encoding.semantics(self.lhs, i)
+        rhs = encoding.semantics(self.rhs, i)
+        return lhs & rhs
+
     def nnf(self, negated):
         if not negated:
             return And(self.lhs.nnf(False), self.rhs.nnf(False))
@@ -434,6 +664,11 @@ class Or(Binary):
         rhs = self.rhs.semantic_with_loop(enc, i, k, l)
         return lhs | rhs
 
+    def linear_semantics(self, encoding, i):
+        lhs = encoding.semantics(self.lhs, i)
+        rhs = encoding.semantics(self.rhs, i)
+        return lhs | rhs
+
     def nnf(self, negated):
         if not negated:
             return Or(self.lhs.nnf(False), self.rhs.nnf(False))
@@ -453,6 +688,11 @@ class Xor(Binary):
         rhs = self.rhs.semantic_with_loop(enc, i, k, l)
         return lhs ^ rhs
 
+    def linear_semantics(self, encoding, i):
+        lhs = encoding.semantics(self.lhs, i)
+        rhs = encoding.semantics(self.rhs, i)
+        return lhs ^ rhs
+
     def nnf(self, negated):
         if not negated:
             return Xor(self.lhs.nnf(False), self.rhs.nnf(False))
@@ -474,6 +714,11 @@ class Imply(Binary):
         rhs = self.rhs.semantic_with_loop(enc, i, k, l)
         return lhs.imply(rhs)
 
+    def linear_semantics(self, encoding, i):
+        lhs = encoding.semantics(self.lhs, i)
+        rhs = encoding.semantics(self.rhs, i)
+        return lhs.imply(rhs)
+
     def nnf(self, negated):
         return Or(Not(self.lhs), self.rhs).nnf(negated)
 
@@ -490,6 +735,11 @@ class Equiv(Binary):
         rhs = self.rhs.semantic_with_loop(enc, i, k, l)
         return lhs.iff(rhs)
 
+    def linear_semantics(self, encoding, i):
+        lhs = encoding.semantics(self.lhs, i)
+        rhs = encoding.semantics(self.rhs, i)
+        return lhs.iff(rhs)
+
     def nnf(self, negated):
         return And(Imply(self.lhs, self.rhs), Imply(self.rhs, self.lhs)).nnf(negated)
 
@@ -498,6 +748,9 @@ class Equiv(Binary):
 ###############################################################################
 
 class Until(Binary):
+    def _get_horizon(self):
+        return None
+
     @memoize_no_loop
     def semantic_no_loop(self, enc, i, k):
         """The semantics when there is no loop:: [[lhs U rhs]]_{bound}^{time}"""
@@ -527,6 +780,20 @@ class Until(Binary):
 
         return _semantic(i, 0)
 
+    def linear_semantics(self, encoding, i):
+        psi = encoding.semantics(self.rhs, i)
+        phi = encoding.semantics(self.lhs, i)
+        return psi | (phi & encoding.semantics(self, i+1))
+
+    def linear_auxiliary(self, encoding, i):
+        # after k, the second pass went around the whole loop:
+        # psi MUST happen before going around the loop again
+        if i > encoding.k:
+            return Be.false(encoding.manager)
+        psi = encoding.semantics(self.rhs, i)
+        phi = encoding.semantics(self.lhs, i)
+        return psi | (phi & encoding.auxiliary(self, i+1))
+
     def nnf(self, negated):
         if not negated:
             return Until(self.lhs.nnf(False), self.rhs.nnf(False))
@@ -537,6 +804,9 @@ class Until(Binary):
             return WeakUntil(psi, And(phi, psi))
 
 class WeakUntil(Binary):
+    def _get_horizon(self):
+        return None
+
     @memoize_no_loop
     def semantic_no_loop(self, enc, i, k):
         """The semantics when there is no loop:: [[lhs W rhs]]_{bound}^{time}"""
@@ -566,6 +836,20 @@ class WeakUntil(Binary):
 
         return _semantic(i, 0)
 
+    def linear_semantics(self, encoding, i):
+        psi = encoding.semantics(self.rhs, i)
+        phi = encoding.semantics(self.lhs, i)
+        return psi | (phi & encoding.semantics(self, i+1))
+
+    def linear_auxiliary(self, encoding, i):
+        # after k, the second pass went around the whole loop:
+        # psi is not forced if phi holds on the whole loop
+        if i > encoding.k:
+            return Be.true(encoding.manager)
+        psi = encoding.semantics(self.rhs, i)
+        phi = encoding.semantics(self.lhs, i)
+        return psi | (phi & encoding.auxiliary(self, i+1))
+
     def nnf(self, negated):
         if not negated:
             return WeakUntil(self.lhs.nnf(False), self.rhs.nnf(False))
@@ -593,6 +877,17 @@ class Globally(Unary):
 
         return _semantic(i, 0)
 
+    def linear_semantics(self, encoding, i):
+        now = encoding.semantics(self.prop, i)
+        return now & encoding.semantics(self, i+1)
+
+    def linear_auxiliary(self, encoding, i):
+        # after k, prop held on the whole loop
+        if i > encoding.k:
+            return Be.true(encoding.manager)
+        now = encoding.semantics(self.prop, i)
+        return now & encoding.auxiliary(self, i+1)
+
     def nnf(self, negated):
         if not negated:
             return Globally(self.prop.nnf(False))
@@ -622,6 +917,17 @@ class Eventually(Unary):
         
         return _semantic(i, 0)
 
+    def linear_semantics(self, encoding, i):
+        now = encoding.semantics(self.prop, i)
+        return now | encoding.semantics(self, i+1)
+
+    def linear_auxiliary(self, encoding, i):
+        # after k, prop did not hold anywhere on the loop
+        if i > encoding.k:
+            return Be.false(encoding.manager)
+        now = encoding.semantics(self.prop, i)
+        return now | encoding.auxiliary(self, i+1)
+
     def nnf(self, negated):
         if not negated:
             return Eventually(self.prop.nnf(False))
@@ -629,6 +935,10 @@ class Eventually(Unary):
             return Globally(self.prop.nnf(True))
 
 class Next(Unary):
+    def _get_horizon(self):
+        horizon = self.prop.horizon
+        return None if horizon is None else horizon + 1
+
     @memoize_no_loop
     def semantic_no_loop(self, enc, i, k):
         if i >= k:
@@ -644,6 +954,9 @@ class Next(Unary):
 
         return self.prop.semantic_with_loop(enc, successor(i, k, l), k, l)
 
+    def linear_semantics(self, encoding, i):
+        return encoding.semantics(self.prop, i+1)
+
     def nnf(self, negated):
         return Next(self.prop.nnf(negated))
         
@@ -0,0 +1,68 @@
+#! /usr/local/bin/python3
+"""
+This module is the entry point of a simple sat based k-induction prover for
+invariants ([] p, where p is propositional) written in the LTL syntax of
+:mod:`pynusmv_tools.bmcLTL` and implemented using the PyNuSMV library.
+"""
+import sys
+import argparse
+
+from pynusmv.init         import init_nusmv
+from pynusmv.glob         import load
+from pynusmv.bmc.glob     import BmcSupport
+from pynusmv_tools.bmcLTL.parsing   import parseLTL
+from pynusmv_tools.bmcLTL.induction import check_invariant
+from pynusmv_tools.bmcLTL.ast       import EncodingCache
+
+def arguments():
+    """
+    Creates the arguments parser and manages to react to wrong usage.
+
+    :returns: an object having field to store each of the command line arguments
+    """
+    parser = argparse.ArgumentParser(description="a PyNuSMV backed sat based k-induction prover for invariants")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Displays the text of the analyzed model")
+    parser.add_argument("-k", "--bound",   type=int, default=10, help="the maximum length of the induction")
+    parser.add_argument("-s", "--spec",    type=str, help="the invariant ([] p) to prove")
+    parser.add_argument("-i", "--no-invariants",help="disable the invariants enforcement", action="store_true")
+    parser.add_argument("-p", "--no-simple-path", action="store_true", help="do not constrain the paths of the inductive step to be simple")
+    parser.add_argument("-m", "--max-encodings", type=int, default=None, help="the maximum number of memoized encodings per formula (default: no limit)")
+    parser.add_argument("model", type=str, help="the name of a file containing an SMV model")
+
+    return parser.parse_args()
+
+def check(formula, args):
+    try:
+        parsed_fml          = parseLTL(formula.strip())
+        status,length,trace = check_invariant(parsed_fml, args.bound, args.no_invariants, not args.no_simple_path, EncodingCache(args.max_encodings))
+        print("-- {} for length {}".format(status, length))
+        if trace is not None:
+            print(trace)
+    except ValueError as e:
+        # not an invariant
+        print(e)
+    except Exception as e:
+        print("The specification contains a syntax error")
+        print(e)
+
+def main():
+    """
+    The main program.
+    """
+    args = arguments()
+    with init_nusmv():
+        load(args.model)
+        if args.verbose:
+            with open(args.model) as f:
+                print(f.read())
+
+        with BmcSupport():
+            if args.spec is not None:
+                check(args.spec, args)
+            else:
+                print("Enter invariants, one per line:")
+                for line in sys.stdin:
+                    check(line, args)
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ problem for an LTL verification. (This api fully originates from nusmv).
 """
 import sys
 import argparse
+from contextlib           import closing
 
 from pynusmv.init         import init_nusmv
 from pynusmv.glob         import load
@@ -16,6 +17,7 @@ from pynusmv.parser       import parse_ltl_spec
 from pynusmv.node         import Node
 from pynusmv.sat          import SatSolverFactory, Polarity, SatSolverResult
 from pynusmv.bmc          import ltlspec, utils as bmcutils
+from pynusmv_tools.utils  import portfolio
 
 def arguments():
     """
@@ -30,6 +32,7 @@ def arguments():
     parser.add_argument("-f", "--no-fairness",  help="disable the use of fairness constraints", action="store_true")
     parser.add_argument("-i", "--no-invariants",help="disable the invariants enforcement", action="store_true")
     parser.add_argument("-d", "--dry-run", action="store_true", help="do not perform the verification (no sat solving)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="the number of processes solving the different lengths concurrently")
     parser.add_argument("model", type=str, help="the name of a file containing an SMV model")
 
     return parser.parse_args()
@@ -67,9 +70,56 @@ def check_ltl(fml, bound, dry_run):
 
     return ("Ok", bound, None)
 
+def _check_length(task):
+    """
+    Checks the problem of one length in a process of a portfolio (see
+    `check_ltl_portfolio`).
+
+    :param task: a tuple (formula, length, dry_run) where formula is the text
+        of the LTL property (nodes cannot be passed between processes)
+    :return: None if no counter example of length `length` exists, and the
+        text of the counter example otherwise.
+    """
+    formula, length, dry_run = task
+    fsm     = master_be_fsm()
+    fml     = Node.from_ptr(parse_ltl_spec(formula))
+    problem = ltlspec.generate_ltl_problem(fsm, fml, length)
+    if dry_run:
+        return None
+    status, trace = check_problem(problem, length)
+    return None if status == "Ok" else str(trace)
+
+def check_ltl_portfolio(formula, bound, model, processes=None, dry_run=False):
+    """
+    Performs the same verification as `check_ltl` but solves the problems of
+    the different lengths concurrently, in a pool of `processes` processes
+    which have loaded the SMV model at path `model` (see
+    :mod:`pynusmv_tools.utils.portfolio`). The shortest counter example wins
+    and the problems of the longer lengths are cancelled.
+
+    :param formula: the text of the LTL property, in NuSMV syntax
+    :param bound: the maximum length of a path in the verification.
+    :param model: the path to the SMV model loaded in the current process.
+    :param processes: the number of processes (None for the number of cpus).
+    :return: a tuple (status, len, trace) as for `check_ltl`, except that the
+        trace is given as text (traces cannot be passed between processes).
+    """
+    tasks = [(formula, i, dry_run) for i in range(bound+1)]
+    with closing(portfolio.solve(model, _check_length, tasks,
+                                 processes)) as results:
+        for i, trace in enumerate(results):
+            if trace is not None:
+                return ("Violation", i, trace)
+            print("-- No problem at length {}".format(i))
+
+    return ("Ok", bound, None)
+
 def check(formula, args):
-    parsed_fml          = Node.from_ptr(parse_ltl_spec(formula.strip()))
-    status,length,trace = check_ltl(parsed_fml, args.bound, args.dry_run)
+    if args.jobs != 1:
+        status,length,trace = check_ltl_portfolio(formula.strip(), args.bound, args.model, args.jobs, args.dry_run)
+    else:
+        parsed_fml          = Node.from_ptr(parse_ltl_spec(formula.strip()))
+        status,length,trace = check_ltl(parsed_fml, args.bound, args.dry_run)
     if status != 'Ok':
         print("-- {} for length {}".format(status, length))
         print(trace)
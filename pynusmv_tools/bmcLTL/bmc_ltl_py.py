@@ -11,6 +11,7 @@ from pynusmv.glob         import load
 from pynusmv.bmc.glob     import BmcSupport
 from pynusmv_tools.bmcLTL.parsing import parseLTL
 from pynusmv_tools.bmcLTL.check   import check_ltl
+from pynusmv_tools.bmcLTL.ast     import EncodingCache
 
 def arguments():
     """
@@ -25,6 +26,10 @@ def arguments():
     parser.add_argument("-f", "--no-fairness",  help="disable the use of fairness constraints", action="store_true")
     parser.add_argument("-i", "--no-invariants",help="disable the invariants enforcement", action="store_true")
     parser.add_argument("-d", "--dry-run", action="store_true", help="do not perform the verification (no sat solving)")
+    parser.add_argument("-n", "--incremental", action="store_true", help="use one incremental sat solver for all the lengths")
+    parser.add_argument("-m", "--max-encodings", type=int, default=None, help="the maximum number of memoized encodings per formula (default: no limit)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="the number of processes solving the different lengths concurrently")
+    parser.add_argument("-l", "--linear", action="store_true", help="use the linear encoding of the property (loop selectors)")
     parser.add_argument("model", type=str, help="the name of a file containing an SMV model")
 
     return parser.parse_args()
@@ -32,7 +37,7 @@ def arguments():
 def check(formula, args):
     try:
         parsed_fml          = parseLTL(formula.strip())
-        status,length,trace = check_ltl(parsed_fml, args.bound, args.no_fairness, args.no_invariants, args.dry_run)
+        status,length,trace = check_ltl(parsed_fml, args.bound, args.no_fairness, args.no_invariants, args.dry_run, args.incremental, EncodingCache(args.max_encodings), args.jobs, args.model, args.linear)
         if status != 'Ok':
             print("-- {} for length {}".format(status, length))
             print(trace)
@@ -2,12 +2,32 @@
 This module contains the functions to perform the bounded model checking of a 
 given LTL property. 
 """
+from contextlib         import closing, contextmanager
+
 from pynusmv.bmc.glob   import master_be_fsm
 from pynusmv.sat        import SatSolverResult, SatSolverFactory, Polarity
 from pynusmv.bmc.utils  import generate_counter_example
-from pynusmv_tools.bmcLTL.gen   import generate_problem
+from pynusmv_tools.bmcLTL.gen   import generate_problem, property_problem
+from pynusmv_tools.bmcLTL.linear import loop_variable
+from pynusmv_tools.bmcLTL.ast   import encoding_cache, nnf
+from pynusmv_tools.utils        import portfolio
 
-def check_ltl_onepb(fml, length, no_fairness=False, no_invar=False, dry_run=False):
+@contextmanager
+def _loop_variable(linear):
+    """
+    Adds the loop variable of the linear encoding in the context if `linear`
+    is set (see `linear.loop_variable`).
+    
+    :return: the loop variable, or None if `linear` is not set
+    """
+    if not linear:
+        yield None
+    else:
+        with loop_variable(master_be_fsm()) as loop_var:
+            yield loop_var
+
+def check_ltl_onepb(fml, length, no_fairness=False, no_invar=False, dry_run=False,
+                    loop_var=None):
     """
     This function verifies that the given FSM satisfies the given property
     for paths with an exact length of `length`.
@@ -22,6 +42,8 @@ def check_ltl_onepb(fml, length, no_fairness=False, no_invar=False, dry_run=Fals
     :param no_invar: a flag telling whether or not the generated problem 
         should enforce the declared invariants (these must be declared in the
         SMV text).
+    :param loop_var: the loop variable (see `linear.loop_variable`) when the
+        linear encoding of the property must be used, or None.
     :return: a tuple ('OK', None) if the property is satisfied on all paths of 
         length `length`
     :return: a tuple ('Violation', counter_example) if the property is violated. 
@@ -29,7 +51,8 @@ def check_ltl_onepb(fml, length, no_fairness=False, no_invar=False, dry_run=Fals
         the property
     """
     fsm    = master_be_fsm()
-    pb     = generate_problem(fml, fsm, length, no_fairness, no_invar)
+    pb     = generate_problem(fml, fsm, length, no_fairness, no_invar,
+                              loop_var)
     
     if not dry_run:
         cnf    = pb.to_cnf(Polarity.POSITIVE)
@@ -45,7 +68,145 @@ def check_ltl_onepb(fml, length, no_fairness=False, no_invar=False, dry_run=Fals
             return ("Ok", None)
     return ("Ok", None)
     
-def check_ltl(fml, bound, no_fairness=False, no_invar=False, dry_run=False):
+def check_ltl_incremental(fml, bound, no_fairness=False, no_invar=False,
+                          dry_run=False, cache=None, linear=False):
+    """
+    This function performs the same verification as `check_ltl` but keeps one
+    incremental SAT solver alive for all the lengths from 0 to bound.
+    
+    The unrolled model is never regenerated: the initial states and, at every
+    length, the new transition step (and invariants) are added to the
+    permanent group of the solver. The property encoding of each length is 
+    added to a group of its own, solved together with the permanent one and 
+    destroyed afterwards, such that the solver keeps what it learnt about the
+    model from a length to the next.
+    
+    .. note::
+        Groups play the role of activation literals: the assumptions api of
+        the solvers is not usable from PyNuSMV (it crashes).
+    
+    :param fml: an LTL formula parsed with `pynusmv_tools.bmcLTL.parsing` (hence the 
+        abstract syntax tree of that formula). Note, this is *NOT* the NuSMV
+        format (Node).
+    :param bound: the maximum length of a path in the verification.
+    :param no_fairness: a flag telling whether or not the generated problem should
+        focus on fair executions only (the considered fairness constraints must
+        be declared in the SMV model).
+    :param no_invar: a flag telling whether or not the generated problem 
+        should enforce the declared invariants (these must be declared in the
+        SMV text).
+    :param cache: the EncodingCache memoizing the encodings of the formula 
+        for all the lengths (a fresh one if None).
+    :param linear: a flag telling whether the linear encoding of the property
+        should be used (see :mod:`pynusmv_tools.bmcLTL.linear`).
+    :return: a tuple (status, len, trace) as for `check_ltl`.
+    """
+    with encoding_cache(cache), _loop_variable(linear) as loop_var:
+        return _check_ltl_incremental(fml, bound, no_fairness, no_invar, 
+                                      dry_run, loop_var)
+
+def _check_ltl_incremental(fml, bound, no_fairness, no_invar, dry_run,
+                           loop_var):
+    """The implementation of `check_ltl_incremental`."""
+    fsm     = master_be_fsm()
+    enc     = fsm.encoding
+    negated = nnf(fml, True)
+    solver  = SatSolverFactory.create(incremental=True)
+    
+    def permanent(be):
+        if not dry_run:
+            cnf = be.to_cnf(Polarity.POSITIVE)
+            solver.add(cnf)
+            solver.polarity(cnf, Polarity.POSITIVE)
+        return be
+    
+    model = permanent(enc.shift_to_time(fsm.init, 0))
+    for i in range(bound+1):
+        if i > 0:
+            model = model & permanent(enc.shift_to_time(fsm.trans, i-1))
+        if not no_invar:
+            model = model & permanent(enc.shift_to_time(fsm.invariants, i))
+        
+        prop = property_problem(negated, fsm, i, no_fairness, loop_var)
+        if not dry_run:
+            group = solver.create_group()
+            cnf   = prop.to_cnf(Polarity.POSITIVE)
+            solver.add_to_group(cnf, group)
+            solver.polarity(cnf, Polarity.POSITIVE, group)
+            
+            if solver.solve_groups([group]) == SatSolverResult.SATISFIABLE:
+                cnt_ex = generate_counter_example(fsm, model & prop, solver,
+                                                  i, str(fml))
+                if loop_var is not None:
+                    # the trace uses the loop variable
+                    cnt_ex = str(cnt_ex)
+                return ("Violation", i, cnt_ex)
+            # retract the property of this length
+            solver.destroy_group(group)
+        print("-- No problem at length {}".format(i))
+    
+    return ("Ok", bound, None)
+    
+def _check_ltl_length(task):
+    """
+    Performs `check_ltl_onepb` in a process of a portfolio (see 
+    `check_ltl_portfolio`).
+    
+    :param task: a tuple (fml, length, no_fairness, no_invar, dry_run, linear)
+    :return: None if the property holds for paths of exactly `length` steps, 
+        and the text of the counter example otherwise.
+    """
+    fml, length, no_fairness, no_invar, dry_run, linear = task
+    with encoding_cache(), _loop_variable(linear) as loop_var:
+        status, trace = check_ltl_onepb(fml, length, no_fairness, no_invar,
+                                        dry_run, loop_var)
+        # the trace may use the loop variable
+        trace = None if trace is None else str(trace)
+    return None if status == "Ok" else trace
+
+def check_ltl_portfolio(fml, bound, model, processes=None, no_fairness=False,
+                        no_invar=False, dry_run=False, linear=False):
+    """
+    This function performs the same verification as `check_ltl` but solves
+    the problems of the different lengths concurrently, in a pool of 
+    `processes` processes which have loaded the SMV model at path `model`
+    (see :mod:`pynusmv_tools.utils.portfolio`).
+    
+    The problems are dispatched by increasing length and their outcome is 
+    considered in that order: the shortest counter example wins and the 
+    problems of the longer lengths are cancelled.
+    
+    :param fml: an LTL formula parsed with `pynusmv_tools.bmcLTL.parsing` (hence the 
+        abstract syntax tree of that formula). Note, this is *NOT* the NuSMV
+        format (Node).
+    :param bound: the maximum length of a path in the verification.
+    :param model: the path to the SMV model loaded in the current process.
+    :param processes: the number of processes (None for the number of cpus).
+    :param no_fairness: a flag telling whether or not the generated problem should
+        focus on fair executions only (the considered fairness constraints must
+        be declared in the SMV model).
+    :param no_invar: a flag telling whether or not the generated problem 
+        should enforce the declared invariants (these must be declared in the
+        SMV text).
+    :param linear: a flag telling whether the linear encoding of the property
+        should be used (see :mod:`pynusmv_tools.bmcLTL.linear`).
+    :return: a tuple (status, len, trace) as for `check_ltl`, except that the
+        trace is given as text (traces cannot be passed between processes).
+    """
+    tasks = [(fml, i, no_fairness, no_invar, dry_run, linear)
+             for i in range(bound+1)]
+    with closing(portfolio.solve(model, _check_ltl_length, tasks,
+                                 processes)) as results:
+        for i, trace in enumerate(results):
+            if trace is not None:
+                return ("Violation", i, trace)
+            print("-- No problem at length {}".format(i))
+    
+    return ("Ok", bound, None)
+    
+def check_ltl(fml, bound, no_fairness=False, no_invar=False, dry_run=False,
+              incremental=False, cache=None, processes=1, model=None,
+              linear=False):
     """
     This function performs the bounded model checking of the formula given in 
     text format (as specified per the grammar in `parsing` module). It verifies
@@ -61,17 +222,52 @@ def check_ltl(fml, bound, no_fairness=False, no_invar=False, dry_run=False):
     :param no_invar: a flag telling whether or not the generated problem 
         should enforce the declared invariants (these must be declared in the
         SMV text).
+    :param incremental: a flag telling whether one incremental solver should
+        be used for all the lengths (see `check_ltl_incremental`).
+    :param cache: the EncodingCache memoizing the encodings of the formula 
+        for all the lengths (a fresh one if None). It is only used during
+        this verification, such that the encodings of a formula do not 
+        outlive its verification.
+    :param processes: the number of processes solving the problems of the
+        different lengths concurrently (see `check_ltl_portfolio`), or None 
+        for the number of cpus.
+    :param model: the path to the loaded SMV model, required when several
+        processes are used.
+    :param linear: a flag telling whether the linear encoding of the property
+        should be used (see :mod:`pynusmv_tools.bmcLTL.linear`) instead of
+        the one of `Formula.bounded_semantics`. The trace is then given as
+        text, since it uses the loop variable which only exists during the
+        verification.
     :return: a tuple (status, len, trace) where status is 'Ok', len = bound and
         trace is None when no counter example was identified. Otherwise, 
         status = 'Violation', len the number of steps to reach a violation and
         trace is a counter example leading to a property violation.
     """
-    for i in range(bound+1):
-        status, trace = check_ltl_onepb(fml, i, no_fairness, no_invar, dry_run) 
-        if status != "Ok":
-            return (status, i, trace)
-        else:
-            print("-- No problem at length {}".format(i))
+    if processes != 1:
+        if incremental:
+            raise ValueError("The incremental check cannot use several "
+                             "processes")
+        if model is None:
+            raise ValueError("The path to the model is required to use "
+                             "several processes")
+        return check_ltl_portfolio(fml, bound, model, processes, no_fairness,
+                                   no_invar, dry_run, linear)
+    
+    if incremental:
+        return check_ltl_incremental(fml, bound, no_fairness, no_invar,
+                                     dry_run, cache, linear)
+    
+    with encoding_cache(cache), _loop_variable(linear) as loop_var:
+        for i in range(bound+1):
+            status, trace = check_ltl_onepb(fml, i, no_fairness, no_invar, dry_run,
+                                            loop_var)
+            if status != "Ok":
+                if linear:
+                    # the trace uses the loop variable
+                    trace = str(trace)
+                return (status, i, trace)
+            else:
+                print("-- No problem at length {}".format(i))
             
     return ("Ok", bound, None)
     
\ No newline at end of file
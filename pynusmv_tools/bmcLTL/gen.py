@@ -1,4 +1,5 @@
 from pynusmv.be.expression import Be 
+from pynusmv_tools.bmcLTL    import ast, linear
 
 def model_problem(fsm, bound):
     """
@@ -40,7 +41,27 @@ def invariants_constraint(fsm, k):
     #    \bigwedge_{i=0}^{k} (invariants_{i})
     return fsm.encoding.and_interval(fsm.invariants, 0, k)
 
-def generate_problem(fml, fsm, k=10, no_fairness=False, no_invar=False):
+def property_problem(negated, fsm, k, no_fairness=False, loop_var=None):
+    """
+    Computes the bounded semantics of the negated property, with the encoding
+    of `Formula.bounded_semantics` or with the linear encoding of 
+    :mod:`pynusmv_tools.bmcLTL.linear` when a loop variable is given.
+    
+    :param negated: the negation of the property, in negation normal form
+    :param fsm: the FSM representing the model.
+    :param k: the maximum (horizon/bound) time of the problem
+    :param no_fairness: a flag telling whether or not the generated problem should
+        focus on fair executions only.
+    :param loop_var: the loop variable (see `linear.loop_variable`), or None
+    :return: the bounded semantics of `negated` on paths of length k
+    """
+    if loop_var is None:
+        return negated.bounded_semantics(fsm, k, fairness = not no_fairness)
+    return linear.bounded_semantics(negated, fsm, k, loop_var,
+                                    fairness = not no_fairness)
+
+def generate_problem(fml, fsm, k=10, no_fairness=False, no_invar=False,
+                     loop_var=None):
     """
     Generates a formula representing a SAT problem that is satisfiable iff
     the the `fsm` violates the formula represented in `formula_text`.
@@ -59,13 +80,16 @@ def generate_problem(fml, fsm, k=10, no_fairness=False, no_invar=False):
     :param no_invar: a flag telling whether or not the generated problem 
         should enforce the declared invariants (these must be declared in the
         SMV text).
+    :param loop_var: the loop variable (see `linear.loop_variable`) when the
+        linear encoding of the property must be used, or None for the 
+        encoding of `Formula.bounded_semantics`.
     :return: a Be expression that is satisfiable iff the fsm can violate the 
         stated property [[M, f]]_{k}
     """
-    negated = fml.nnf(True)
+    negated = ast.nnf(fml, True)
     
     problem = model_problem(fsm, k) & \
-              negated.bounded_semantics(fsm, k, fairness = not no_fairness)
+              property_problem(negated, fsm, k, no_fairness, loop_var)
     
     # enforce invariants if needed
     if not no_invar:
@@ -0,0 +1,147 @@
+"""
+This module contains the functions to prove invariants ([] p, where p is a
+propositional formula) with k-induction, using the bmcLTL machinery.
+
+Bounded model checking can only tell that no counter example exists up to
+some bound. k-induction completes it with an inductive step: if p holds on
+every path of k+1 states (without loop) and does not hold after them, p
+cannot be violated anywhere, provided that it holds at the first k+1 steps
+of every path starting from an initial state (the base case, which is plain
+bounded model checking). Requiring that the states of the paths of the
+inductive step are all different (simple paths) makes the method complete:
+the step eventually succeeds for k the length of the longest simple path of
+the model.
+
+Both the base case and the inductive step use an incremental solver, whose
+permanent group grows with the bound, the negation of the property at the
+last step being added to a group of its own, solved and destroyed (see
+`check.check_ltl_incremental`).
+
+.. note::
+    References, see
+
+        Sheeran et al - ``Checking Safety Properties Using Induction and a
+        SAT-Solver'' - 2000
+"""
+from pynusmv.bmc.glob   import master_be_fsm
+from pynusmv.be.expression import Be
+from pynusmv.sat        import SatSolverResult, SatSolverFactory, Polarity
+from pynusmv.bmc.utils  import generate_counter_example
+
+from pynusmv_tools.bmcLTL     import ast
+from pynusmv_tools.bmcLTL.gen import model_problem, invariants_constraint
+
+def invariant_proposition(fml):
+    """
+    Returns the propositional formula p of the invariant `fml` = [] p.
+
+    :param fml: an LTL formula parsed with `pynusmv_tools.bmcLTL.parsing`
+    :return: the propositional formula p such that fml = [] p.
+    :raise ValueError: if fml is not an invariant.
+    """
+    if not isinstance(fml, ast.Globally) or fml.prop.horizon != 0:
+        raise ValueError("Only invariants ([] p with p propositional) can be "
+                         "proved by induction: {}".format(fml))
+    return fml.prop
+
+class _IncrementalProblem:
+    """
+    An incremental solver whose permanent group grows with the bound.
+    """
+    def __init__(self):
+        self.solver = SatSolverFactory.create(incremental=True)
+
+    def add(self, be):
+        """Adds the constraint `be` to the permanent group."""
+        cnf = be.to_cnf(Polarity.POSITIVE)
+        self.solver.add(cnf)
+        self.solver.polarity(cnf, Polarity.POSITIVE)
+
+    def satisfiable(self, be):
+        """
+        Returns whether the permanent constraints and `be` are satisfiable;
+        `be` is retracted afterwards (unless it is satisfiable: the model of
+        the solver must remain available).
+        """
+        group = self.solver.create_group()
+        cnf   = be.to_cnf(Polarity.POSITIVE)
+        self.solver.add_to_group(cnf, group)
+        self.solver.polarity(cnf, Polarity.POSITIVE, group)
+        if self.solver.solve_groups([group]) == SatSolverResult.SATISFIABLE:
+            return True
+        self.solver.destroy_group(group)
+        return False
+
+def check_invariant(fml, bound, no_invar=False, simple_path=True, cache=None):
+    """
+    This function tries to prove the invariant `fml` by k-induction, for k
+    from 0 to bound.
+
+    :param fml: an LTL formula parsed with `pynusmv_tools.bmcLTL.parsing`
+        (hence the abstract syntax tree of that formula) of the form [] p,
+        where p is propositional.
+    :param bound: the maximum k of the induction.
+    :param no_invar: a flag telling whether or not the generated problems
+        should enforce the declared invariants (these must be declared in the
+        SMV text).
+    :param simple_path: a flag telling whether the paths of the inductive
+        step are constrained to be simple (without it, the method is not
+        complete: some invariants cannot be proved whatever the bound).
+    :param cache: the `ast.EncodingCache` memoizing the encodings of the
+        property (None for a fresh one).
+    :return: a tuple (status, k, trace) where
+        - status is 'Proved' and k the length of the induction when the
+          invariant holds;
+        - status is 'Violation', k the length of the counter example and
+          trace is the counter example when the invariant is violated;
+        - status is 'Unknown' and k = bound when neither could be
+          established up to bound.
+    :raise ValueError: if fml is not an invariant.
+    """
+    prop = invariant_proposition(fml)
+    with ast.encoding_cache(cache):
+        return _check_invariant(fml, prop, bound, no_invar, simple_path)
+
+def _check_invariant(fml, prop, bound, no_invar, simple_path):
+    """The implementation of `check_invariant`."""
+    fsm  = master_be_fsm()
+    enc  = fsm.encoding
+
+    def p_at(time):
+        return prop.semantic_no_loop(enc, time, time)
+
+    def invariants_at(time):
+        if no_invar:
+            return Be.true(enc.manager)
+        return enc.shift_to_time(fsm.invariants, time)
+
+    base = _IncrementalProblem()
+    step = _IncrementalProblem()
+
+    base.add(enc.shift_to_time(fsm.init, 0) & invariants_at(0))
+    step.add(invariants_at(0))
+    for k in range(bound+1):
+        # base case: is p violated after k steps from an initial state?
+        if k > 0:
+            base.add(enc.shift_to_time(fsm.trans, k-1) & invariants_at(k))
+        if base.satisfiable(-p_at(k)):
+            problem = model_problem(fsm, k) & -p_at(k)
+            if not no_invar:
+                problem = problem & invariants_constraint(fsm, k)
+            cnt_ex  = generate_counter_example(fsm, problem, base.solver, k,
+                                               str(fml))
+            return ("Violation", k, cnt_ex)
+        # p holds on the first k+1 states of all the paths
+        base.add(p_at(k))
+
+        # inductive step: can p be violated after k+1 states satisfying it?
+        step.add(p_at(k) & enc.shift_to_time(fsm.trans, k)
+                 & invariants_at(k+1))
+        if simple_path:
+            for i in range(k+1):
+                step.add(-ast.loop_condition(enc, k+1, i))
+        if not step.satisfiable(-p_at(k+1)):
+            return ("Proved", k, None)
+        print("-- Not inductive at length {}".format(k))
+
+    return ("Unknown", bound, None)
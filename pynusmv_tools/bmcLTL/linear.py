@@ -0,0 +1,200 @@
+"""
+This module implements the linear encoding of the bounded semantics of LTL
+as an alternative to the one of :mod:`pynusmv_tools.bmcLTL.ast`.
+
+The encoding of `Formula.bounded_semantics` enumerates the possible loops
+and, for each of them, unfolds the temporal operators up to k times, which
+yields a formula whose size is cubic in the bound. The linear encoding uses
+loop selectors instead: l_j (1 <= j <= k) states that the path loops back
+from k to j (that is, s_{j-1} = s_k, and the successor of k is j). The
+selectors are the values, at every time, of a fresh state variable that the
+model does not constrain (the loop variable of NuSMV's SBMC, see
+`loop_variable`), and at most one of them holds. The semantics of every
+subformula is then generated once per time (from 0 to k+1, where k+1 stands
+for the selected loop position) and, for the eventualities, once more for a
+second pass on the loop. The size of the encoding is hence linear in the
+bound and in the size of the formula.
+
+.. note::
+    References, see
+
+        Biere et al - ``Linear Encodings of Bounded LTL Model Checking'' - 2006
+        Latvala et al - ``Simple Bounded LTL Model Checking'' - 2004
+
+    When no selector holds, the path has no loop and the semantics are the
+    ones of `Formula.semantic_no_loop`. Like `Formula.bounded_semantics`, the
+    fairness constraints only apply to the paths with a loop.
+"""
+from contextlib import contextmanager
+
+from pynusmv.be.expression import Be
+from pynusmv_lower_interface.nusmv.bmc.sbmc import sbmc as _sbmc
+
+@contextmanager
+def loop_variable(fsm):
+    """
+    Adds the loop variable of NuSMV's SBMC (a fresh boolean state variable
+    which is not constrained by the model) to the encoding of `fsm` in the
+    context, and removes it afterwards.
+
+    .. warning::
+        The expressions (and counter examples) using the loop variable must
+        not outlive the context.
+
+    :param fsm: the BeFsm of the model
+    :return: the (untimed) BeVar of the loop variable
+    """
+    enc    = fsm.encoding
+    before = {str(v.name) for v in enc.curr_variables}
+    _sbmc.sbmc_add_loop_variable(fsm._ptr)
+    try:
+        added = [v for v in enc.curr_variables if str(v.name) not in before]
+        yield added[0]
+    finally:
+        _sbmc.sbmc_remove_loop_variable(fsm._ptr)
+
+class LinearEncoding:
+    """
+    The linear encoding of the bounded semantics of formulas on paths of
+    length k. The semantics of the nodes are memoized: one encoding is meant
+    to be used for one bound.
+    """
+    def __init__(self, fsm, k, loop_var):
+        """
+        :param fsm: the BeFsm of the model
+        :param k: the last time that exists in the universe of this encoding
+        :param loop_var: the loop variable (see `loop_variable`)
+        """
+        self.fsm      = fsm
+        self.enc      = fsm.encoding
+        self.manager  = self.enc.manager
+        self.k        = k
+        self.loop_var = loop_var
+        # the selectors l_1 ... l_k (l_0 is never selected)
+        self.selectors= [Be.false(self.manager)] + \
+                        [loop_var.at_time[j].boolean_expression
+                         for j in range(1, k+1)]
+        self._semantics = {}
+        self._auxiliary = {}
+
+    def _state_equality(self, i, j):
+        """
+        Returns a Be expression stating that the states at times i and j are
+        the same (the loop variable is not part of the states).
+        """
+        loop = str(self.loop_var.name)
+        cond = Be.true(self.manager)
+        for v in self.enc.curr_variables:
+            if str(v.name) != loop:
+                vi   = v.at_time[i].boolean_expression
+                vj   = v.at_time[j].boolean_expression
+                cond = cond & vi.iff(vj)
+        return cond
+
+    def in_loop(self):
+        """
+        Returns the list of the InLoop_j expressions (0 <= j <= k) stating
+        that time j is on the selected loop.
+        """
+        in_loop = [Be.false(self.manager)]
+        for j in range(1, self.k+1):
+            in_loop.append(in_loop[-1] | self.selectors[j])
+        return in_loop
+
+    def loop_exists(self):
+        """Returns a Be expression stating that a loop is selected."""
+        return self.in_loop()[-1]
+
+    def loop_constraints(self):
+        """
+        Returns the constraints on the loop selectors: a selected loop is a
+        loop of the path and at most one loop is selected.
+        """
+        in_loop = self.in_loop()
+        cond    = Be.true(self.manager)
+        for j in range(1, self.k+1):
+            l_j  = self.selectors[j]
+            cond = cond & l_j.imply(self._state_equality(j-1, self.k)) \
+                        & in_loop[j-1].imply(-l_j)
+        return cond
+
+    def fairness(self):
+        """
+        Returns the constraint forcing the selected loop to visit every
+        fairness constraint of the model.
+        """
+        in_loop = self.in_loop()
+        cond    = Be.true(self.manager)
+        for fairness in self.fsm.fairness_iterator():
+            visited = Be.false(self.manager)
+            for j in range(1, self.k+1):
+                visited |= in_loop[j] & self.enc.shift_to_time(fairness, j)
+            cond = cond & visited
+        return cond
+
+    def _on_loop(self, generate):
+        """
+        Returns the disjunction, for every selector l_j, of l_j and
+        generate(j): the value of generate at the selected loop position.
+        """
+        res = Be.false(self.manager)
+        for j in range(1, self.k+1):
+            res |= self.selectors[j] & generate(j)
+        return res
+
+    def semantics(self, fml, i):
+        """
+        Returns the memoized semantics of `fml` at time i (0 <= i <= k+1).
+        At time k+1, it is the second pass of fml at the selected loop
+        position (false when there is no loop).
+
+        :param fml: a formula in negation normal form
+        :param i: the time at which fml is considered
+        :return: a Be expression translating |[fml]|_{k}^{i}
+        """
+        key = (fml, i)
+        res = self._semantics.get(key)
+        if res is None:
+            if i > self.k:
+                res = self._on_loop(lambda j: self.auxiliary(fml, j))
+            else:
+                res = fml.linear_semantics(self, i)
+            self._semantics[key] = res
+        return res
+
+    def auxiliary(self, fml, i):
+        """
+        Returns the memoized second pass of `fml` on the loop at time i
+        (1 <= i <= k+1).
+
+        :param fml: a formula in negation normal form
+        :param i: the time at which fml is considered
+        :return: a Be expression translating <<fml>>_{k}^{i}
+        """
+        key = (fml, i)
+        res = self._auxiliary.get(key)
+        if res is None:
+            res = fml.linear_auxiliary(self, i)
+            self._auxiliary[key] = res
+        return res
+
+def bounded_semantics(fml, fsm, k, loop_var, fairness=True):
+    """
+    Returns a boolean expression corresponding to the bounded semantics of
+    the formula `fml` on a path of length k, in the linear encoding. It
+    replaces `fml.bounded_semantics(fsm, k, fairness)`.
+
+    :param fml: a formula in negation normal form
+    :param fsm: the FSM representing the model.
+    :param k: the last time that exists in the universe of this expression
+    :param loop_var: the loop variable (see `loop_variable`)
+    :param fairness: a flag indicating whether or not the fairness constraints
+        should be taken into account while generating the formula.
+    :return: a boolean expression translating the bounded semantics of this
+        formula.
+    """
+    encoding = LinearEncoding(fsm, k, loop_var)
+    problem  = encoding.loop_constraints() & encoding.semantics(fml, 0)
+    if fairness:
+        problem &= encoding.loop_exists().imply(encoding.fairness())
+    return problem
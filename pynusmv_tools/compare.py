@@ -3,6 +3,8 @@ from pynusmv.glob import *
 import sys
 import argparse
 
+from .utils import explicit
+
 """
 Compare two NuSMV model and print differences.
 """
@@ -14,22 +16,19 @@ def states_transitions(fsm):
     
     The returned transitions are triplets s, i, s' telling that s leads to
     s' through i.
-    If the model has no input variables, i is None.
+    If the model has no input variables, i is frozenset({None}).
     """
-    states = fsm.pick_all_states(fsm.reachable_states)
-    transitions = {(frozenset(s1.get_str_values().items()),
-                    frozenset(i.get_str_values().items())
-                    if i is not None else frozenset({None}),
-                    frozenset(s2.get_str_values().items())
-                   )
-                   for s1 in states
-                   for s2 in states
-                   for i in (fsm.pick_all_inputs(
-                                         fsm.get_inputs_between_states(s1,s2))
-                             if len(fsm.bddEnc.inputsVars) > 0
-                             else {None})}
-    states = {frozenset(s.get_str_values().items()) for s in states}
-    return states, transitions
+    graph = explicit.extract(fsm)
+    # Every state and inputs is converted once and shared by transitions
+    states = [frozenset(graph.state_values(s).items())
+              for s in range(graph.nb_states)]
+    inputs = [frozenset(graph.inputs_values(i).items())
+              for i in range(graph.nb_inputs)]
+    transitions = {(states[s1],
+                    inputs[i] if i is not None else frozenset({None}),
+                    states[s2])
+                   for s1, i, s2 in graph.iter_edges()}
+    return set(states), transitions
 
 def compare(model1, model2, comparisons=None):
     """
@@ -7,9 +7,27 @@ from pynusmv import glob
 from pynusmv.fsm import BddFsm
 from pynusmv.exception import PyNuSMVError
 
+from ..utils.results import ResultCache
 from .eval import eval_ctl
 
-def check(modelPath, evalSpecs=True):
+def check(modelPath, evalSpecs=True, cache=None):
+    """
+    Check all CTL specifications of the model at modelPath.
+
+    modelPath -- the path of the NuSMV model;
+    evalSpecs -- whether the specifications are checked;
+    cache -- a ResultCache in which verdicts are looked for and stored,
+             or None.
+    """
+    if evalSpecs and cache is not None:
+        key = cache.file_key(modelPath, "ctl")
+        results = cache.get(key)
+        if results is not None:
+            for spec, satisfied in results:
+                print('Specification', spec, 'is', str(satisfied))
+            return
+    results = []
+
     init_nusmv()
     # Initialize the model
     fsm = BddFsm.from_filename(modelPath)
@@ -27,7 +45,10 @@ def check(modelPath, evalSpecs=True):
                              fsm.state_constraints)
                 print('Specification',str(spec), 'is',
                       str(violating.is_false()))
+                results.append((str(spec), violating.is_false()))
                 # We could generate counter-examples here
+        if cache is not None:
+            cache.put(key, results)
     deinit_nusmv()
 
 def main():
@@ -35,7 +56,11 @@ def main():
         print("[ERROR] Missing model.")
     else:
         try:
-            check(sys.argv[-1], not "-dcx" in sys.argv)
+            cache = None
+            if "-cache" in sys.argv[:-1]:
+                directory = sys.argv[sys.argv.index("-cache") + 1]
+                cache = ResultCache(directory)
+            check(sys.argv[-1], not "-dcx" in sys.argv, cache)
         except PyNuSMVError as e:
             print("[Error]", str(e))
 
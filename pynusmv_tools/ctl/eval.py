@@ -4,6 +4,9 @@ from pynusmv.mc import eval_ctl_spec
 
 from pynusmv_lower_interface.nusmv.fsm.bdd import bdd as nsBddFsm
 
+from ..utils.fixpoints import least_fixpoint
+from ..utils import profiler
+
 def check(fsm, spec, context=None):
     """
     Return whether spec in context is satisfied by fsm.
@@ -101,11 +104,13 @@ def eval_ctl(fsm, spec, context=None):
     
     return sat & fsm.reachable_states
 
+@profiler.profiled("ex")
 def ex(fsm, phi):
     phi = phi & fsm.reachable_states
     result = fsm.pre(phi)
     return result & fsm.reachable_states
 
+@profiler.profiled("eg")
 def eg(fsm, phi):
     res = BDD.true(fsm.bddEnc.DDmanager)
     old = BDD.false(fsm.bddEnc.DDmanager)
@@ -115,12 +120,8 @@ def eg(fsm, phi):
         res = res & new & phi & fsm.reachable_states
     return res
 
+@profiler.profiled("eu")
 def eu(fsm, phi, psi):
-    Y = psi & fsm.reachable_states
-    old = Y
-    new = Y
-    while new.isnot_false():
-        old = Y
-        Y = Y | (ex(fsm, new) & phi)
-        new = Y & ~old
-    return Y
\ No newline at end of file
+    return least_fixpoint(psi & fsm.reachable_states,
+                          lambda Y: ex(fsm, Y), restrict=phi,
+                          strategy="frontier", name="ctl.eu")
\ No newline at end of file
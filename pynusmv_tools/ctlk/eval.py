@@ -4,7 +4,8 @@ CTLK evaluation functions.
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
-from pynusmv.utils import fixpoint as fp
+from ..utils.profiler import fixpoint as fp
+from ..utils import profiler
 
 from .ast import (TrueExp, FalseExp, Init, Reachable,
                   Atom, Not, And, Or, Implies, Iff, 
@@ -148,6 +149,7 @@ def evalCTLK(fsm, spec):
         return None
     
     
+@profiler.profiled("ex")
 def ex(fsm, phi):
     """
     Return the set of states of fsm satisfying EX phi.
@@ -158,6 +160,7 @@ def ex(fsm, phi):
     return fsm.pre(phi)
     
     
+@profiler.profiled("eg")
 def eg(fsm, phi):
     """
     Return the set of states of fsm satisfying EG phi.
@@ -169,6 +172,7 @@ def eg(fsm, phi):
                BDD.true(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("eu")
 def eu(fsm, phi, psi):
     """
     Return the set of states of fsm satisfying E[ phi U psi ].
@@ -181,6 +185,7 @@ def eu(fsm, phi, psi):
                BDD.false(fsm.bddEnc.DDmanager))
     
     
+@profiler.profiled("nk")
 def nk(fsm, agent, phi):
     """
     Return the set of states of fsm satisfying nK<'agent'> phi
@@ -196,6 +201,7 @@ def nk(fsm, agent, phi):
                                  frozenset({agent})) & fsm.reachable_states
     
 
+@profiler.profiled("ne")
 def ne(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nE<group> phi
@@ -213,6 +219,7 @@ def ne(fsm, group, phi):
     return result
     
     
+@profiler.profiled("nd")
 def nd(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nD<group> phi
@@ -225,6 +232,7 @@ def nd(fsm, group, phi):
             & fsm.reachable_states)
     
     
+@profiler.profiled("nc")
 def nc(fsm, group, phi):
     """
     Return the set of states of fsm satisfying nC<group> phi
@@ -16,6 +16,7 @@ import sys
 import argparse
 from re                    import fullmatch
 from functools             import reduce
+from contextlib            import closing
 
 from pynusmv.init          import init_nusmv
 from pynusmv.glob          import load, master_bool_sexp_fsm
@@ -34,6 +35,8 @@ from pynusmv.sat           import SatSolverFactory,            \
                                   Polarity,                    \
                                   SatSolverResult
 
+from pynusmv_tools.utils   import portfolio
+
 
 def arguments():
     """
@@ -81,6 +84,11 @@ def arguments():
                       type=int,
                       default=10,
                       help="The problem bound (max number of steps in a trace)")
+    args.add_argument("-j", "--jobs",
+                      type=int,
+                      default=1,
+                      help="The number of processes verifying the different "+\
+                      "lengths concurrently (the shortest violation wins)")
 
     # Definition of the Diagnosability context (\theta, \Sigma_{12})
     args.add_argument("-i", "--initial-condition", default="TRUE",
@@ -410,6 +418,48 @@ def verify_for_size_exactly_k(observable_names, observable_vars, formula_nodes,
     else:
         return "No Violation"
 
+def mk_context_nodes(initial_condition, sigma1, sigma2):
+    """
+    Creates the Nodes (:see:`pynusmv.node.Node`) that represent the context of
+    the diagnosability test.
+
+    :param initial_condition: the text of the initial condition (theta)
+    :param sigma1: the text of the LTL formula constraining the first member
+        of the critical pair
+    :param sigma2: the text of the LTL formula constraining the second member
+        of the critical pair
+    :return: a tuple (theta, sigma1, sigma2) of the corresponding nodes.
+    """
+    theta = Node.from_ptr(parse_simple_expression(initial_condition))
+    theta = make_nnf_boolean_wff(theta)
+
+    sigma1= Node.from_ptr(parse_ltl_spec(sigma1))
+    sigma1= make_nnf_boolean_wff(sigma1).to_node()
+
+    sigma2= Node.from_ptr(parse_ltl_spec(sigma2))
+    sigma2= make_nnf_boolean_wff(sigma2).to_node()
+    return (theta, sigma1, sigma2)
+
+def verify_length(task):
+    """
+    Performs `verify_for_size_exactly_k` in a process of a portfolio (see
+    :mod:`pynusmv_tools.utils.portfolio`). Nodes cannot be passed between
+    processes, they are created from their text in the current process.
+
+    :param task: a tuple (observable, condition_text, initial_condition,
+        sigma1, sigma2, k) with the observable symbols names, the texts of the
+        diagnosability condition and of the context, and the length.
+    :return: None if no counter example could be found, and the counter
+        example otherwise.
+    """
+    observable, condition_text, initial_condition, sigma1, sigma2, k = task
+    theta, sigma1, sigma2 = mk_context_nodes(initial_condition, sigma1, sigma2)
+    result = verify_for_size_exactly_k(observable,
+                                       mk_observable_vars(observable),
+                                       mk_specs_nodes(condition_text),
+                                       k, theta, sigma1, sigma2)
+    return None if "No Violation" == str(result) else result
+
 def check(args, condition_text, observable):
     """
     Performs the verification of the diagnosability of the condition represented
@@ -425,23 +475,29 @@ def check(args, condition_text, observable):
         observable_vars          = mk_observable_vars(observable)
         diagnosability_condition = mk_specs_nodes(condition_text)
 
-        theta = Node.from_ptr(parse_simple_expression(args.initial_condition))
-        theta = make_nnf_boolean_wff(theta)
-
-        sigma1= Node.from_ptr(parse_ltl_spec(args.sigma1))
-        sigma1= make_nnf_boolean_wff(sigma1).to_node()
-
-        sigma2= Node.from_ptr(parse_ltl_spec(args.sigma2))
-        sigma2= make_nnf_boolean_wff(sigma2).to_node()
-
-        for k in range(args.bound+1):
-            result = verify_for_size_exactly_k(observable, observable_vars, diagnosability_condition, k, theta, sigma1, sigma2)
-            if "No Violation" != str(result):
-                print("-- {} is *NOT* diagnosable for length {}".format(diagnosability_condition, k))
-                print(result)
-                return
-            else:
-                print("-- No counter example at length {}".format(k))
+        theta, sigma1, sigma2 = mk_context_nodes(args.initial_condition,
+                                                 args.sigma1, args.sigma2)
+
+        if args.jobs == 1:
+            results = (verify_for_size_exactly_k(observable, observable_vars, diagnosability_condition, k, theta, sigma1, sigma2)
+                       for k in range(args.bound+1))
+        else:
+            # the lengths are verified concurrently, the outcomes come in
+            # order such that the shortest violation wins
+            tasks   = [(observable, condition_text, args.initial_condition,
+                        args.sigma1, args.sigma2, k)
+                       for k in range(args.bound+1)]
+            results = portfolio.solve(args.model, verify_length, tasks,
+                                      args.jobs)
+
+        with closing(results):
+            for k, result in enumerate(results):
+                if result is not None and "No Violation" != str(result):
+                    print("-- {} is *NOT* diagnosable for length {}".format(diagnosability_condition, k))
+                    print(result)
+                    return
+                else:
+                    print("-- No counter example at length {}".format(k))
         print("-- No counter example found for executions of length <= {}".format(args.bound))
 
     except Exception as e:
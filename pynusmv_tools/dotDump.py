@@ -6,6 +6,8 @@ from pynusmv.init import init_nusmv, deinit_nusmv
 from pynusmv import glob
 from pynusmv.exception import PyNuSMVError
 
+from .utils import explicit
+
 # Choices of representation
 # -------------------------
 # Initial states are marked with a bold border.
@@ -37,32 +39,33 @@ def fairness_attr(fsm):
     return __fair_attr
     
 
-def node(fsm, state, ids):
+def node(graph, state, initial, fair_states, fair_attr):
     """
     Return the DOT representation of the given state.
     
-    fsm -- the BddFsm of the model
-    state -- a State
-    ids -- a dictionary of the ids of some states. Must contain state.
+    graph -- the ExplicitGraph of the model;
+    state -- a state id of graph;
+    initial -- the set of initial state ids;
+    fair_states -- a dictionary of fairness constraint -> set of state ids;
+    fair_attr -- a dictionary of fairness constraint -> DOT attributes.
     
     """
     attr = set()
     
     # Label
     attr.add("label=\"" + '\\n'.join(var+"="+val for var, val
-                                     in sorted(state.
-                                               get_str_values().items()))
+                                     in sorted(graph.state_values(state).
+                                               items()))
                         + "\"")
     
     # Initial state
-    if state <= fsm.init:
+    if state in initial:
         attr.add("penwidth=5")
         
     # Fairness
     fair_styles = set()
-    fair_attr = fairness_attr(fsm)
-    for f in fsm.fairness_constraints:
-        if state <= f:
+    for f, states in fair_states.items():
+        if state in states:
             fair_styles.add(fair_attr[f])
     if len(fair_styles):
         attr.add("style=filled")
@@ -72,19 +75,19 @@ def node(fsm, state, ids):
         attrstr = "[" + ','.join(attr) + "]"
     else:
         attrstr = ""
-    return ids[state] + " " + attrstr + ";"
+    return "s" + str(state + 1) + " " + attrstr + ";"
     
     
-def edge(fsm, source, inputs, target, ids):
+def edge(graph, source, inputs, target, fair_inputs, fair_attr):
     """
     Return the DOT representation of the given transition.
     
-    fsm -- the BddFsm of the model
-    source -- the source of the transition
-    inputs -- the action of the transition, or None
-    target -- the target of the transition
-    ids -- a dictionary of the ids of some states.
-           Must contain source and target.
+    graph -- the ExplicitGraph of the model;
+    source -- the state id of the source of the transition
+    inputs -- the inputs id of the action of the transition, or None
+    target -- the state id of the target of the transition
+    fair_inputs -- a dictionary of fairness constraint -> set of inputs ids;
+    fair_attr -- a dictionary of fairness constraint -> DOT attributes.
     
     """
     attr = set()
@@ -92,15 +95,14 @@ def edge(fsm, source, inputs, target, ids):
     if inputs is not None:
         # Label
         attr.add("label=\"" + "\\n".join(var+"="+val for var, val
-                                        in sorted(inputs.
-                                                  get_str_values().items()))
+                                        in sorted(graph.inputs_values(inputs).
+                                                  items()))
                             + "\"")
         
         # Fairness
         fair_styles = set()
-        fair_attr = fairness_attr(fsm)
-        for f in fsm.fairness_constraints:
-            if inputs <= f:
+        for f, all_inputs in fair_inputs.items():
+            if inputs in all_inputs:
                 fair_styles.add(fair_attr[f])
         if len(fair_styles):
             attr.add("penwidth=2")
@@ -110,7 +112,8 @@ def edge(fsm, source, inputs, target, ids):
         attrstr = "[" + ','.join(attr) + "]"
     else:
         attrstr = ""
-    return ids[source] + "->" + ids[target] + " " + attrstr + ";"
+    return ("s" + str(source + 1) + "->" + "s" + str(target + 1) + " " +
+            attrstr + ";")
     
 
 def dumpDot(fsm):
@@ -121,37 +124,23 @@ def dumpDot(fsm):
     
     """
     
-    init = fsm.init & fsm.state_constraints & fsm.bddEnc.statesMask
     fair_attr = fairness_attr(fsm)
-    states = fsm.pick_all_states(fsm.reachable_states)
-    transitions = {(s1,i,s2)
-                   for s1 in states
-                   for s2 in 
-                   fsm.pick_all_states(fsm.post(s1) & fsm.reachable_states)
-                   for i in (fsm.pick_all_inputs(
-                                         fsm.get_inputs_between_states(s1,s2))
-                             if len(fsm.bddEnc.inputsVars) > 0
-                             else {None})
-                   if s2 <= fsm.post(s1, inputs=i)}
+    fairness = {f: f for f in fsm.fairness_constraints}
+    graph = explicit.extract(fsm, state_labels=fairness,
+                             inputs_labels=fairness)
+    initial = set(graph.initial)
+    fair_states = {f: set(states) for f, states in graph.state_labels.items()}
+    fair_inputs = {f: set(inputs) for f, inputs in graph.inputs_labels.items()}
     
     dot = ["digraph {"]
     
     # Add states
-    # Generate ids
-    ids = dict()
-    curid = 1
-    for state in states:
-        ids[state] = "s" + str(curid)
-        curid = curid + 1
-    
-    # Print states
-    for state in states:
-        dot.append(node(fsm, state, ids))
-      
-        
+    for state in range(graph.nb_states):
+        dot.append(node(graph, state, initial, fair_states, fair_attr))
+    
     # Add transitions
-    for s1, i, s2 in transitions:
-        dot.append(edge(fsm, s1, i, s2, ids))
+    for s1, i, s2 in graph.iter_edges():
+        dot.append(edge(graph, s1, i, s2, fair_inputs, fair_attr))
     
     dot.append("}")
     
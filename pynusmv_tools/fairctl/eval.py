@@ -1,7 +1,11 @@
 from pynusmv_lower_interface.nusmv.parser import parser
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_ctl_spec
-from pynusmv.utils import fixpoint
+
+from ..utils.fairness import memoize_fair_states
+from ..utils.fixpoints import least_fixpoint
+from ..utils.profiler import fixpoint
+from ..utils import profiler
 
 from pynusmv_lower_interface.nusmv.fsm.bdd import bdd as nsBddFsm
 
@@ -100,11 +104,13 @@ def eval_ctl(fsm, spec, context = None):
         return eval_ctl_spec(fsm, spec)
         
         
+@profiler.profiled("ex")
 def ex(fsm, phi):
     phi = phi & fair_states(fsm) & fsm.reachable_states
     return fsm.pre(phi) & fsm.reachable_states
     
     
+@profiler.profiled("eg")
 def eg(fsm, phi):    
     # EG p = nu Z . p & &_(f in F) Pre( mu Y . (Z & f) | (p & Pre(Y)) )
     #      = nu Z . p & &_(f in F) EX( mu Y . (Z & f) | (p & EX(Y)))
@@ -121,12 +127,15 @@ def eg(fsm, phi):
     return r.forsome(fsm.bddEnc.inputsCube)
     
     
+@profiler.profiled("eu")
 def eu(fsm, phi, psi):
     # E[p U q] = q | (p & EX E[p U q]) = mu Z . q | (p & Pre(Z))
-    return fixpoint(lambda X : (psi & fair_states(fsm) & fsm.reachable_states) |
-                               (phi & ex(fsm, X)),
-                    BDD.false(fsm.bddEnc.DDmanager))
+    return least_fixpoint(psi & fair_states(fsm) & fsm.reachable_states,
+                          lambda X : ex(fsm, X), restrict=phi,
+                          name="fairctl.eu")
     
     
+@profiler.profiled("fair_states")
+@memoize_fair_states
 def fair_states(fsm):
     return eg(fsm, BDD.true(fsm.bddEnc.DDmanager))
\ No newline at end of file
@@ -19,6 +19,7 @@ from pynusmv.glob import (load_from_file, load,
                                compute_model as _compute_model)
                                
 from .mas import MAS, Group
+from ..utils import fairness, cache
 
 import itertools
 
@@ -35,6 +36,8 @@ def reset_globals():
     """
     global __mas
     __mas = None
+    fairness.reset()
+    cache.reset()
 
 
 def _get_instances_args_for_module(modtree):
@@ -165,7 +168,7 @@ def _get_epistemic_trans(variable):
     return parse_next_expression(transexpr)
     
 
-def mas(agents=None, initial_ordering=None):
+def mas(agents=None, initial_ordering=None, projection=False):
     """
     Return (and compute if needed) the multi-agent system represented by
     the currently read SMV model.
@@ -185,8 +188,12 @@ def mas(agents=None, initial_ordering=None):
     ordering file. It is used as the initial ordering for variables of the
     model.
     
-    Note: if the MAS is already computed, agents and initial_ordering arguments
-    have no effect.
+    If projection is True, the equivalent states of the MAS are computed by
+    abstracting away the variables not observed by the agents instead of
+    through their epistemic relations (see MAS.equivalent_states).
+    
+    Note: if the MAS is already computed, agents, initial_ordering and
+    projection arguments have no effect.
     
     agents -- a set of agents.
     """    
@@ -281,6 +288,6 @@ def mas(agents=None, initial_ordering=None):
         # Create the MAS
         fsm = _prop_database().master.bddFsm
         __mas = MAS(fsm._ptr, observedvars, inputvars, singletrans,
-                    groups=groups, freeit=False)
+                    groups=groups, freeit=False, projection=projection)
         
     return __mas
\ No newline at end of file
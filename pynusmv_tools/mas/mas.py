@@ -1,10 +1,18 @@
-from pynusmv.dd import BDD
+from pynusmv.dd import BDD, Cube
 from pynusmv.fsm import BddFsm, BddTrans
+from pynusmv_lower_interface.nusmv.enc.bdd import bdd as nsbddEnc
 from pynusmv_lower_interface.nusmv.node import node as nsnode
 from pynusmv_lower_interface.nusmv.parser import parser as nsparser
 from pynusmv_lower_interface.nusmv.dd import dd as nsdd
+from ..utils.cache import BddCache
 from .exception import UnknownAgentError
 
+# The maximal number of BDD nodes of the images cache
+IMAGES_BUDGET = 1000000
+
+# The images computed by MAS, keyed by MAS, operator and arguments
+_image_cache = BddCache("mas.images", budget=IMAGES_BUDGET)
+
 class MAS(BddFsm):
     """
     A multi-agent system.
@@ -13,10 +21,24 @@ class MAS(BddFsm):
     and one epistemic trans by agent, labelled with the name of the agent.
     
     epistemic -- a dictionary of agent->the NuSMV node-based TRANS of the agent.
+    projection -- whether equivalent_states quantifies away the variables not
+                  observed by the agents (True) or computes an image through
+                  their epistemic trans (False);
+    image_caching -- whether pre, post and strategic pre-images are memoized
+                     in the mas.images cache of utils.cache, such that
+                     images already computed with the same arguments are
+                     answered without a relational product;
+    partitioned -- whether strategic pre-images use a conjunctive partition
+                   of the transition relation, with one cluster per module
+                   instance, and quantify next-state variables and inputs as
+                   soon as no remaining cluster depends on them;
+                   equivalent_states then uses the projection as well, the
+                   epistemic relation of agents being the conjunction of
+                   one equality per observed variable.
     """
     
     def __init__(self, ptr, observed, inputvars, epistemic, groups=None,
-                 freeit=False):
+                 freeit=False, projection=False, partitioned=False):
         """
         Create a new MAS.
         
@@ -31,6 +53,10 @@ class MAS(BddFsm):
                   the agents of the group; the groups names and the agents
                   names must be present in epistemic
         freeit -- whether or not free the pointer
+        projection -- whether equivalent_states relies on projection instead
+                      of epistemic trans
+        partitioned -- whether strategic pre-images rely on a partitioned
+                       transition relation
         """
         super(MAS, self).__init__(ptr, freeit=freeit)
         self._epistemic = epistemic and epistemic or {}
@@ -39,6 +65,13 @@ class MAS(BddFsm):
         self._agents_inputvars = inputvars
         self._groups = groups if groups is not None else {}
         self._protocols = {}
+        self._unobserved_cubes = {}
+        self._equivalence_classes = {}
+        self.projection = projection
+        self.image_caching = True
+        self.partitioned = partitioned
+        self._partition = None
+        self._partition_free_inputs = []
         
     
     @property
@@ -92,6 +125,15 @@ class MAS(BddFsm):
         # Apply FSM constraints
         states = states & self.state_constraints
         
+        # Epistemic relations only say that observed variables keep their
+        # values: forget the values of the others. This is also the
+        # partitioned product through these relations, each equality being
+        # its own cluster.
+        if self.projection or self.partitioned:
+            result = states.forsome(self.bddEnc.inputsCube |
+                                    self._unobserved_cube(agents))
+            return result & self.state_constraints
+        
         # Compute the post-image
         if frozenset(agents) not in self._epistemic_trans:
             # Compute the BddTrans
@@ -104,6 +146,104 @@ class MAS(BddFsm):
         return result & self.state_constraints
         
     
+    def _unobserved_cube(self, agents):
+        """
+        Return the cube of state variables not observed by agents, that is,
+        by none of them.
+        
+        Frozen variables are not part of the cube: they keep their values
+        through epistemic trans, whether they are observed or not.
+        
+        agents -- a set of agents names of this MAS.
+        """
+        agents = frozenset(agents)
+        if agents not in self._unobserved_cubes:
+            observed = set()
+            for agent in agents:
+                if agent not in self.agents_observed_variables:
+                    raise UnknownAgentError(str(agents) +
+                                            " are an unknown agents names.")
+                observed |= set(self.agents_observed_variables[agent])
+            unobserved = self.bddEnc.stateVars - observed
+            self._unobserved_cubes[agents] = self.bddEnc.cube_for_state_vars(
+                                                                    unobserved)
+        return self._unobserved_cubes[agents]
+    
+    def equivalence_classes(self, agents):
+        """
+        Return the partition of the reachable states of this MAS into
+        equivalence classes for agents, as a dictionary of observation ->
+        class, where observation is the BDD of the values of the variables
+        observed by agents in the states of class.
+        
+        The partition is computed the first time it is requested for agents,
+        and kept afterwards. The observations are picked among the reachable
+        states with the unobserved variables abstracted away, and the class
+        of an observation is the set of reachable states agreeing with it: no
+        image is needed.
+        
+        agents -- a set of agents names of this MAS.
+        """
+        agents = frozenset(agents)
+        if agents not in self._equivalence_classes:
+            cube = self._unobserved_cube(agents)
+            classes = {}
+            remaining = self.reachable_states.forsome(cube)
+            while remaining.isnot_false():
+                observation = self.pick_one_state(remaining).forsome(cube)
+                classes[observation] = self.reachable_states & observation
+                remaining = remaining - observation
+            self._equivalence_classes[agents] = classes
+        return self._equivalence_classes[agents]
+    
+    def iter_equivalence_classes(self, states, agents):
+        """
+        Generate the equivalence classes for agents of the states of states,
+        each class once.
+        
+        Classes are taken from the partition of reachable states given by
+        equivalence_classes. Every state of states that is not reachable is
+        generated together with the reachable states equivalent to it.
+        
+        states -- a BDD representing a set of states of this MAS;
+                  if states represents a set of state/inputs pairs, inputs
+                  are abstracted away;
+        agents -- a set of agents names of this MAS.
+        """
+        classes = self.equivalence_classes(agents)
+        cube = self._unobserved_cube(agents)
+        states = (states.forsome(self.bddEnc.inputsCube) &
+                  self.bddEnc.statesMask)
+        remaining = states.forsome(cube)
+        while remaining.isnot_false():
+            observation = self.pick_one_state(remaining).forsome(cube)
+            eqclass = classes.get(observation)
+            if eqclass is None:
+                eqclass = self.reachable_states & observation
+            yield eqclass | (states & observation)
+            remaining = remaining - observation
+    
+    def equivalence_class(self, states, agents):
+        """
+        Return the set of reachable states of this MAS that are equivalent
+        for agents to some state of states.
+        
+        This is the same as
+            self.equivalent_states(states, agents) & self.reachable_states
+        but abstracts away the variables not observed by agents instead of
+        computing an image.
+        
+        states -- a BDD representing a set of states of this MAS;
+                  if states represents a set of state/inputs pairs, inputs
+                  are abstracted away;
+        agents -- a set of agents names of this MAS.
+        """
+        states = states & self.state_constraints
+        return (states.forsome(self.bddEnc.inputsCube |
+                               self._unobserved_cube(agents)) &
+                self.reachable_states)
+        
+    
     def protocol(self, agents):
         """
         Return the protocol for the given set of agents.
@@ -145,12 +285,35 @@ class MAS(BddFsm):
                         for var in self.agents_inputvars[agent]]
         return self.bddEnc.cube_for_inputs_vars(gamma_inputs)
         
+    def cached_image(self, operator, arguments, compute):
+        """
+        Return the image computed by operator for arguments, memoized in the
+        mas.images cache if image caching is enabled.
+        
+        operator -- the name of the operator;
+        arguments -- a tuple of hashable arguments (BDDs, sets of agents,
+                     None) of the operator;
+        compute -- a function without arguments computing the image.
+        """
+        if not self.image_caching:
+            return compute()
+        key = (self, operator) + tuple(arguments)
+        result = _image_cache.get(key)
+        if result is None:
+            result = compute()
+            _image_cache.put(key, result)
+        return result
+    
     def pre(self, states, inputs=None, subsystem=None):
         """
         Return the pre image of states, through inputs (if any) and in
         subsystem (if any).
         """
-        
+        return self.cached_image("pre", (states, inputs, subsystem),
+                                 lambda: self._pre(states, inputs=inputs,
+                                                   subsystem=subsystem))
+    
+    def _pre(self, states, inputs=None, subsystem=None):
         if inputs is None:
             inputs = BDD.true(self.bddEnc.DDmanager)
         
@@ -166,7 +329,11 @@ class MAS(BddFsm):
         Return the post image of states, through inputs (if any) and in
         subsystem (if any).
         """
-        
+        return self.cached_image("post", (states, inputs, subsystem),
+                                 lambda: self._post(states, inputs=inputs,
+                                                    subsystem=subsystem))
+    
+    def _post(self, states, inputs=None, subsystem=None):
         if inputs is None:
             inputs = BDD.true(self.bddEnc.DDmanager)
         
@@ -176,6 +343,126 @@ class MAS(BddFsm):
         states = states & subsystem
         
         return super(MAS, self).post(states, inputs)
+    
+    def _next_cube(self, cube):
+        """Return the cube of next-state variables of cube."""
+        manager = self.bddEnc.DDmanager
+        return Cube(nsbddEnc.BddEnc_state_var_to_next_state_var(
+                        self.bddEnc._ptr, cube._ptr),
+                    manager, freeit=True)
+    
+    def _and_forsome(self, left, right, cube):
+        """Return (left & right).forsome(cube) without building left & right."""
+        manager = self.bddEnc.DDmanager
+        return BDD(nsdd.bdd_and_abstract(manager._ptr, left._ptr, right._ptr,
+                                         cube._ptr),
+                   manager, freeit=True)
+    
+    def _compute_partition(self):
+        """
+        Compute the conjunctive partition of the transition relation.
+        
+        The state variables are grouped by top-level module instance (the
+        other ones forming their own group); the cluster of a group is the
+        transition relation where the next-state variables of the other groups
+        are quantified away. The partition is only used if the conjunction of
+        the clusters is the transition relation; otherwise, the monolithic
+        relation is the only cluster.
+        
+        The partition is a list of (cluster, next cube, inputs cubes) triples
+        where next cube is the cube of next-state variables of the cluster and
+        inputs cubes are the cubes of the input variables groups (one by
+        module instance) such that this cluster is the last one depending on
+        them. The input variables on which no cluster depend are kept in
+        self._partition_free_inputs.
+        """
+        enc = self.bddEnc
+        manager = enc.DDmanager
+        trans = self.trans.monolithic
+        all_next = Cube(nsbddEnc.BddEnc_get_next_state_vars_cube(enc._ptr),
+                        manager, freeit=True)
+        
+        def instance(name):
+            return name.partition(".")[0] if "." in name else None
+        
+        # Group variables by module instance
+        state_groups = {}
+        for var in enc.stateVars:
+            state_groups.setdefault(instance(var), set()).add(var)
+        input_groups = {}
+        for var in enc.inputsVars:
+            input_groups.setdefault(instance(var), set()).add(var)
+        
+        clusters = []
+        for group in sorted(state_groups, key=str):
+            next_cube = self._next_cube(
+                            enc.cube_for_state_vars(state_groups[group]))
+            clusters.append((trans.forsome(all_next - next_cube), next_cube))
+        
+        conjunction = BDD.true(manager)
+        for cluster, _ in clusters:
+            conjunction = conjunction & cluster
+        if len(clusters) <= 1 or conjunction != trans:
+            clusters = [(trans, all_next)]
+        
+        # Schedule inputs quantification after the last cluster using them
+        inputs = [[] for _ in clusters]
+        free = []
+        for group in sorted(input_groups, key=str):
+            cube = enc.cube_for_inputs_vars(input_groups[group])
+            for index in reversed(range(len(clusters))):
+                cluster = clusters[index][0]
+                if cluster.forsome(cube) != cluster:
+                    inputs[index].append(cube)
+                    break
+            else:
+                free.append(cube)
+        
+        self._partition = [(cluster, next_cube, inputs[index])
+                           for index, (cluster, next_cube)
+                           in enumerate(clusters)]
+        self._partition_free_inputs = free
+    
+    def weak_pre_forsome(self, states, cube=None):
+        """
+        Return self.weak_pre(states).forsome(cube).
+        
+        If this MAS is partitioned, the pre-image is computed cluster by
+        cluster, quantifying next-state variables and the input variables of
+        cube as soon as possible, avoiding the product with the whole relation.
+        
+        states -- a BDD of states (and inputs) of this MAS;
+        cube -- a Cube of input variables, or None.
+        """
+        if not self.partitioned:
+            result = self.weak_pre(states)
+            return result if cube is None else result.forsome(cube)
+        
+        if self._partition is None:
+            self._compute_partition()
+        
+        def to_quantify(cubes, next_cube=None):
+            quantified = next_cube
+            if cube is not None:
+                for inputs in cubes:
+                    inputs = inputs * cube
+                    quantified = (inputs if quantified is None
+                                  else quantified + inputs)
+            return quantified
+        
+        enc = self.bddEnc
+        constraints = self.state_constraints
+        result = BDD(nsbddEnc.BddEnc_state_var_to_next_state_var(
+                        enc._ptr, (states & constraints)._ptr),
+                     enc.DDmanager, freeit=True)
+        result = result & constraints & self.inputs_constraints
+        free = to_quantify(self._partition_free_inputs)
+        if free is not None:
+            result = result.forsome(free)
+        for cluster, next_cube, inputs in self._partition:
+            result = self._and_forsome(result, cluster,
+                                       to_quantify(inputs, next_cube))
+        return result
         
         
     def pre_strat(self, states, agents, strat=None):
@@ -193,6 +480,12 @@ class MAS(BddFsm):
         strat -- a BDD representing allowed state/inputs pairs, or None.
         
         """
+        return self.cached_image("pre_strat",
+                                 (states, frozenset(agents), strat),
+                                 lambda: self._pre_strat(states, agents,
+                                                         strat=strat))
+    
+    def _pre_strat(self, states, agents, strat=None):
         if not strat:
             strat = BDD.true(self.bddEnc.DDmanager)
             
@@ -205,13 +498,12 @@ class MAS(BddFsm):
         nstates = ~states & self.bddEnc.statesInputsMask
         strat = strat & self.bddEnc.statesInputsMask
         
+        # The first operand does not depend on ngamma_cube, so the second one
+        # can be quantified on its own
         return (
-                ( ~(
-                    self.weak_pre(nstates).forsome(ngamma_cube)
-                  )
-                  & 
-                  self.weak_pre(states)
-                ).forsome(ngamma_cube)
+                ~self.weak_pre_forsome(nstates, ngamma_cube)
+                & 
+                self.weak_pre_forsome(states, ngamma_cube)
                 &
                 strat
                 &
@@ -247,6 +539,12 @@ class MAS(BddFsm):
         strat -- a BDD representing a set of allowed state/inputs pairs.
         
         """
+        return self.cached_image("pre_strat_si",
+                                 (states, frozenset(agents), strat),
+                                 lambda: self._pre_strat_si(states, agents,
+                                                            strat=strat))
+    
+    def _pre_strat_si(self, states, agents, strat=None):
         if strat is None:
             strat = BDD.true(self.bddEnc.DDmanager)
         
@@ -260,13 +558,12 @@ class MAS(BddFsm):
         nstates = ~states & self.bddEnc.statesInputsMask
         strat = strat & self.bddEnc.statesInputsMask
                 
+        # The first operand does not depend on ngamma_cube, so the second one
+        # can be quantified on its own
         return (
-                ( ~(
-                    self.weak_pre(nstates).forsome(ngamma_cube)
-                  )
-                  & 
-                  self.weak_pre(states)
-                ).forsome(ngamma_cube)
+                ~self.weak_pre_forsome(nstates, ngamma_cube)
+                & 
+                self.weak_pre_forsome(states, ngamma_cube)
                 &
                 strat
                 &
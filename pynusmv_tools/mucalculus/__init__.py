@@ -50,6 +50,10 @@ class ExclusiveChoiceError(ChoiceError):
     """The choice must be exclusive but was not."""
     pass
 
+class ExplanationBudgetError(MuCalculusError):
+    """The budget of explored obligations of an explanation is exhausted."""
+    pass
+
 
 class hashabledict(Mapping):
     """
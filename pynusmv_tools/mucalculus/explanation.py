@@ -1,6 +1,6 @@
-from . import ChoiceError, ExclusiveChoiceError
+from . import ChoiceError, ExclusiveChoiceError, ExplanationBudgetError
 from copy import deepcopy
-from .graph import domaintuple
+from .graph import domaintuple, Graph, GraphBuilder
 
 def Obligation(fsm, state, formula, context):
     return domaintuple(fsm=fsm, state=state, formula=formula, context=context)
@@ -63,4 +63,214 @@ class Explanation:
                                     node.context,
                                     attributors=attributors,
                                     choosers=choosers,
-                                    expand=self)
\ No newline at end of file
+                                    expand=self)
+
+
+def _translatable(node):
+    """Return whether node is labelled by a formula with a translator."""
+    return bool(node.formula and
+                node.formula.generator and
+                node.formula.generator.translator)
+
+def translate(untranslated, graph, unexplained, translated):
+    """
+    Translate, in graph, the translatable nodes of untranslated that are not
+    translated yet and whose sub-explanation is fully explained, inner
+    sub-explanations first, and add them to translated.
+    
+    untranslated -- the untranslated graph of an explanation;
+    graph -- a graph builder of the (partially) translated explanation;
+    unexplained -- the set of unexplained nodes of untranslated;
+    translated -- the set of nodes already translated in graph.
+    """
+    # Get fully explained subgraphs
+    subgraphs = {}
+    for node in untranslated.nodes:
+        if _translatable(node) and node not in translated:
+            subgraph, frontier = node.formula._get_sub_explanation(
+                                     untranslated, node)
+            # The subgraph is fully explained if
+            # the only unexplained nodes are at the frontier
+            if not ((subgraph.nodes & unexplained) - frontier):
+                subgraphs[node] = subgraph
+    
+    # Translate the nodes of inner subgraphs first: a subgraph included in
+    # another one has less nodes
+    for node in sorted(subgraphs, key=lambda node: len(subgraphs[node].nodes)):
+        # Extract subgraph from graph
+        subgraph, _ = node.formula._get_sub_explanation(graph, node)
+        # Translate subgraph and add it in graph
+        graph.update(node.formula.generator.translator(subgraph, node))
+        translated.add(node)
+
+
+class LazyExplanation:
+    """
+    A lazy explanation is an explanation whose obligations are explained only
+    when a consumer asks for their successors. It is composed of
+     * an initial node;
+     * the successors of the nodes explored so far;
+     * a subset of unexplained nodes, that is, explored points of decision
+       and (partially) unexplained choices.
+    
+    The number of explored nodes can be bounded by a budget; exploring a node
+    beyond this budget raises an ExplanationBudgetError. Points of decision
+    are not explored, but can be expanded.
+    """
+    
+    def __init__(self, initial, attributors=None, choosers=None, budget=None):
+        """
+        Create a new lazy explanation of the initial obligation.
+        
+        initial -- the initial obligation;
+        attributors -- if not None, a list of obligation and edge attributors,
+                       called after formulas attributors;
+        choosers -- if not None, a list of choosers, called after formulas
+                    choosers;
+        budget -- if not None, the maximal number of nodes to explore.
+        """
+        self.attributors = attributors if attributors is not None else []
+        self.choosers = choosers if choosers is not None else []
+        self.budget = budget
+        self.explored = 0
+        self.unexplained = set()
+        self.translated = set()
+        # obligation -> node, and node -> obligation
+        self._nodes = {}
+        self._obligations = {}
+        # explored node -> frozenset of (edge, successor) pairs
+        self._successors = {}
+        # node -> translated sub-graph
+        self._translations = {}
+        self.initial = self._node(initial)
+    
+    def _node(self, obligation):
+        if obligation not in self._nodes:
+            node = obligation.formula._attributed_obligation(obligation,
+                                                             self.attributors)
+            self._nodes[obligation] = node
+            self._obligations[node] = obligation
+        return self._nodes[obligation]
+    
+    def _explore(self, node, force=False):
+        if self.budget is not None and self.explored >= self.budget:
+            raise ExplanationBudgetError("Cannot explore " + str(node) +
+                                         ": the budget of " +
+                                         str(self.budget) +
+                                         " nodes is exhausted.")
+        self.explored += 1
+        obligation = self._obligations[node]
+        formula = obligation.formula
+        if not force and formula._is_point_of_decision():
+            self.unexplained.add(node)
+            self._successors[node] = frozenset()
+            return
+        obligations, partial = formula._obligations(obligation, self.choosers)
+        if partial:
+            self.unexplained.add(node)
+        else:
+            self.unexplained.discard(node)
+        successors = set()
+        for end in obligations:
+            end = self._node(end)
+            edge = formula._attributed_edge(node, end, self.attributors)
+            successors.add((edge, end))
+        self._successors[node] = frozenset(successors)
+    
+    def is_explored(self, node):
+        """Return whether the successors of node are known."""
+        return node in self._successors
+    
+    def successors(self, node):
+        """
+        Return the set of (edge, successor) pairs of node, exploring node if
+        needed. The successors of an unexplained point of decision are empty.
+        
+        node -- a node of this explanation.
+        """
+        if node not in self._successors:
+            self._explore(node)
+        return self._successors[node]
+    
+    def __getitem__(self, node):
+        """
+        Return the successors of node, such that this explanation can be
+        walked as a graph.
+        """
+        return self.successors(node)
+    
+    def expand(self, node):
+        """
+        Explain the given unexplained node and return its new successors.
+        
+        node -- an unexplained node of this explanation.
+        """
+        self._explore(node, force=True)
+        self._translations.clear()
+        return self._successors[node]
+    
+    def walk(self, node=None):
+        """
+        Generate the nodes reachable from node (the initial one if None), in
+        breadth-first order. Every node is explored when the next one is
+        generated, such that the consumer controls how far the exploration
+        goes.
+        """
+        node = self.initial if node is None else node
+        visited = {node}
+        pending = [node]
+        while pending:
+            current = pending.pop(0)
+            yield current
+            for _, successor in self.successors(current):
+                if successor not in visited:
+                    visited.add(successor)
+                    pending.append(successor)
+    
+    def translation(self, node):
+        """
+        Return the translation of the sub-explanation of node, exploring it if
+        needed, or None if node has no translator or its sub-explanation is
+        not fully explained.
+        
+        node -- a node of this explanation.
+        """
+        if not _translatable(node):
+            return None
+        if node not in self._translations:
+            subgraph, frontier = node.formula._get_sub_explanation(self, node)
+            if (subgraph.nodes & self.unexplained) - frontier:
+                return None
+            self._translations[node] = node.formula.generator.translator(
+                                           subgraph, node)
+        return self._translations[node]
+    
+    @property
+    def graph(self):
+        """
+        The graph of the part of this explanation explored so far, including
+        the successors of explored nodes.
+        """
+        graph = GraphBuilder()
+        graph.add_node(self.initial)
+        for origin, successors in self._successors.items():
+            graph.add_node(origin)
+            for edge, end in successors:
+                graph.add_edge(origin, edge, end)
+        return graph.build()
+    
+    def explanation(self):
+        """
+        Return the Explanation of the part of this explanation explored so
+        far, where the nodes that are not explored are unexplained, and where
+        the nodes whose sub-explanation is fully explored are translated.
+        """
+        untranslated = self.graph
+        unexplained = ({node for node in untranslated.nodes
+                        if node not in self._successors} |
+                       self.unexplained)
+        graph = GraphBuilder(untranslated)
+        translated = set()
+        translate(untranslated, graph, unexplained, translated)
+        return Explanation(graph.build(), self.initial, unexplained,
+                           translated, untranslated)
@@ -1,6 +1,5 @@
 import inspect
-from collections import defaultdict
-from functools import cmp_to_key
+from collections import Counter
 
 from pynusmv.dd import BDD
 from pynusmv.mc import eval_simple_expression
@@ -8,15 +7,17 @@ from pynusmv.mc import eval_simple_expression
 from . import (UnknownVariableError, CannotExplainFalseError,
                ExclusiveChoiceError)
 from . import hashabledict, orderedset
-from .graph import domaintuple, Graph
-from .explanation import Obligation, Explanation
+from .graph import domaintuple, Graph, GraphBuilder
+from ..utils.cache import BddCache
+from .explanation import (Obligation, Explanation, LazyExplanation,
+                          translate)
 
 __all__ = ['MTrue', 'MFalse', 'Atom', 'Variable', 'Not', 'And', 'Or',
            'Diamond', 'Box', 'Mu', 'Nu',
            'alias', 'pretty_format',
            'SPOI', 'POI', 'SPOD', 'POD',
            'attributor', 'obligation_attributor', 'edge_attributor',
-           'chooser']
+           'chooser', 'EvalCache']
 
 # ----- FORMULAS --------------------------------------------------------------
 
@@ -54,6 +55,8 @@ class Formula:
         else:
             self.arguments = hashabledict()
         self._substitutions = {}
+        self._free_variables = None
+        self._signed_free_variables = None
         
         if markers is None:
             markers = set()
@@ -76,7 +79,7 @@ class Formula:
     def __deepcopy__(self, memo):
         return self._copy()
     
-    def eval(self, fsm, context=None, cache={}):
+    def eval(self, fsm, context=None, cache=None):
         """
         Evaluate this formula on fsm in context. Return the BDD
         representing the set of states computed by this formula on
@@ -85,15 +88,59 @@ class Formula:
         fsm -- the system on which evaluate this expression;
         context -- a dictionary of variable name -> BDD pairs representing the
                    context in which evaluate this formula;
-        cache -- the cache to avoid recomputation.
+        cache -- the EvalCache to avoid recomputation; if None, the cache
+                 of the enclosing evaluation, if any, or the cache shared by
+                 all formulas, cleared by model.reset_globals.
+        
+        The evaluation is cached for the values of the free variables of
+        this formula only, such that closed sub-formulas of a fixpoint are
+        evaluated once, and not once per iteration.
         """
+        global _active_cache
         if context is None:
             context = {}
-        hashable_context = frozenset(context.items())
-        key = (self, fsm, hashable_context)
-        if key not in cache:
-            cache[key] = self._eval(fsm, context)
-        return cache[key]
+        if cache is None:
+            cache = (_active_cache if _active_cache is not None
+                     else _eval_cache)
+        key = (self, fsm, frozenset((variable, context[variable])
+                                    for variable in self.free_variables
+                                    if variable in context))
+        result = cache.get(key)
+        if result is None:
+            # Sub-formulas are evaluated with the same cache
+            previous, _active_cache = _active_cache, cache
+            try:
+                result = self._eval(fsm, context)
+            finally:
+                _active_cache = previous
+            cache.put(key, result)
+        return result
+    
+    @property
+    def free_variables(self):
+        """The frozenset of free variables of this formula."""
+        if self._free_variables is None:
+            self._free_variables = frozenset(
+                variable for variable, _ in self.signed_free_variables)
+        return self._free_variables
+    
+    @property
+    def signed_free_variables(self):
+        """
+        The frozenset of (variable, positive) pairs of this formula, where
+        variable is free in this formula and positive is whether variable
+        occurs under an even number of negations; a variable occurring both
+        positively and negatively belongs to two pairs.
+        """
+        if self._signed_free_variables is None:
+            self._signed_free_variables = self._get_signed_free_variables()
+        return self._signed_free_variables
+    
+    def _get_signed_free_variables(self):
+        """
+        Return the frozenset of (variable, positive) pairs of this formula.
+        """
+        raise NotImplementedError("Should be implemented by subclasses.")
     
     def _eval(self, fsm, context=None):
         """
@@ -132,23 +179,8 @@ class Formula:
                     arguments, and return a subset of these choices.
         expand -- if not None, an Explanation that will be expanded.
         """
-        attributors = attributors if attributors is not None else []
-        attr = []
-        for attributor in attributors:
-            if isinstance(attributor, _Attributorer):
-                attr.extend(attributor.attributors)
-            else:
-                attr.append(attributor)
-        attributors = attr
-        
-        choosers = choosers if choosers is not None else []
-        chsers = []
-        for chooser in choosers:
-            if isinstance(chooser, _Chooserer):
-                chsers.append(chooser.chooser)
-            else:
-                chsers.append(chooser)
-        choosers = chsers
+        attributors = _attributors(attributors)
+        choosers = _choosers(choosers)
         
         context = (hashabledict(context)
                    if context is not None else hashabledict())
@@ -169,52 +201,16 @@ class Formula:
         
         while len(pending) > 0:
             current = pending.pop()
-            (fsm, state, formula, context) = (current.fsm, current.state,
-                                              current.formula, current.context)
+            formula = current.formula
             # Keep points of decision unexplained
             # except initial if expand is given (we want to explain this one!)
-            if ((POD in formula.markers or SPOD in formula.markers) and
+            if (formula._is_point_of_decision() and
                 (current != initial or expand is None)):
                 unexplained.add(current)
             else:
-                current_choosers = formula.choosers + choosers
-                if len(current_choosers):
-                    # The question above does not apply to these cases.
-                    obligations, type_ = formula._choices(fsm, state, context)
-                    choices = obligations
-                    
-                    # If a chooser returns None, ignore it and keep the
-                    # previous result
-                    chosen = False
-                    for chooser in current_choosers:
-                        new_obligations = chooser(current, obligations, type_)
-                        if new_obligations is not None:
-                            obligations = new_obligations
-                            chosen = True
-                    
-                    # If no chooser made a choice (all None), backtrack and
-                    # use _explain
-                    if not chosen:
-                        obligations = formula._explain(fsm, state, context)
-                    
-                    else:
-                        # If type_ is exclusive and more than one choice is
-                        # done, this is an error
-                        if type_ == "exclusive" and len(obligations) > 1:
-                            raise ExclusiveChoiceError("Choosers chose more"
-                                                       " than one obligation"
-                                                       " from the exclusive"
-                                                       " choices for " +
-                                                       str(current))
-                        
-                        # The obligation stays (partially) unexplained
-                        # if choice is empty or type_ is inclusive and not all
-                        # choices were made
-                        if (len(obligations) <= 0 or
-                            (type_ == "inclusive" and obligations != choices)):
-                            unexplained.add(current)
-                else:
-                    obligations = formula._explain(fsm, state, context)
+                obligations, partial = formula._obligations(current, choosers)
+                if partial:
+                    unexplained.add(current)
                 transitions |= ((current, obligation)
                                 for obligation in obligations)
                 pending |= obligations - visited
@@ -224,23 +220,13 @@ class Formula:
         
         # Apply attributors
         for obligation in new_nodes:
-                node = dict(obligation)
-                ## Attribute unexplained and initial nodes
-                #if obligation in unexplained:
-                #    node["unexplained"] = True
-                #if not expand and obligation == initial:
-                #    node["initial"] = True
-                for attributor in obligation.formula.attributors + attributors:
-                    if isinstance(attributor, _ObligationAttributor):
-                        node.update(attributor(node))
-                nodes[obligation] = domaintuple(node)
+            nodes[obligation] = obligation.formula._attributed_obligation(
+                                    obligation, attributors)
         edges = set()
         for origin, end in transitions:
-            edge = dict()
-            for attributor in origin.formula.attributors + attributors:
-                if isinstance(attributor, _EdgeAttributor):
-                    edge.update(attributor((nodes[origin], edge, nodes[end])))
-            edges.add((nodes[origin], domaintuple(edge), nodes[end]))
+            edge = origin.formula._attributed_edge(nodes[origin], nodes[end],
+                                                   attributors)
+            edges.add((nodes[origin], edge, nodes[end]))
         
         # Expand the untranslated explanation if needed
         untranslated = {node: set() for node in nodes.values()}
@@ -264,64 +250,110 @@ class Formula:
         
         # Translate bits of the explanation
         if expand is not None:
-            graph = expand.graph
+            graph = GraphBuilder(expand.graph)
             translated = expand.translated
         else:
-            graph = Graph({})
+            graph = GraphBuilder()
             translated = set()
         # Add newly created nodes and edges to translated graph
-        newly_created = defaultdict(set,
-                                    {nodes[new_node]: set()
-                                     for new_node in new_nodes})
+        for new_node in new_nodes:
+            graph.add_node(nodes[new_node])
         for origin, edge, end in edges:
-            newly_created[origin].add((edge, end))
-            if end not in newly_created:
-                newly_created[end] = set()
-        graph = graph.union(Graph({node: frozenset(successors)
-                                   for node, successors
-                                   in newly_created.items()}))
+            graph.add_edge(origin, edge, end)
+        translate(untranslated, graph, unexplained, translated)
         
-        # Extract from untranslated the set of translatable nodes
-        # (not translated yet)
-        translatable = {node for node in untranslated.nodes
-                             if node.formula and
-                                node.formula.generator and
-                                node.formula.generator.translator and
-                                node not in translated}
+        return Explanation(graph.build(), initial, unexplained, translated,
+                           untranslated)
+    
+    def lazy_explain(self, fsm, state, context=None, attributors=None,
+                     choosers=None, budget=None):
+        """
+        Return a lazy explanation explaining why state belongs to the
+        evaluation of this formula in context. Contrary to explain, no
+        obligation is explained before the returned LazyExplanation is
+        walked.
         
-        # Get fully explained subgraphs
-        subgraphs = {}
-        for node in translatable:
-            subgraph, frontier = self._get_sub_explanation(untranslated, node)
-            # The subgraph is fully explained if
-            # the only unexplained nodes are at the frontier
-            if not ((subgraph.nodes & unexplained) - frontier):
-                subgraphs[node] = subgraph
+        fsm, state, context, attributors and choosers are the same as for
+        explain;
+        budget -- if not None, the maximal number of obligations the lazy
+                  explanation can explain.
+        """
+        context = (hashabledict(context)
+                   if context is not None else hashabledict())
+        return LazyExplanation(Obligation(fsm, state, self, context),
+                               attributors=_attributors(attributors),
+                               choosers=_choosers(choosers),
+                               budget=budget)
+    
+    def _is_point_of_decision(self):
+        """Return whether this formula is marked by POD or SPOD."""
+        return POD in self.markers or SPOD in self.markers
+    
+    def _obligations(self, obligation, choosers):
+        """
+        Return the set of obligations explaining obligation, labelled by
+        this formula, and whether obligation stays (partially) unexplained
+        because of the choices made by the choosers.
         
-        # Sort translatable nodes
-        def cmp_subgraphs(node1, node2):
-            if subgraphs[node1].nodes < subgraphs[node2].nodes:
-                return -1
-            elif subgraphs[node1].nodes > subgraphs[node2].nodes:
-                return 1
-            else:
-                return 0
-        to_translate = sorted(subgraphs.keys(), key=cmp_to_key(cmp_subgraphs))
+        obligation -- an obligation labelled by this formula;
+        choosers -- a list of choosers, called after this formula choosers.
+        """
+        fsm, state, context = (obligation.fsm, obligation.state,
+                               obligation.context)
+        current_choosers = self.choosers + choosers
+        if not len(current_choosers):
+            return self._explain(fsm, state, context), False
         
-        # Translate translatable nodes and add corresponding sub-graphs
-        # in graph
-        for node in to_translate:
-            # Extract subgraph from graph
-            subgraph, _ = self._get_sub_explanation(graph, node)
-            # Translate subgraph
-            translated_sub = node.formula.generator.translator(subgraph, node)
-            # Add translated subgraph in graph
-            graph = graph.union(translated_sub)
-            # Add translated node to translated set
-            translated.add(node)
+        obligations, type_ = self._choices(fsm, state, context)
+        choices = obligations
         
-        return Explanation(graph, initial, unexplained, translated,
-                           untranslated)
+        # If a chooser returns None, ignore it and keep the previous result
+        chosen = False
+        for chooser in current_choosers:
+            new_obligations = chooser(obligation, obligations, type_)
+            if new_obligations is not None:
+                obligations = new_obligations
+                chosen = True
+        
+        # If no chooser made a choice (all None), backtrack and use _explain
+        if not chosen:
+            return self._explain(fsm, state, context), False
+        
+        # If type_ is exclusive and more than one choice is done, this is an
+        # error
+        if type_ == "exclusive" and len(obligations) > 1:
+            raise ExclusiveChoiceError("Choosers chose more than one"
+                                       " obligation from the exclusive"
+                                       " choices for " + str(obligation))
+        
+        # The obligation stays (partially) unexplained if choice is empty or
+        # type_ is inclusive and not all choices were made
+        return obligations, (len(obligations) <= 0 or
+                             (type_ == "inclusive" and obligations != choices))
+    
+    def _attributed_obligation(self, obligation, attributors):
+        """
+        Return the node of obligation, labelled by this formula, with the
+        attributes given by the obligation attributors of this formula and of
+        attributors.
+        """
+        node = dict(obligation)
+        for attributor in self.attributors + attributors:
+            if isinstance(attributor, _ObligationAttributor):
+                node.update(attributor(node))
+        return domaintuple(node)
+    
+    def _attributed_edge(self, origin, end, attributors):
+        """
+        Return the edge from origin, a node labelled by this formula, to end,
+        with the attributes given by the edge attributors of this formula and
+        of attributors.
+        """
+        edge = dict()
+        for attributor in self.attributors + attributors:
+            if isinstance(attributor, _EdgeAttributor):
+                edge.update(attributor((origin, edge, end)))
+        return domaintuple(edge)
     
     def _get_sub_explanation(self, graph, node):
         """
@@ -332,12 +364,10 @@ class Formula:
         Also return the frontier, that is, the nodes that are given by its
         Formula arguments.
         
-        graph -- a graph;
+        graph -- a graph (or a graph builder);
         node -- a node of graph, containing a formula attribute with a
                 generator.
         """
-        nodes = set()
-        edges = set()
         pending = {node}
         subformulas = {arg for arg in node.formula.arguments.values()
                        if isinstance(arg, Formula)}
@@ -350,8 +380,7 @@ class Formula:
             if current.formula not in subformulas:
                 for edge, next in graph[current]:
                     new_graph[current].add((edge, next))
-                    edges.add((current, edge, next))
-                    if next not in nodes:
+                    if next not in new_graph:
                         pending.add(next)
             else:
                 frontier.add(current)
@@ -473,6 +502,9 @@ class MTrue(Formula):
     def _no_alias(self):
         return "true"
     
+    def _get_signed_free_variables(self):
+        return frozenset()
+    
     def __eq__(self, other):
         return type(other) is MTrue
     
@@ -523,6 +555,9 @@ class MFalse(Formula):
     def _no_alias(self):
         return "false"
     
+    def _get_signed_free_variables(self):
+        return frozenset()
+    
     def __eq__(self, other):
         return type(other) is MFalse
     
@@ -589,6 +624,9 @@ class Atom(Formula):
     def _no_alias(self):
         return self.expression
     
+    def _get_signed_free_variables(self):
+        return frozenset()
+    
     def __eq__(self, other):
         if type(other) is not Atom:
             return False
@@ -662,6 +700,9 @@ class Variable(Formula):
     def _no_alias(self):
         return self.name
     
+    def _get_signed_free_variables(self):
+        return frozenset({(self, True)})
+    
     def __eq__(self, other):
         if type(other) is not Variable:
             return False
@@ -744,6 +785,11 @@ class Not(Formula):
     def _no_alias(self):
         return "~" + self.child._no_alias()
     
+    def _get_signed_free_variables(self):
+        return frozenset((variable, not positive)
+                         for variable, positive
+                         in self.child.signed_free_variables)
+    
     def __eq__(self, other):
         if type(other) is not Not:
             return False
@@ -816,6 +862,10 @@ class And(Formula):
         return ("(" + self.left._no_alias() + " & " + self.right._no_alias() +
                 ")")
     
+    def _get_signed_free_variables(self):
+        return (self.left.signed_free_variables |
+                self.right.signed_free_variables)
+    
     def __eq__(self, other):
         if type(other) is not And:
             return False
@@ -901,6 +951,10 @@ class Or(Formula):
         return ("(" + self.left._no_alias() + " | " + self.right._no_alias() +
                 ")")
     
+    def _get_signed_free_variables(self):
+        return (self.left.signed_free_variables |
+                self.right.signed_free_variables)
+    
     def __eq__(self, other):
         if type(other) is not Or:
             return False
@@ -1016,6 +1070,9 @@ class Diamond(Formula):
             transition = str(self.transition)
         return "<" + transition + ">" + self.child._no_alias()
     
+    def _get_signed_free_variables(self):
+        return self.child.signed_free_variables
+    
     def __eq__(self, other):
         if type(other) is not Diamond:
             return False
@@ -1138,6 +1195,9 @@ class Box(Formula):
             transition = str(self.transition)
         return "[" + transition + "]" + self.child._no_alias()
     
+    def _get_signed_free_variables(self):
+        return self.child.signed_free_variables
+    
     def __eq__(self, other):
         if type(other) is not Box:
             return False
@@ -1205,22 +1265,7 @@ class Mu(Formula):
         self.child = child
     
     def _eval(self, fsm, context=None):
-        if context is None:
-            context = {}
-        else:
-            context = dict(context)
-        
-        context[self.variable] = BDD.false(fsm.bddEnc.DDmanager)
-
-        old = context[self.variable]
-        new = self.child.eval(fsm, context)
-        
-        while old != new:
-            old = new
-            context[self.variable] = old
-            new = self.child.eval(fsm, context)
-        
-        return new
+        return _fixpoint(self, fsm, context, least=True)
     
     def _explain(self, fsm, state, context):
         if context is None:
@@ -1283,6 +1328,12 @@ class Mu(Formula):
     def _no_alias(self):
         return "mu " + str(self.variable) + "." + self.child._no_alias()
     
+    def _get_signed_free_variables(self):
+        return frozenset((variable, positive)
+                         for variable, positive
+                         in self.child.signed_free_variables
+                         if variable != self.variable)
+    
     def __eq__(self, other):
         if type(other) is not Mu:
             return False
@@ -1351,21 +1402,7 @@ class Nu(Formula):
         self.child = child
     
     def _eval(self, fsm, context=None):
-        if context is None:
-            context = {}
-        else:
-            context = dict(context)
-        
-        context[self.variable] = BDD.true(fsm.bddEnc.DDmanager)
-        
-        old = context[self.variable]
-        new = self.child.eval(fsm, context)
-        while old != new:
-            old = new
-            context[self.variable] = old
-            new = self.child.eval(fsm, context)
-        
-        return new
+        return _fixpoint(self, fsm, context, least=False)
     
     def _explain(self, fsm, state, context):
         cp = self._copy()
@@ -1388,6 +1425,12 @@ class Nu(Formula):
     def _no_alias(self):
         return "nu " + str(self.variable) + "." + self.child._no_alias()
     
+    def _get_signed_free_variables(self):
+        return frozenset((variable, positive)
+                         for variable, positive
+                         in self.child.signed_free_variables
+                         if variable != self.variable)
+    
     def __eq__(self, other):
         if type(other) is not Nu:
             return False
@@ -1432,6 +1475,149 @@ class Nu(Formula):
                                                substitution=self_sub)
 
 
+# ----- EVALUATION CACHE ------------------------------------------------------
+
+# The maximal number of BDD nodes referenced by the shared evaluation cache
+EVAL_BUDGET = 1000000
+
+
+class EvalCache(BddCache):
+    """
+    A cache of formula evaluations, keyed by (formula, fsm, context) triples
+    where the context is restricted to the free variables of the formula.
+    Besides the statistics of a BddCache, it records the hits and misses of
+    every formula.
+    
+    If warm_start is True, the cache also keeps the last fixpoint of every
+    Mu and Nu formula, such that the next evaluation of the formula starts
+    from it when this gives the same fixpoint; the nested fixpoints of the
+    same kind are then computed once for all the iterations of the outer
+    fixpoint, and only alternation costs a restart.
+    
+    name -- the name of the cache, used in statistics;
+    budget -- the maximal number of BDD nodes referenced by the cache,
+              or None for no bound;
+    max_entries -- the maximal number of entries of the cache, or None for
+                   no bound;
+    warm_start -- whether fixpoints start from their last approximants.
+    
+    As every BddCache, an EvalCache is cleared by utils.cache.reset, called
+    by model.reset_globals.
+    """
+    
+    def __init__(self, name="mucalculus.eval", budget=EVAL_BUDGET,
+                 max_entries=None, warm_start=True):
+        super(EvalCache, self).__init__(name, budget=budget,
+                                        max_entries=max_entries)
+        self.formula_hits = Counter()
+        self.formula_misses = Counter()
+        self.warm_start = warm_start
+        self.warm_starts = 0
+        # (fixpoint formula, fsm) -> (values of free variables, fixpoint)
+        self._approximants = {}
+    
+    def get(self, key, default=None):
+        if key in self:
+            self.formula_hits[key[0]] += 1
+        else:
+            self.formula_misses[key[0]] += 1
+        return super(EvalCache, self).get(key, default=default)
+    
+    def clear(self):
+        super(EvalCache, self).clear()
+        self.formula_hits.clear()
+        self.formula_misses.clear()
+        self.warm_starts = 0
+        self._approximants.clear()
+    
+    def stats(self):
+        stats = super(EvalCache, self).stats()
+        stats["warm_starts"] = self.warm_starts
+        return stats
+    
+    def approximant(self, formula, fsm, values, least):
+        """
+        Return the last fixpoint of formula, a Mu (if least) or a Nu,
+        computed on fsm with this cache, if the iterations of formula with
+        values can start from it, or None otherwise.
+        
+        values -- a dictionary of free variables of formula -> BDDs.
+        
+        The last fixpoint, computed with old values, is below the least
+        fixpoint (resp. above the greatest one) with the new values if every
+        free variable keeps its value, or grows and occurs only positively
+        (resp. negatively), or shrinks and occurs only negatively (resp.
+        positively). This is the case of fixpoints nested in a fixpoint of the
+        same kind, without alternation, as in the algorithm of Emerson and Lei.
+        """
+        if not self.warm_start or (formula, fsm) not in self._approximants:
+            return None
+        old_values, fixpoint = self._approximants[(formula, fsm)]
+        for variable, positive in formula.signed_free_variables:
+            old, new = old_values.get(variable), values.get(variable)
+            if old is None or new is None:
+                return None
+            if old != new and not (old <= new if positive == least
+                                   else new <= old):
+                return None
+        self.warm_starts += 1
+        return fixpoint
+    
+    def set_approximant(self, formula, fsm, values, fixpoint):
+        """
+        Record fixpoint as the last fixpoint of formula computed on fsm
+        with values.
+        """
+        if self.warm_start:
+            self._approximants[(formula, fsm)] = (values, fixpoint)
+    
+    def formula_stats(self):
+        """
+        Return a dictionary of formula -> (hits, misses) pairs for every
+        formula evaluated with this cache.
+        """
+        return {formula: (self.formula_hits[formula],
+                          self.formula_misses[formula])
+                for formula in (set(self.formula_hits) |
+                                set(self.formula_misses))}
+
+
+_eval_cache = EvalCache()
+# The cache of the evaluation in progress, if any
+_active_cache = None
+
+
+def _fixpoint(formula, fsm, context, least):
+    """
+    Return the least (if least) or greatest fixpoint of formula, a Mu or a
+    Nu, on fsm in context. The iterations start from the last fixpoint of
+    formula if the cache of the evaluation allows it, instead of false (or
+    true).
+    """
+    cache = _active_cache if _active_cache is not None else _eval_cache
+    context = dict(context) if context is not None else {}
+    values = {variable: context[variable]
+              for variable in formula.free_variables if variable in context}
+    
+    start = cache.approximant(formula, fsm, values, least)
+    if start is None:
+        if least:
+            start = BDD.false(fsm.bddEnc.DDmanager)
+        else:
+            start = BDD.true(fsm.bddEnc.DDmanager)
+    
+    old = start
+    context[formula.variable] = old
+    new = formula.child.eval(fsm, context)
+    while old != new:
+        old = new
+        context[formula.variable] = old
+        new = formula.child.eval(fsm, context)
+    
+    cache.set_approximant(formula, fsm, values, new)
+    return new
+
+
 # ----- ALIASES ---------------------------------------------------------------
 
 
@@ -1689,6 +1875,19 @@ def _keep_transition_and_inputs(edge):
     else:
         return {}
 
+def _attributors(attributors):
+    """
+    Return the list of _ObligationAttributor and _EdgeAttributor of
+    attributors, a list of attributors (or None).
+    """
+    result = []
+    for attributor in (attributors if attributors is not None else []):
+        if isinstance(attributor, _Attributorer):
+            result.extend(attributor.attributors)
+        else:
+            result.append(attributor)
+    return result
+
 
 # ----- CHOOSERS --------------------------------------------------------------
 
@@ -1719,4 +1918,16 @@ def chooser(chooser):
                choice ("inclusive", "exclusive" or "none") as arguments, and
                returning a subset of these choices.
     """
-    return _Chooserer(chooser)
\ No newline at end of file
+    return _Chooserer(chooser)
+
+def _choosers(choosers):
+    """
+    Return the list of _Chooser of choosers, a list of choosers (or None).
+    """
+    result = []
+    for chooser in (choosers if choosers is not None else []):
+        if isinstance(chooser, _Chooserer):
+            result.append(chooser.chooser)
+        else:
+            result.append(chooser)
+    return result
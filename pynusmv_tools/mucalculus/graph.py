@@ -35,10 +35,22 @@ be hashable.
 Nodes and edges do not have to share the same domains, as in [MCEE]; instead,
 the full domain of nodes and edges is the union of all the keys of the
 domaintuples of nodes and edges, respectively.
+
+Graphs are immutable, and operators share the successors sets of their
+arguments whenever possible. To build a graph incrementally, use a
+GraphBuilder: adding a node or an edge takes constant time, and the Graph is
+only built at the end.
 """
 
+import weakref
 from collections import Mapping, defaultdict
 
+# The key schemas of domaintuples: sorted keys -> (keys, key -> index)
+_schemas = {}
+# The existing domaintuples, by (keys, values)
+_domaintuples = weakref.WeakValueDictionary()
+
+
 class domaintuple(Mapping):
     """
     A domaintuple is a read-only dictionary where missing keys default to None.
@@ -49,64 +61,134 @@ class domaintuple(Mapping):
 
     Domaintuples values MUST be hashable.
 
+    Domaintuples are interned: creating a domaintuple equal to an existing one
+    returns the existing one. A domaintuple only stores the tuple of its
+    values; its keys are stored in a schema shared by all domaintuples with
+    the same keys.
+
     Inspired from frozendict from https://pypi.python.org/pypi/frozendict/.
     """
 
-    def __init__(self, *args, **kwargs):
-        self.__dict = {k: v
-                       for k, v in dict(*args, **kwargs).items()
-                       if v is not None}
-        self.__hash = None
+    __slots__ = ("_keys", "_index", "_values", "_hash", "__weakref__")
+
+    def __new__(cls, *args, **kwargs):
+        if len(args) == 1 and not kwargs and type(args[0]) is cls:
+            return args[0]
+        items = {k: v
+                 for k, v in dict(*args, **kwargs).items()
+                 if v is not None}
+        keys = tuple(sorted(items, key=repr))
+        schema = _schemas.get(keys)
+        if schema is None:
+            schema = (keys, {k: i for i, k in enumerate(keys)})
+            _schemas[keys] = schema
+        keys = schema[0]
+        values = tuple(items[k] for k in keys)
+        identity = (keys, values)
+        self = _domaintuples.get(identity)
+        if self is None:
+            self = super(domaintuple, cls).__new__(cls)
+            self._keys, self._index = schema
+            self._values = values
+            self._hash = hash(identity)
+            _domaintuples[identity] = self
+        return self
 
     def __getitem__(self, key):
-        try:
-            return self.__dict[key]
-        except KeyError:
-            return None
+        index = self._index.get(key)
+        return None if index is None else self._values[index]
     
     def __getattr__(self, name):
-        if name in self.__dict:
-            return self.__dict[name]
-        else:
-            return None
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __reduce__(self):
+        return (domaintuple, (dict(zip(self._keys, self._values)),))
 
     def copy(self):
-        return domaintuple(self)
+        return self
 
     def __iter__(self):
-        return iter(self.__dict)
+        return iter(self._keys)
 
     def __len__(self):
-        return len(self.__dict)
+        return len(self._keys)
 
     def __repr__(self):
-        return '<domaintuple %s>' % repr(self.__dict)
+        return '<domaintuple %s>' % repr(dict(zip(self._keys, self._values)))
 
     def __hash__(self):
-        if self.__hash is None:
-            self.__hash = hash(frozenset(self.__dict.items()))
-        return self.__hash
-
-    def keys(self):
-        return self.__dict.keys()
-
-    def values(self):
-        return self.__dict.values()
-
-    def items(self):
-        return self.__dict.items()
+        return self._hash
 
     def __contains__(self, key):
-        return key in self.__dict
+        return key in self._index
 
     def get(self, key, default=None):
-        return self.__dict.get(key, default=default)
+        index = self._index.get(key)
+        return default if index is None else self._values[index]
 
     def __eq__(self, other):
-        return self.__dict == other
+        if self is other:
+            return True
+        if isinstance(other, domaintuple):
+            return (self._hash == other._hash and
+                    self._keys == other._keys and
+                    self._values == other._values)
+        return dict(zip(self._keys, self._values)) == other
 
     def __ne__(self, other):
-        return self.__dict != other
+        return not self == other
+
+
+class GraphBuilder(Mapping):
+    """
+    A mutable relational graph, used to build a Graph incrementally.
+    
+    A GraphBuilder is a mapping giving, for each node, the set of pairs of
+    edge value and successing node added so far. Adding nodes and edges takes
+    constant (amortized) time; build returns the built Graph.
+    """
+    
+    def __init__(self, graph=None):
+        """
+        Create a new builder, starting with the nodes and edges of graph,
+        if not None.
+        """
+        self.__dict = {}
+        if graph is not None:
+            self.update(graph)
+    
+    def __getitem__(self, key):
+        return self.__dict[key]
+    
+    def __iter__(self):
+        return iter(self.__dict)
+    
+    def __len__(self):
+        return len(self.__dict)
+    
+    def add_node(self, node):
+        """Add node, a domaintuple, to the graph."""
+        if node not in self.__dict:
+            self.__dict[node] = set()
+    
+    def add_edge(self, origin, edge, end):
+        """
+        Add the edge (origin, edge, end), and its extremities, to the graph.
+        """
+        self.add_node(end)
+        self.__dict.setdefault(origin, set()).add((edge, end))
+    
+    def update(self, graph):
+        """Add all nodes and edges of graph, a Graph, to the graph."""
+        for node, successors in graph.items():
+            self.__dict.setdefault(node, set()).update(successors)
+    
+    def build(self):
+        """Return the Graph built so far."""
+        return Graph._wrap({node: frozenset(successors)
+                            for node, successors in self.__dict.items()})
 
 
 class Graph(Mapping):
@@ -119,7 +201,8 @@ class Graph(Mapping):
     
     A constraint any graph must fulfill is that each node appearing as a
     successor must also appear as a key of the mapping (even if its set of
-    successing nodes is empty).
+    successing nodes is empty). This constraint is not checked at
+    construction; use check to validate a graph.
     """
     
     def __init__(self, *args, **kwargs):
@@ -128,7 +211,16 @@ class Graph(Mapping):
         mapping corresponding to the graph.
         """
         self.__dict = dict(*args, **kwargs)
-        assert(self.check())
+    
+    @classmethod
+    def _wrap(cls, mapping):
+        """
+        Return a new graph using mapping, a dictionary built for it, as its
+        mapping, without copying it.
+        """
+        graph = cls.__new__(cls)
+        graph.__dict = mapping
+        return graph
     
     @property
     def nodes(self):
@@ -184,10 +276,17 @@ class Graph(Mapping):
 
         Return a new Graph representing the union of self and other.
         """
-        new_graph = defaultdict(frozenset, self)
+        if not other:
+            return self
+        if not self:
+            return other
+        new_graph = dict(self.items())
         for node, successors in other.items():
-            new_graph[node] |= successors
-        return Graph(new_graph)
+            if node not in new_graph:
+                new_graph[node] = successors
+            elif not successors <= new_graph[node]:
+                new_graph[node] = new_graph[node] | successors
+        return Graph._wrap(new_graph)
 
     __or__ = union
 
@@ -204,7 +303,7 @@ class Graph(Mapping):
                                       if (edge, successor) in other[node]})
                      for node, successors in self.items()
                      if node in other}
-        return Graph(new_graph)
+        return Graph._wrap(new_graph)
 
     __and__ = intersection
 
@@ -221,7 +320,7 @@ class Graph(Mapping):
                                       if successor not in other})
                      for node, successors in self.items()
                      if node not in other}
-        return Graph(new_graph)
+        return Graph._wrap(new_graph)
 
     def edge_difference(self, other):
         """
@@ -236,7 +335,7 @@ class Graph(Mapping):
                                       if node not in other or
                                          (edge, successor) not in other[node]})
                      for node, successors in self.items()}
-        return Graph(new_graph)
+        return Graph._wrap(new_graph)
 
     def selection(self, node_selector=None, edge_selector=None):
         """
@@ -255,20 +354,27 @@ class Graph(Mapping):
         node_selector returns a true value, and where edges are all edges of
         this graph for which edge_selector returns a true value.
         """
+        if node_selector is None and edge_selector is None:
+            return self
         if node_selector is None:
-            nodes = set(self.nodes)
+            nodes = self.nodes
         else:
             nodes = {node for node in self if node_selector(node)}
-        new_graph = {node: frozenset({(edge, successor)
+        new_graph = {}
+        for node, successors in self.items():
+            if node in nodes:
+                selected = frozenset({(edge, successor)
                                       for edge, successor in successors
                                       if successor in nodes and
                                          (edge_selector is None or
                                           edge_selector((node,
                                                          edge,
                                                          successor)))})
-                     for node, successors in self.items()
-                     if node in nodes}
-        return Graph(new_graph)
+                # Share unchanged successors
+                new_graph[node] = (successors
+                                   if len(selected) == len(successors)
+                                   else selected)
+        return Graph._wrap(new_graph)
 
     def projection(self, node_domain=None, edge_domain=None):
         """
@@ -287,6 +393,8 @@ class Graph(Mapping):
         node_domain and edges are new domaintuples with keys of edge_domain.
         Edges without non-None values are removed if edge_domain is given.
         """
+        if node_domain is None and edge_domain is None:
+            return self
         if node_domain is None:
             nodes = {node: node for node in self.nodes}
             new_graph = {node: set() for node in nodes}
@@ -302,7 +410,7 @@ class Graph(Mapping):
                 projected = self.project(edge, edge_domain)
                 if projected:
                     new_graph[nodes[origin]].add((projected, nodes[end]))
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def join(self, other):
@@ -361,7 +469,7 @@ class Graph(Mapping):
                     agree[(node1, end2)]):
                     new_graph[nodes[(node1, origin2)]].add(
                         (edge2, nodes[(node1, end2)]))
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def extension(self, node_extension=None, edge_extension=None):
@@ -400,7 +508,7 @@ class Graph(Mapping):
             else:
                 new_graph[nodes[origin]].add((domaintuple(edge), nodes[end]))
 
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def mapping(self, node_mapping=None, edge_mapping=None):
@@ -429,7 +537,7 @@ class Graph(Mapping):
             else:
                 new_edge = edge
             new_graph[nodes[origin]].add((new_edge, nodes[end]))
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def grouping(self, node_group=None, edge_group=None):
@@ -487,7 +595,7 @@ class Graph(Mapping):
                      for origin, edge, end in self.edges}
         for origin, edge, end in edges:
             new_graph[origin].add((edge, end))
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def ungrouping(self, node_group=None, edge_group=None):
@@ -517,7 +625,7 @@ class Graph(Mapping):
                                      else self.ungroup(edge, edge_group)):
                         for new_succ in nodes[successor]:
                             new_graph[new_node].add((new_edge, new_succ))
-        return Graph({node: frozenset(successors)
+        return Graph._wrap({node: frozenset(successors)
                       for node, successors in new_graph.items()})
 
     def dot(self):
@@ -19,6 +19,7 @@ from pynusmv.mc import eval_simple_expression
 from pynusmv.fsm import BddFsm, BddTrans
 
 from . import MuCalculusError, MuCalculusModelError, UnknownTransitionError
+from ..utils import cache
 
 import itertools
 
@@ -172,6 +173,7 @@ def reset_globals():
     """
     global __bddmodel
     __bddmodel = None
+    cache.reset()
 
 
 def bddModel(transitions=None, variables_ordering=None):
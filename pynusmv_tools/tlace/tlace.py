@@ -9,6 +9,7 @@ from pynusmv.fsm import BddFsm
 
 from pynusmv_tools.tlace.check import check as check_ctl_spec
 from pynusmv_tools.tlace.xml import xml_representation
+from pynusmv_tools.utils.results import ResultCache
     
     
 def check_and_explain(allargs):
@@ -26,8 +27,25 @@ def check_and_explain(allargs):
                                                  'with TLACE generation.')
     # Populate arguments: for now, only the model
     parser.add_argument('model', help='the NuSMV model with specifications')
+    parser.add_argument('-cache', dest='cache',
+                        help='the directory of the results cache')
     args = parser.parse_args(allargs)
     
+    # Look for the results in the cache
+    if args.cache is not None:
+        cache = ResultCache(args.cache)
+        key = cache.file_key(args.model, "tlace")
+        results = cache.get(key)
+        if results is not None:
+            for spec, satisfied, explanation in results:
+                print('Specification', spec, 'is', str(satisfied),
+                      file=sys.stderr)
+                if not satisfied:
+                    print(explanation)
+                print()
+            return
+    results = []
+    
     # Initialize the model
     fsm = BddFsm.from_filename(args.model)
     propDb = glob.prop_database()
@@ -43,10 +61,16 @@ def check_and_explain(allargs):
             print('Specification',str(spec), 'is', str(satisfied),
                   file=sys.stderr)
         
+            explanation = None
             if not satisfied:
-                print(xml_representation(fsm, cntex, spec))
+                explanation = xml_representation(fsm, cntex, spec)
+                print(explanation)
+            results.append((str(spec), satisfied, explanation))
             
             print()
+    
+    if args.cache is not None:
+        cache.put(key, results)
 
 def main():
     '''TLACE entry point'''
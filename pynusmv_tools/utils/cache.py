@@ -0,0 +1,163 @@
+"""
+Cache module provides bounded caches for BDD-valued results.
+
+A BddCache maps keys to BDDs (or tuples of BDDs) and keeps the total number
+of BDD nodes it references below a budget, and optionally its number of
+entries below a maximum, evicting the least recently used entries first.
+Evicting an entry only costs a recomputation, but keeps CUDD memory bounded
+on long runs.
+
+Every BddCache is registered in this module while it is alive, such that all
+of them can be cleared at once with reset, or tuned at once with set_budget.
+The registry only holds weak references: a cache that is no longer used
+elsewhere is freed, with its BDDs.
+reset must be called whenever (and before) pynusmv.init.deinit_nusmv is
+called, since the cached BDDs become invalid after that call.
+"""
+
+import weakref
+from collections import OrderedDict
+
+from pynusmv.dd import BDD
+
+__caches = weakref.WeakSet()
+
+def reset():
+    """Clear all the registered caches."""
+    for cache in __caches:
+        cache.clear()
+
+def set_budget(budget, prefix=""):
+    """
+    Set the budget of all the registered caches whose name starts with
+    prefix.
+
+    budget -- the maximal number of BDD nodes of each cache, or None for
+              unbounded caches;
+    prefix -- the prefix of the names of the tuned caches (default: all).
+    """
+    for cache in __caches:
+        if cache.name.startswith(prefix):
+            cache.budget = budget
+
+def stats():
+    """Return a dictionary of cache name -> statistics of the cache."""
+    return {cache.name: cache.stats() for cache in __caches}
+
+def budgets():
+    """Return a dictionary of cache name -> budget of the cache."""
+    return {cache.name: cache.budget for cache in __caches}
+
+def _register(cache):
+    __caches.add(cache)
+
+
+def bdd_size(value):
+    """
+    Return the number of BDD nodes of value, a BDD or a tuple of BDDs.
+    Nodes shared between several BDDs are counted several times.
+    """
+    if isinstance(value, BDD):
+        return value.size
+    else:
+        return sum(bdd.size for bdd in value)
+
+
+def key_size(key):
+    """
+    Return the number of BDD nodes referenced by key, a BDD or a tuple whose
+    elements may be BDDs (or such tuples); other elements count for nothing.
+    """
+    if isinstance(key, BDD):
+        return key.size
+    elif isinstance(key, tuple):
+        return sum(key_size(element) for element in key)
+    else:
+        return 0
+
+
+class BddCache(object):
+    """
+    A least-recently-used cache of BDDs, bounded by a number of BDD nodes.
+
+    name -- the name of the cache, used in statistics;
+    budget -- the maximal number of BDD nodes referenced by the cache,
+              or None for no bound;
+    max_entries -- the maximal number of entries of the cache, or None for
+                   no bound.
+    """
+
+    def __init__(self, name, budget=None, max_entries=None):
+        self.name = name
+        self.budget = budget
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _register(self)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nodes(self):
+        """The number of BDD nodes currently referenced by this cache."""
+        return self._nodes
+
+    def get(self, key, default=None):
+        """
+        Return the value associated to key, or default if there is none.
+        A found entry becomes the most recently used one.
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+        else:
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Associate value to key, and evict the least recently used entries
+        until the budget and the maximal number of entries are respected.
+        The new entry is never evicted. The BDDs of key are kept alive by the
+        entry as well, and count against the budget.
+
+        value -- a BDD or a tuple of BDDs.
+        """
+        if key in self._entries:
+            self._nodes -= self._entries.pop(key)[1]
+        size = bdd_size(value) + key_size(key)
+        self._entries[key] = (value, size)
+        self._nodes += size
+
+        while len(self._entries) > 1 and (
+                (self.budget is not None and self._nodes > self.budget) or
+                (self.max_entries is not None and
+                 len(self._entries) > self.max_entries)):
+            _, (_, oldsize) = self._entries.popitem(last=False)
+            self._nodes -= oldsize
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self._nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Return a dictionary with the number of entries, BDD nodes, hits,
+        misses and evictions of this cache.
+        """
+        return {"entries": len(self._entries), "nodes": self._nodes,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
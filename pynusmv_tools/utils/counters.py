@@ -0,0 +1,38 @@
+"""
+Counters module keeps track of the work done by model checking algorithms.
+
+Algorithms increment named counters (e.g. "strategies" for the number of
+strategies they enumerate, "filterings" for the number of times they compute
+the states winning for a set of strategies), and benchmarks read them with
+stats. Counters are global and accumulate until reset is called.
+"""
+
+import functools
+from collections import Counter
+
+__counters = Counter()
+
+def reset():
+    """Reset all the counters to 0."""
+    __counters.clear()
+
+def increment(name, value=1):
+    """Increment the counter called name by value."""
+    __counters[name] += value
+
+def stats():
+    """Return a dictionary of counter name -> value."""
+    return dict(__counters)
+
+def counted(name):
+    """
+    Return a decorator making a function increment the counter called name
+    each time it is called.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            __counters[name] += 1
+            return function(*args, **kwargs)
+        return wrapper
+    return decorator
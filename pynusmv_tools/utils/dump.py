@@ -0,0 +1,233 @@
+"""
+Dump module serializes BDDs, to move them between processes and runs.
+
+Several BDDs are dumped together in a node table shared by all of them.
+Variables are identified by their names in the BDD encoding, such that the
+BDDs can be loaded in another process (or run) with the same model, whatever
+the indices (and order) of the variables in this process.
+
+The format is the following (integers are little-endian, unsigned):
+ - a header: the magic string MAGIC, the number of variables, of nodes and
+   of roots (4 bytes each);
+ - the variables table: for each variable, the length of its name
+   (2 bytes) followed by its UTF-8 encoded name;
+ - the nodes table: for each node, the position of its variable in the
+   variables table, its then child and its else child (4 bytes each);
+ - the roots: for each dumped BDD, its root (4 bytes).
+Children and roots are references: 0 is FALSE, 1 is TRUE and i + 2 is the
+i-th node of the nodes table. Children always come before their parents,
+such that dumps are streamable: write and read process them sequentially
+from binary file objects, a node being built as soon as it is read, without
+holding the whole dump in memory.
+"""
+
+import io
+import struct
+
+from pynusmv.dd import BDD
+from pynusmv.exception import PyNuSMVError
+from pynusmv_lower_interface.nusmv.dd import dd as nsdd
+from pynusmv_lower_interface.nusmv.enc.bdd import bdd as nsbddEnc
+from pynusmv_lower_interface.nusmv.node import node as nsnode
+
+MAGIC = b"PYNSBDD1"
+
+_HEADER = struct.Struct("<8sIII")
+_NAME_LENGTH = struct.Struct("<H")
+_NODE = struct.Struct("<III")
+_ROOT = struct.Struct("<I")
+
+
+class BddDumpError(PyNuSMVError):
+    """Malformed dump, or dump incompatible with the model."""
+    pass
+
+
+def _var_name(fsm, index):
+    enc = fsm.bddEnc
+    if not nsbddEnc.BddEnc_has_var_at_index(enc._ptr, index):
+        raise BddDumpError("No variable at index " + str(index) + ".")
+    return nsnode.sprint_node(nsbddEnc.BddEnc_get_var_name_from_index(
+                                                            enc._ptr, index))
+
+def _var_indices(fsm):
+    """Return a dictionary of variable name -> index in the encoding."""
+    enc = fsm.bddEnc
+    indices = {}
+    for index in range(enc.DDmanager.size):
+        if nsbddEnc.BddEnc_has_var_at_index(enc._ptr, index):
+            name = nsbddEnc.BddEnc_get_var_name_from_index(enc._ptr, index)
+            if name is not None:
+                indices[nsnode.sprint_node(name)] = index
+    return indices
+
+def _cofactors(manager, bdd):
+    """Return the then and else children of the top node of bdd."""
+    then = BDD(nsdd.bdd_dup(nsdd.bdd_then(manager._ptr, bdd._ptr)),
+               manager, freeit=True)
+    else_ = BDD(nsdd.bdd_dup(nsdd.bdd_else(manager._ptr, bdd._ptr)),
+                manager, freeit=True)
+    # Children of a complemented node are the ones of the regular node
+    if nsdd.bdd_iscomplement(manager._ptr, bdd._ptr):
+        return ~then, ~else_
+    else:
+        return then, else_
+
+
+def write(fsm, bdds, f):
+    """
+    Write the given BDDs to f.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs belong to;
+    bdds -- a list of BDDs;
+    f -- a binary file object open for writing.
+    """
+    manager = fsm.bddEnc.DDmanager
+    names = []
+    positions = {} # variable index -> position in names
+    nodes = []
+    refs = {} # BDD -> reference
+
+    def known(bdd):
+        return bdd.is_false() or bdd.is_true() or bdd in refs
+
+    def ref(bdd):
+        if bdd.is_false():
+            return 0
+        if bdd.is_true():
+            return 1
+        return refs[bdd]
+
+    def add(root):
+        # Post-order with an explicit stack: BDDs can be deeper than the
+        # recursion limit
+        children = {} # BDD -> (then, else) of the nodes on the stack
+        stack = [root]
+        while stack:
+            bdd = stack[-1]
+            if known(bdd):
+                stack.pop()
+                continue
+            if bdd not in children:
+                children[bdd] = _cofactors(manager, bdd)
+            then, else_ = children[bdd]
+            missing = [child for child in (then, else_) if not known(child)]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            del children[bdd]
+            index = nsdd.bdd_index(manager._ptr, bdd._ptr)
+            if index not in positions:
+                positions[index] = len(names)
+                names.append(_var_name(fsm, index).encode("UTF-8"))
+            nodes.append((positions[index], ref(then), ref(else_)))
+            refs[bdd] = len(nodes) + 1
+        return ref(root)
+
+    roots = [add(bdd) for bdd in bdds]
+
+    f.write(_HEADER.pack(MAGIC, len(names), len(nodes), len(roots)))
+    for name in names:
+        f.write(_NAME_LENGTH.pack(len(name)))
+        f.write(name)
+    for node in nodes:
+        f.write(_NODE.pack(*node))
+    for root in roots:
+        f.write(_ROOT.pack(root))
+
+
+def read(fsm, f):
+    """
+    Return the list of BDDs read from f.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs must be loaded into;
+           it must declare all the variables of the dump;
+    f -- a binary file object open for reading, positioned at the beginning
+         of a dump produced by write; only the dump is consumed.
+    """
+    def unpack(structure):
+        chunk = f.read(structure.size)
+        if len(chunk) < structure.size:
+            raise BddDumpError("Truncated BDD dump.")
+        return structure.unpack(chunk)
+
+    magic, nbvars, nbnodes, nbroots = unpack(_HEADER)
+    if magic != MAGIC:
+        raise BddDumpError("Not a BDD dump.")
+
+    manager = fsm.bddEnc.DDmanager
+    indices = _var_indices(fsm)
+    variables = []
+    for _ in range(nbvars):
+        length, = unpack(_NAME_LENGTH)
+        name = f.read(length)
+        if len(name) < length:
+            raise BddDumpError("Truncated BDD dump.")
+        name = name.decode("UTF-8")
+        if name not in indices:
+            raise BddDumpError("Unknown variable " + name + ".")
+        variables.append(BDD(nsdd.bdd_new_var_with_index(manager._ptr,
+                                                         indices[name]),
+                             manager, freeit=True))
+
+    try:
+        bdds = [BDD.false(manager), BDD.true(manager)]
+        for _ in range(nbnodes):
+            var, then, else_ = unpack(_NODE)
+            var = variables[var]
+            bdds.append((var & bdds[then]) | (~var & bdds[else_]))
+
+        roots = []
+        for _ in range(nbroots):
+            root, = unpack(_ROOT)
+            roots.append(bdds[root])
+    except IndexError:
+        raise BddDumpError("Malformed BDD dump.")
+    return roots
+
+
+def dumps(fsm, bdds):
+    """
+    Return the bytes representing the given BDDs.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs belong to;
+    bdds -- a list of BDDs.
+    """
+    f = io.BytesIO()
+    write(fsm, bdds, f)
+    return f.getvalue()
+
+
+def loads(fsm, data):
+    """
+    Return the list of BDDs represented by data.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs must be loaded into;
+           it must declare all the variables of the dump;
+    data -- a bytes-like object (bytes, bytearray, mmap) produced by dumps.
+    """
+    return read(fsm, io.BytesIO(data))
+
+
+def dump(fsm, bdds, path):
+    """
+    Store the given BDDs in the file at path.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs belong to;
+    bdds -- a list of BDDs;
+    path -- the path of the file.
+    """
+    with open(path, "wb") as f:
+        write(fsm, bdds, f)
+
+
+def load(fsm, path):
+    """
+    Return the list of BDDs stored in the file at path, read incrementally.
+
+    fsm -- the BddFsm (or MAS) whose encoding the BDDs must be loaded into;
+    path -- the path of the file, produced by dump.
+    """
+    with open(path, "rb") as f:
+        return read(fsm, f)
@@ -0,0 +1,292 @@
+"""
+Explicit module extracts the reachable graph of a BddFsm as integer arrays.
+
+Instead of picking states one by one and computing images between every
+pair of them, extract enumerates the paths of a single BDD relating the
+reachable states, the inputs and the reachable successors, once. Every path
+is a cube over the current, input and next state bits, whose don't care bits
+are expanded; bits are mapped to states and inputs through dictionaries of
+bit tuples, and values are converted to strings once per state and inputs.
+
+The resulting ExplicitGraph stores
+ - a value dictionary: for every variable, the list of its values, as
+   strings, such that values are represented by their position in the list;
+ - the states, as a flat array of value positions, one row per state and
+   one column per state variable (the same for inputs);
+ - the edges, as a flat array of (source, inputs, target) triples, where
+   inputs is -1 if the model has no input variables;
+ - labels: for every given BDD, the array of the states (or inputs)
+   belonging to it.
+Arrays are array.array of integers, compact and cheap to compare.
+"""
+
+import itertools
+from array import array
+
+from pynusmv.dd import BDD, State, Inputs
+from pynusmv_lower_interface.nusmv.dd import dd as nsdd
+from pynusmv_lower_interface.nusmv.enc.bdd import bdd as nsbddEnc
+
+
+class ExplicitGraph(object):
+    """
+    The explicit reachable graph of a model.
+
+    variables -- the tuple of state variable names, sorted;
+    inputs_variables -- the tuple of input variable names, sorted;
+    values -- a dictionary of variable name -> list of values (as strings).
+    """
+
+    def __init__(self, variables, inputs_variables):
+        self.variables = tuple(variables)
+        self.inputs_variables = tuple(inputs_variables)
+        self.values = {var: [] for var in self.variables +
+                                          self.inputs_variables}
+        self._positions = {var: {} for var in self.values}
+        self.states = array("l")
+        self.inputs = array("l")
+        self.edges = array("l")
+        self.initial = array("l")
+        self.state_labels = {}
+        self.inputs_labels = {}
+
+    def _encode(self, variables, values):
+        row = []
+        for var in variables:
+            value = values[var]
+            positions = self._positions[var]
+            if value not in positions:
+                positions[value] = len(self.values[var])
+                self.values[var].append(value)
+            row.append(positions[value])
+        return row
+
+    def _decode(self, variables, table, index):
+        width = len(variables)
+        row = table[index * width:(index + 1) * width]
+        return {var: self.values[var][value]
+                for var, value in zip(variables, row)}
+
+    def add_state(self, values):
+        """
+        Add the state with values, a dictionary of state variable name ->
+        string value, and return its id.
+        """
+        self.states.extend(self._encode(self.variables, values))
+        return self.nb_states - 1
+
+    def add_inputs(self, values):
+        """
+        Add the inputs with values, a dictionary of input variable name ->
+        string value, and return its id.
+        """
+        self.inputs.extend(self._encode(self.inputs_variables, values))
+        return self.nb_inputs - 1
+
+    def add_edge(self, source, inputs, target):
+        """
+        Add the edge from source to target through inputs (state and inputs
+        ids; inputs is None if the model has no input variables).
+        """
+        self.edges.extend((source, -1 if inputs is None else inputs,
+                           target))
+
+    @property
+    def nb_states(self):
+        """The number of states of this graph."""
+        return len(self.states) // max(len(self.variables), 1)
+
+    @property
+    def nb_inputs(self):
+        """The number of inputs of this graph."""
+        return len(self.inputs) // max(len(self.inputs_variables), 1)
+
+    @property
+    def nb_edges(self):
+        """The number of edges of this graph."""
+        return len(self.edges) // 3
+
+    def state_values(self, state):
+        """
+        Return the dictionary of state variable name -> string value of the
+        given state id.
+        """
+        return self._decode(self.variables, self.states, state)
+
+    def inputs_values(self, inputs):
+        """
+        Return the dictionary of input variable name -> string value of the
+        given inputs id, or None if inputs is None.
+        """
+        if inputs is None:
+            return None
+        return self._decode(self.inputs_variables, self.inputs, inputs)
+
+    def iter_edges(self):
+        """
+        Generate the edges of this graph as (source, inputs, target)
+        triples of ids, where inputs is None if the model has no input
+        variables.
+        """
+        edges = self.edges
+        for position in range(0, len(edges), 3):
+            inputs = edges[position + 1]
+            yield (edges[position], None if inputs < 0 else inputs,
+                   edges[position + 2])
+
+
+def _cofactors(manager, bdd):
+    """Return the then and else children of the top node of bdd."""
+    then = BDD(nsdd.bdd_dup(nsdd.bdd_then(manager._ptr, bdd._ptr)),
+               manager, freeit=True)
+    else_ = BDD(nsdd.bdd_dup(nsdd.bdd_else(manager._ptr, bdd._ptr)),
+                manager, freeit=True)
+    # Children of a complemented node are the ones of the regular node
+    if nsdd.bdd_iscomplement(manager._ptr, bdd._ptr):
+        return ~then, ~else_
+    else:
+        return then, else_
+
+def _cube_indices(manager, cube):
+    """Return the list of variable indices of cube, in order."""
+    indices = []
+    while not cube.is_true() and not cube.is_false():
+        indices.append(nsdd.bdd_index(manager._ptr, cube._ptr))
+        cube, _ = _cofactors(manager, cube)
+    return indices
+
+def _paths(manager, bdd):
+    """
+    Generate the paths of bdd to TRUE, as dictionaries of variable index ->
+    bit (0 or 1).
+    """
+    pending = [(bdd, {})]
+    while pending:
+        node, path = pending.pop()
+        if node.is_false():
+            continue
+        if node.is_true():
+            yield path
+            continue
+        index = nsdd.bdd_index(manager._ptr, node._ptr)
+        then, else_ = _cofactors(manager, node)
+        else_path = dict(path)
+        else_path[index] = 0
+        pending.append((else_, else_path))
+        path[index] = 1
+        pending.append((then, path))
+
+def _minterms(manager, bdd, indices):
+    """
+    Generate the assignments of bdd over indices, a list of distinct
+    variable indices including the support of bdd, as dictionaries of
+    variable index -> bit. Bits that do not matter in a path are expanded.
+    """
+    for path in _paths(manager, bdd):
+        free = [index for index in indices if index not in path]
+        for bits in itertools.product((0, 1), repeat=len(free)):
+            assignment = dict(path)
+            assignment.update(zip(free, bits))
+            yield assignment
+
+def _minterm(manager, assignment, indices):
+    """Return the BDD of the minterm of assignment over indices."""
+    result = BDD.true(manager)
+    for index in indices:
+        var = BDD(nsdd.bdd_new_var_with_index(manager._ptr, index),
+                  manager, freeit=True)
+        result = result & (var if assignment[index] else ~var)
+    return result
+
+
+def extract(fsm, state_labels=None, inputs_labels=None):
+    """
+    Return the ExplicitGraph of the reachable states of fsm and the
+    transitions between them.
+
+    fsm -- a BddFsm;
+    state_labels -- if not None, a dictionary of names -> BDDs; the
+                    state_labels attribute of the graph gives, for every
+                    name, the array of states included in the BDD;
+    inputs_labels -- if not None, a dictionary of names -> BDDs; the
+                     inputs_labels attribute of the graph gives, for every
+                     name, the array of inputs included in the BDD.
+    """
+    enc = fsm.bddEnc
+    manager = enc.DDmanager
+    reachable = fsm.reachable_states & enc.statesMask
+
+    current = _cube_indices(manager, enc.statesCube)
+    inputs = _cube_indices(manager, enc.inputsCube)
+    # The next state bit of every current state bit, in the same order;
+    # frozen variables are their own next variables
+    following = []
+    for index in current:
+        var = BDD(nsdd.bdd_new_var_with_index(manager._ptr, index),
+                  manager, freeit=True)
+        next_var = BDD(nsbddEnc.BddEnc_state_var_to_next_state_var(
+                           enc._ptr, var._ptr), manager, freeit=True)
+        following.append(nsdd.bdd_index(manager._ptr, next_var._ptr))
+
+    # States, by tuple of current bits
+    state_ids = {}
+    states = []
+    for assignment in _minterms(manager, reachable, current):
+        state_ids[tuple(assignment[index] for index in current)] = len(states)
+        states.append(State.from_bdd(_minterm(manager, assignment, current),
+                                     fsm).get_str_values())
+
+    # State variables include frozen ones
+    variables = set(enc.stateVars)
+    for values in states:
+        variables.update(values)
+    graph = ExplicitGraph(sorted(variables), sorted(enc.inputsVars))
+    for values in states:
+        graph.add_state(values)
+    del states
+
+    def states_of(bdd):
+        return array("l", (state_ids[tuple(assignment[index]
+                                           for index in current)]
+                           for assignment in _minterms(
+                               manager, bdd.forsome(enc.inputsCube) &
+                                        reachable, current)))
+
+    graph.initial = states_of(fsm.init)
+    for name, bdd in (state_labels or {}).items():
+        # A state belongs to a BDD over states and inputs if it does with
+        # all inputs
+        graph.state_labels[name] = states_of(bdd.forall(enc.inputsCube))
+
+    # Inputs, by tuple of input bits
+    inputs_ids = {}
+    def inputs_id(assignment):
+        bits = tuple(assignment[index] for index in inputs)
+        if bits not in inputs_ids:
+            values = Inputs.from_bdd(_minterm(manager, assignment, inputs),
+                                     fsm).get_str_values()
+            inputs_ids[bits] = graph.add_inputs(values)
+        return inputs_ids[bits]
+
+    # Edges, from the paths of the relation between reachable states,
+    # inputs and reachable next states
+    relation = (reachable & fsm.inputs_constraints & enc.inputsMask &
+                fsm.trans.monolithic &
+                BDD(nsbddEnc.BddEnc_state_var_to_next_state_var(
+                        enc._ptr, reachable._ptr), manager, freeit=True))
+    indices = list(dict.fromkeys(current + inputs + following))
+    for assignment in _minterms(manager, relation, indices):
+        source = state_ids[tuple(assignment[index] for index in current)]
+        target = state_ids[tuple(assignment[index] for index in following)]
+        graph.add_edge(source, inputs_id(assignment) if inputs else None,
+                       target)
+
+    for name, bdd in (inputs_labels or {}).items() if inputs else ():
+        # Inputs belong to a BDD over states and inputs if they do with all
+        # states
+        bdd = bdd.forall(enc.statesCube) & enc.inputsMask
+        graph.inputs_labels[name] = array("l", (
+            inputs_id(assignment)
+            for assignment in _minterms(manager, bdd, inputs)))
+
+    return graph
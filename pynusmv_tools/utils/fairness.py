@@ -0,0 +1,49 @@
+"""
+Fairness module memoizes the set of fair states of FSMs.
+
+Computing the fair states of an FSM requires a full (nested) fixpoint and
+evaluation functions call it whenever they encounter a temporal or epistemic
+operator. This module keeps the result of such computations, per FSM, per
+fairness constraints and per computing function, until reset is called.
+
+reset must be called whenever (and before) pynusmv.init.deinit_nusmv is
+called, since the cached BDDs and FSMs become invalid after that call.
+"""
+
+import functools
+
+__cache = {}
+__stats = {"hits": 0, "misses": 0}
+
+def reset():
+    """Forget all memoized fair states and reset the statistics."""
+    __cache.clear()
+    __stats["hits"] = 0
+    __stats["misses"] = 0
+
+def stats():
+    """
+    Return a dictionary with the number of hits and misses of the cache
+    since the last reset.
+    """
+    return dict(__stats)
+
+def memoize_fair_states(compute):
+    """
+    Decorate compute, a function taking an FSM as argument and returning
+    its fair states, such that the fair states of an FSM are computed only
+    once.
+
+    The result is keyed on compute, the FSM and its fairness constraints;
+    different ways of computing fair states thus never share their results.
+    """
+    @functools.wraps(compute)
+    def cached(fsm):
+        key = (compute, fsm, tuple(fsm.fairness_constraints))
+        if key in __cache:
+            __stats["hits"] += 1
+        else:
+            __stats["misses"] += 1
+            __cache[key] = compute(fsm)
+        return __cache[key]
+    return cached
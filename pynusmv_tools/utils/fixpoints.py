@@ -0,0 +1,135 @@
+"""
+Fixpoints module computes least fixpoints of the form
+
+    mu Z . base | (restrict & (image_1(Z) | ... | image_n(Z)))
+
+where every image distributes over union, such as pre- and post-images.
+This covers EU, EF and reachability computations.
+
+Three strategies are available:
+ - "full" computes the images of the whole accumulated set at every
+   iteration, as the textbook definition does;
+ - "frontier" computes the images of the states added by the previous
+   iteration only, since the images of the other ones are already part of
+   the result;
+ - "chaining" is "frontier" where the images are applied one after the other,
+   each of them taking into account the states found by the previous ones in
+   the same iteration; it only differs from "frontier" with several images
+   (e.g. a partitioned transition relation).
+All strategies give the same result. The strategy used by default is "full",
+the behaviour of the EU operators of arctl, fairctl, atlkFO and atlkPO before
+this module; it is set by set_strategy (the -fp option of atlk_po, atlk_fo
+and fairctl, the fixpoint command of the arctl shell). The EU operator of
+ctl, frontier-based before this module, always uses "frontier".
+
+Traces of computations can be recorded with tracing: every least fixpoint
+computed in the context records, for every iteration, the number of BDD nodes
+of the frontier (or of the whole set, with "full") and of the accumulated
+result.
+"""
+
+from contextlib import contextmanager
+
+from . import profiler
+
+STRATEGIES = ("full", "frontier", "chaining")
+
+__strategy = "full"
+__traces = None
+
+def set_strategy(strategy):
+    """
+    Set the strategy used by least_fixpoint when none is given.
+
+    strategy -- one of STRATEGIES.
+    """
+    global __strategy
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown fixpoint strategy: " + str(strategy) + ".")
+    __strategy = strategy
+
+def get_strategy():
+    """Return the strategy used by least_fixpoint when none is given."""
+    return __strategy
+
+@contextmanager
+def tracing():
+    """
+    Record the traces of the least fixpoints computed in the context.
+
+    Yield the list of traces, filled as fixpoints are computed. Every trace
+    is a dictionary with the name given to least_fixpoint, the strategy and
+    the list of iterations, each of them a (frontier nodes, result nodes)
+    pair.
+    """
+    global __traces
+    previous = __traces
+    __traces = []
+    try:
+        yield __traces
+    finally:
+        __traces = previous
+
+
+def least_fixpoint(base, images, restrict=None, strategy=None, name=None):
+    """
+    Return mu Z . base | (restrict & (image_1(Z) | ... | image_n(Z))).
+
+    base -- a BDD;
+    images -- a function or a list of functions from BDD to BDD, each of
+              them distributing over union;
+    restrict -- a BDD, or None for no restriction;
+    strategy -- one of STRATEGIES, or None for the default one;
+    name -- the name of the computation, recorded in traces.
+    """
+    if callable(images):
+        images = [images]
+    if strategy is None:
+        strategy = __strategy
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown fixpoint strategy: " + str(strategy) + ".")
+
+    iterations = None
+    if __traces is not None:
+        iterations = []
+        __traces.append({"name": name, "strategy": strategy,
+                         "iterations": iterations})
+
+    def step(states):
+        result = images[0](states)
+        for image in images[1:]:
+            result = result | image(states)
+        return result if restrict is None else result & restrict
+
+    if strategy == "full":
+        old = base
+        new = base | step(base)
+        while True:
+            profiler.iteration(new)
+            if iterations is not None:
+                iterations.append((old.size, new.size))
+            if old == new:
+                return new
+            old = new
+            new = base | step(old)
+
+    result = base
+    frontier = base
+    while frontier.isnot_false():
+        if strategy == "frontier":
+            frontier = step(frontier) & ~result
+            result = result | frontier
+        else:
+            new = None
+            for image in images:
+                added = image(frontier if new is None else frontier | new)
+                if restrict is not None:
+                    added = added & restrict
+                added = added & ~result
+                result = result | added
+                new = added if new is None else new | added
+            frontier = new
+        profiler.iteration(result)
+        if iterations is not None:
+            iterations.append((frontier.size, result.size))
+    return result
@@ -0,0 +1,61 @@
+"""
+Portfolio module solves independent bounded model checking problems, one per
+bound, concurrently, in a pool of processes.
+
+NuSMV is not shareable between processes: the pool is spawned, and every
+process loads the model once (with BMC support) before solving its first
+problem. Problems are dispatched in the order of the bounds and their results
+are returned in that order, such that the first violation found is the
+shortest one; closing the results terminates the pool, cancelling the
+problems of higher bounds, pending or running:
+
+    with closing(portfolio.solve(model, function, tasks, 4)) as results:
+        for task, result in zip(tasks, results):
+            if result is not None:
+                # the shortest violation
+                break
+
+Tasks and results travel between processes, they must be picklable (in
+particular, they cannot contain BDDs, Be expressions or traces).
+"""
+
+import multiprocessing
+
+from pynusmv.init import init_nusmv
+from pynusmv.glob import load_from_file
+from pynusmv.bmc.glob import go_bmc
+
+
+def _load(model):
+    """
+    Initialize NuSMV in a process of the pool and load the SMV model at path
+    model, with BMC support. NuSMV is left initialized for the lifetime of
+    the process.
+    """
+    init_nusmv()
+    load_from_file(model)
+    go_bmc()
+
+
+def solve(model, function, tasks, processes=None):
+    """
+    Generate the results of function(task), for every task of tasks, in
+    order, computed by a pool of processes which have loaded model.
+
+    The pool is terminated when all results have been generated or when the
+    generator is closed, whichever comes first.
+
+    model -- the path to the SMV model;
+    function -- a module-level function from a task to a picklable result;
+    tasks -- an iterable of picklable tasks;
+    processes -- the number of processes, or None for the number of CPUs.
+    """
+    # Spawned processes do not inherit the NuSMV instance of this one
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(processes, initializer=_load, initargs=(model,))
+    try:
+        for result in pool.imap(function, tasks):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
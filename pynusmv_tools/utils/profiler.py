@@ -0,0 +1,208 @@
+"""
+Profiler module records where model checking algorithms spend their time.
+
+Operators (e.g. eg, nk, ceu_si, filter_cew_moves) are decorated with
+profiled, and fixpoint loops report their iterations with iteration (or use
+the fixpoint function of this module, a drop-in replacement of
+pynusmv.utils.fixpoint). Nothing is recorded, and the overhead is a test per
+call, unless a profile is active:
+
+    with profiling() as profile:
+        evalATLK(fsm, spec)
+    profile.write_json("profile.json")
+    profile.write_stacks("profile.stacks")
+
+For every operator, the profile records the number of calls, the number of
+fixpoint iterations performed directly by the operator, the cumulative time
+(including the operators it calls, but counting recursive calls once), the
+maximal size of its intermediate and resulting BDDs and the maximal number
+of BDD nodes allocated in CUDD when it returns. The stack file contains one
+line per call stack, with the time spent in the top operator of the stack, in
+microseconds, as expected by flame graph tools (e.g. flamegraph.pl).
+
+A decorated generator function is profiled around each step of the
+generators it creates, not around their creation: the work done to produce
+an element is charged to the generator, whichever operator consumes it, and
+the call is counted once, at the first step.
+"""
+
+import json
+import time
+import inspect
+import functools
+from collections import Counter
+from contextlib import contextmanager
+
+from pynusmv.dd import BDD
+from pynusmv_lower_interface.nusmv.dd import dd as nsdd
+
+# The name of the operator of iterations outside any profiled operator
+TOPLEVEL = "<toplevel>"
+
+__profile = None
+
+
+class Profile(object):
+    """
+    The measures of the profiled operators called in a profiling context.
+    """
+
+    def __init__(self):
+        # operator name -> statistics of the operator
+        self.operators = {}
+        # call stack (tuple of names) -> time spent in its top operator
+        self.stacks = Counter()
+        # the current call stack, as a list of [name, start, children time]
+        self._frames = []
+
+    def _operator(self, name):
+        if name not in self.operators:
+            self.operators[name] = {"calls": 0, "iterations": 0, "time": 0.0,
+                                    "max_bdd_size": 0, "max_dd_nodes": 0}
+        return self.operators[name]
+
+    def _measure(self, operator, bdd):
+        if isinstance(bdd, BDD):
+            operator["max_bdd_size"] = max(operator["max_bdd_size"], bdd.size)
+            if bdd._manager is not None:
+                operator["max_dd_nodes"] = max(
+                    operator["max_dd_nodes"],
+                    nsdd.get_dd_nodes_allocated(bdd._manager._ptr))
+
+    def _enter(self, name):
+        self._frames.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, result, call=True):
+        name, start, children = self._frames.pop()
+        elapsed = time.perf_counter() - start
+        operator = self._operator(name)
+        if call:
+            operator["calls"] += 1
+        if all(frame[0] != name for frame in self._frames):
+            operator["time"] += elapsed
+        self._measure(operator, result)
+        stack = tuple(frame[0] for frame in self._frames) + (name,)
+        self.stacks[stack] += elapsed - children
+        if self._frames:
+            self._frames[-1][2] += elapsed
+
+    def _iteration(self, states):
+        name = self._frames[-1][0] if self._frames else TOPLEVEL
+        operator = self._operator(name)
+        operator["iterations"] += 1
+        self._measure(operator, states)
+
+    def stats(self):
+        """Return a dictionary of operator name -> statistics."""
+        return {name: dict(operator)
+                for name, operator in self.operators.items()}
+
+    def write_json(self, path):
+        """Write the statistics of the operators in the JSON file at path."""
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2, sort_keys=True)
+
+    def write_stacks(self, path):
+        """
+        Write the call stacks in the file at path, in the folded format of
+        flame graph tools: one "op1;op2;op3 microseconds" line per stack.
+        """
+        with open(path, "w") as f:
+            for stack, elapsed in sorted(self.stacks.items()):
+                f.write(";".join(stack) + " " +
+                        str(int(round(elapsed * 1e6))) + "\n")
+
+
+@contextmanager
+def profiling():
+    """
+    Profile the operators called in the context. Yield the Profile, filled
+    as operators are called.
+    """
+    global __profile
+    previous = __profile
+    __profile = Profile()
+    try:
+        yield __profile
+    finally:
+        __profile = previous
+
+def profiled(name):
+    """
+    Return a decorator recording the calls of a function as calls to the
+    operator called name, in the active profile, if any.
+    """
+    def decorator(function):
+        if inspect.isgeneratorfunction(function):
+            return _profiled_generator(name, function)
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = __profile
+            if profile is None:
+                return function(*args, **kwargs)
+            result = None
+            profile._enter(name)
+            try:
+                result = function(*args, **kwargs)
+                return result
+            finally:
+                profile._exit(result)
+        return wrapper
+    return decorator
+
+def _profiled_generator(name, function):
+    """
+    Return a generator function recording each step of the generators of
+    function as a call to the operator called name (see profiled).
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        generator = function(*args, **kwargs)
+        first = True
+        try:
+            while True:
+                profile = __profile
+                if profile is None:
+                    try:
+                        value = next(generator)
+                    except StopIteration:
+                        return
+                else:
+                    value = None
+                    profile._enter(name)
+                    try:
+                        value = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        profile._exit(value, call=first)
+                first = False
+                yield value
+        finally:
+            generator.close()
+    return wrapper
+
+def iteration(states):
+    """
+    Record a fixpoint iteration of the current operator, producing the
+    states BDD, in the active profile, if any.
+    """
+    if __profile is not None:
+        __profile._iteration(states)
+
+def fixpoint(funct, start):
+    """
+    Return the fixpoint of funct, as a BDD, starting with start BDD,
+    recording the iterations in the active profile, if any.
+
+    mu Z.f(Z) least fixpoint is implemented with fixpoint(funct, false).
+    nu Z.f(Z) greatest fixpoint is implemented with fixpoint(funct, true).
+    """
+    old = start
+    new = funct(start)
+    iteration(new)
+    while old != new:
+        old = new
+        new = funct(old)
+        iteration(new)
+    return old
@@ -0,0 +1,183 @@
+"""
+Results module provides an on-disk cache of model checking results.
+
+Results are stored in a directory, one file per entry, under a key computed
+from the content of the SMV model and everything else the result depends on
+(variables ordering, specification, algorithm, variant, semantics, etc.).
+Any change in the model thus gives a new key, and the old entries are
+eventually evicted: whenever the cache grows beyond its maximal size, the
+least recently used entries are removed.
+
+Entries are either JSON-serializable values (e.g. verdicts) or lists of
+BDDs, stored with the dump module.
+
+A cache directory can be shared by several processes: entries are written
+to temporary files then renamed, and an entry removed by another process
+in the meantime is simply missing. Temporary files count in the size of the
+cache, and the ones left behind by dead processes are eventually removed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+from . import dump
+
+# The default directory of the cache
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache",
+                                 "pynusmv_tools")
+# The default maximal size of the cache, in bytes
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+# The age, in seconds, after which a temporary file is considered as left
+# behind by a dead process
+TMP_LIFETIME = 60 * 60
+
+
+class ResultCache(object):
+    """
+    A persistent cache of results, stored in a directory.
+
+    directory -- the directory of the cache, created if needed;
+                 if None, DEFAULT_DIRECTORY is used;
+    max_size -- the maximal size of the cache, in bytes.
+    """
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE):
+        self.directory = (directory if directory is not None
+                          else DEFAULT_DIRECTORY)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, model, *parts):
+        """
+        Return the key for the given model and parts.
+
+        model -- the content of the SMV model (str or bytes);
+        parts -- any other strings the result depends on; None parts are
+                 allowed.
+        """
+        digest = hashlib.sha256()
+        if isinstance(model, str):
+            model = model.encode("UTF-8")
+        digest.update(model)
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(repr(part).encode("UTF-8"))
+        return digest.hexdigest()
+
+    def file_key(self, path, *parts):
+        """
+        Return the key for the model stored in the file at path and parts.
+        """
+        with open(path, "rb") as f:
+            return self.key(f.read(), *parts)
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+
+    def _read(self, path, mode):
+        try:
+            with open(path, mode) as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        # Mark the entry as recently used, unless it was evicted meanwhile
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return content
+
+    def _write(self, path, content, mode):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode) as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except:
+            _remove(tmp)
+            raise
+        self.evict()
+
+    def get(self, key):
+        """Return the value stored under key, or None if there is none."""
+        content = self._read(self._path(key, ".json"), "r")
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def put(self, key, value):
+        """
+        Store value under key.
+
+        value -- a JSON-serializable value.
+        """
+        self._write(self._path(key, ".json"), json.dumps(value), "w")
+
+    def get_bdds(self, key, fsm):
+        """
+        Return the list of BDDs stored under key, loaded in fsm,
+        or None if there is none.
+        """
+        content = self._read(self._path(key, ".bdd"), "rb")
+        if content is None:
+            return None
+        try:
+            return dump.loads(fsm, content)
+        except dump.BddDumpError:
+            return None
+
+    def put_bdds(self, key, fsm, bdds):
+        """
+        Store bdds, a list of BDDs of fsm, under key.
+        """
+        self._write(self._path(key, ".bdd"), dump.dumps(fsm, bdds), "wb")
+
+    def evict(self):
+        """
+        Remove the temporary files older than TMP_LIFETIME, then the least
+        recently used entries until the size of the cache is below its
+        maximal size. The temporary files being written count in the size.
+        Files removed by another process in the meantime are ignored.
+        """
+        entries = []
+        size = 0
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.endswith(".json") or name.endswith(".bdd"):
+                entries.append((stat.st_mtime, stat.st_size, path))
+                size += stat.st_size
+            elif name.endswith(".tmp"):
+                if now - stat.st_mtime > TMP_LIFETIME:
+                    _remove(path)
+                else:
+                    size += stat.st_size
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            _remove(path)
+            size -= entry_size
+
+    def clear(self):
+        """Remove all the entries of the cache."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") or name.endswith(".bdd"):
+                _remove(os.path.join(self.directory, name))
+
+
+def _remove(path):
+    """Remove the file at path, unless it was already removed."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
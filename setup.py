@@ -43,7 +43,9 @@ setup(name             = 'pynusmv-tools',
             # implementation)
             'bmc_ltl_li=pynusmv_tools.bmcLTL.bmc_ltl_li:main',
             # LTL BMC - not using apis from pynusmv.bmc.*
-            'bmc_ltl_py=pynusmv_tools.bmcLTL.bmc_ltl_py:main'
+            'bmc_ltl_py=pynusmv_tools.bmcLTL.bmc_ltl_py:main',
+            # Invariants proved by k-induction, on top of bmc_ltl_py
+            'bmc_kind_py=pynusmv_tools.bmcLTL.bmc_kind_py:main'
         ]
       },
       # TESTS
@@ -5,7 +5,9 @@ from pynusmv.init import init_nusmv, deinit_nusmv
 from pynusmv.mc import eval_simple_expression
 
 from pynusmv_tools.mas import glob
-from pynusmv_tools.atlkFO.eval import (evalATLK, cax, cag, cau, caw, fair_gamma_states)
+from pynusmv_tools.atlkFO.eval import (evalATLK, cax, cag, cau, caw, fair_gamma_states,
+                                       fair_states, eg)
+from pynusmv_tools.utils import fairness
 
 
 class TestEval(unittest.TestCase):
@@ -71,4 +73,21 @@ class TestEval(unittest.TestCase):
         
         self.assertFalse(s1 & pk & fsm.reachable_states <= cax(fsm, {"player"},
                                                                s2 & pk))
-        self.assertTrue(s1 & dk <= cax(fsm, {"dealer"}, s2 & dk))
\ No newline at end of file
+        self.assertTrue(s1 & dk <= cax(fsm, {"dealer"}, s2 & dk))
+        
+        
+    def test_fair_states_memoized(self):
+        fsm = self.cardgame_fair()
+        true = eval_simple_expression(fsm, "TRUE")
+        
+        stats = fairness.stats()
+        fair = fair_states(fsm)
+        self.assertEqual(fair, eg(fsm, true))
+        self.assertEqual(fairness.stats()["misses"], stats["misses"] + 1)
+        
+        self.assertEqual(fair_states(fsm), fair)
+        self.assertEqual(fairness.stats()["hits"], stats["hits"] + 1)
+        self.assertEqual(fairness.stats()["misses"], stats["misses"] + 1)
+        
+        glob.reset_globals()
+        self.assertEqual(fairness.stats(), {"hits": 0, "misses": 0})
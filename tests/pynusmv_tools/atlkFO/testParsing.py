@@ -97,4 +97,23 @@ class TestParsing(unittest.TestCase):
         self.assertEqual(ast.right.child.child.left.value, "c")
         self.assertTrue(isinstance(ast.right.child.child.right, EF))
         self.assertTrue(isinstance(ast.right.child.child.right.child, Atom))
-        self.assertEqual(ast.right.child.child.right.child.value, "k")
\ No newline at end of file
+        self.assertEqual(ast.right.child.child.right.child.value, "k")
+        
+    def test_shared_subformulas(self):
+        first = parseATLK("<'a','b'>F ('p' & K<'a'> 'q')")[0]
+        second = parseATLK("AG ('p' & K<'a'> 'q') | <'a','b'>F "
+                           "('p' & K<'a'> 'q')")[0]
+        
+        self.assertIs(second.left.child, first.child)
+        self.assertIs(second.right, first)
+        self.assertIsNot(parseATLK("<'a'>F ('p' & K<'a'> 'q')")[0], first)
+        self.assertEqual(len(first.subformulas() | second.subformulas()), 7)
+        
+    def test_keyword_arguments(self):
+        p = Atom("p")
+        self.assertIs(Not(child=p), Not(p))
+        self.assertIs(And(p, right=Atom("q")), And(p, Atom("q")))
+        with self.assertRaises(TypeError):
+            Not(node=p)
+        with self.assertRaises(TypeError):
+            TrueExp(value=p)
@@ -8,7 +8,11 @@ from pynusmv_lower_interface.nusmv.dd import dd as nsdd
 
 from pynusmv_tools.mas import glob
 
-from pynusmv_tools.atlkPO.check import check
+from pynusmv_tools.atlkPO.check import check, check_batch
+from pynusmv_tools.atlkPO import config
+from pynusmv_tools.atlkPO.evalGen import (eval_strat, eval_strat_parallel,
+                                          _settings)
+from pynusmv_tools.utils import fixpoints
 from pynusmv_tools.atlkFO.parsing import parseATLK
 
 
@@ -902,4 +906,78 @@ class TestCheck(unittest.TestCase):
         
         # False because the sender does not know if the bit is already
         # transmitted (and in this case, no strategy can avoid 'received')
-        self.assertFalse(check(fsm, parseATLK("<'sender'> G ~'received'")[0], implem="memory"))
\ No newline at end of file
+        self.assertFalse(check(fsm, parseATLK("<'sender'> G ~'received'")[0], implem="memory"))
+    
+    
+    def test_cardgame_batch(self):
+        fsm = self.cardgame()
+        
+        specs = [parseATLK(spec)[0] for spec in
+                 ["<'dealer'> X 'pcard=Ac'",
+                  "AG('step = 1' -> ~<'player'> X 'win')",
+                  "<'player'> F 'win'",
+                  "<'dealer'> X 'pcard=Ac'",
+                  "<'dealer'> X 'pcard=Ac' & ~<'player'> F 'win'"]]
+        results = check_batch(fsm, specs, implem="partial")
+        
+        self.assertEqual([spec for spec, _, _ in results], specs)
+        self.assertEqual([satisfied for _, satisfied, _ in results],
+                         [True, True, False, True, True])
+        self.assertFalse(config.partial.caching)
+    
+    def test_cardgame_batch_implementations(self):
+        fsm = self.cardgame()
+        
+        specs = [parseATLK(spec)[0] for spec in
+                 ["<'dealer'> X 'pcard=Ac'",
+                  "AG('step = 1' -> ~<'player'> X 'win')",
+                  "<'player'> F 'win'",
+                  "['player'] G ~'win' | <'player'> F 'win'",
+                  "<'dealer'> X 'pcard=Ac' & ~<'player'> F 'win'"]]
+        for implem in ["naive", "generator", "partial"]:
+            for semantics in ["group", "individual"]:
+                results = check_batch(fsm, specs, semantics=semantics,
+                                      implem=implem)
+                self.assertEqual([satisfied for _, satisfied, _ in results],
+                                 [check(fsm, spec, semantics=semantics,
+                                        implem=implem)
+                                  for spec in specs])
+    
+    def test_eval_strat_parallel(self):
+        cases = {"cardgame": ["<'player'> F 'win'", "<'dealer'> X 'pcard=Ac'",
+                              "<'dealer'> G ~'win'", "<'player'> X 'win'"],
+                 "transmission": ["<'sender'> F 'received'",
+                                  "<'transmitter'> G ~'received'",
+                                  "<'sender'> X 'received'"]}
+        for model, specs in cases.items():
+            fsm = getattr(self, model)()
+            for spec in specs:
+                spec = parseATLK(spec)[0]
+                for semantics in ["group", "individual"]:
+                    sequential = eval_strat(fsm, spec, semantics=semantics)
+                    config.parallel.model = ("tests/pynusmv_tools/atlkPO/"
+                                             "models/" + model + ".smv")
+                    config.parallel.processes = 2
+                    try:
+                        parallel = eval_strat_parallel(fsm, spec,
+                                                       semantics=semantics)
+                    finally:
+                        config.parallel.model = None
+                        config.parallel.processes = None
+                    self.assertEqual(parallel, sequential)
+            # The processes use the settings of this one
+            fsm.partitioned = True
+            fixpoints.set_strategy("frontier")
+            try:
+                settings = _settings(fsm)
+            finally:
+                fsm.partitioned = False
+                fixpoints.set_strategy("full")
+            self.assertTrue(settings["partitioned"])
+            self.assertFalse(settings["projection"])
+            self.assertEqual(settings["fixpoint"], "frontier")
+            self.assertIn("mas.images", settings["budgets"])
+            # Load the next model in a fresh NuSMV instance
+            glob.reset_globals()
+            deinit_nusmv()
+            init_nusmv()
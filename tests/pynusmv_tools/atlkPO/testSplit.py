@@ -10,6 +10,8 @@ from pynusmv_tools.mas import glob
 
 from pynusmv_tools.atlkPO.eval import split
 from pynusmv_tools.atlkPO.evalPartial import split as split_partial
+from pynusmv_tools.atlkPO.evalGen import (split as split_gen,
+                                         split_one, split_share)
 
 
 class TestSplit(unittest.TestCase):
@@ -201,4 +203,17 @@ class TestSplit(unittest.TestCase):
             strats.add(strat)
         self.assertEqual(nbstrats, 8)
         self.assertEqual(len(strats), nbstrats)
-        
\ No newline at end of file
+        
+        
+    def test_split_share_cardgame3(self):
+        fsm = self.cardgame3()
+        agents = {'player'}
+        protocol = fsm.protocol(agents)
+        
+        strats = set(split_gen(fsm, protocol, agents))
+        splits = list(split_one(fsm, protocol, agents))
+        for shares in range(1, 4):
+            shared = [set(split_share(fsm, splits[share::shares], agents))
+                      for share in range(shares)]
+            self.assertEqual(sum(len(share) for share in shared), len(strats))
+            self.assertSetEqual(set.union(*shared), strats)
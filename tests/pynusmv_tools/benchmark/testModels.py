@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+
+from pynusmv_tools.mas import glob
+
+from pynusmv_tools.atlk_irf import check
+from pynusmv_tools.atlkFO.parsing import parseATLK
+from pynusmv_tools.benchmark import models, specs
+from pynusmv_tools.utils import counters
+
+
+class TestModels(unittest.TestCase):
+
+    def setUp(self):
+        init_nusmv()
+
+    def tearDown(self):
+        glob.reset_globals()
+        deinit_nusmv()
+
+
+    def load(self, family, size):
+        fd, path = tempfile.mkstemp(suffix=".smv")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(models.FAMILIES[family](size))
+            glob.load_from_file(path)
+        finally:
+            os.remove(path)
+        fsm = glob.mas()
+        self.assertIsNotNone(fsm)
+        return fsm
+
+
+    def test_catalogue(self):
+        for family in sorted(models.FAMILIES):
+            fsm = self.load(family, 2)
+            for spec, expected in specs.specs(family, 2):
+                for implementation in ["naive", "symbolic"]:
+                    self.assertEqual(check(fsm, parseATLK(spec)[0],
+                                           implementation=implementation),
+                                     expected,
+                                     family + ": " + spec)
+            del fsm
+            glob.reset_globals()
+            deinit_nusmv()
+            init_nusmv()
+
+
+    def test_counters(self):
+        fsm = self.load("tree", 2)
+        counters.reset()
+        self.assertTrue(check(fsm, parseATLK("<'agent'> F 'node = 6'")[0]))
+        stats = counters.stats()
+        # The naive implementation filters every strategy once
+        self.assertGreater(stats["strategies"], 0)
+        self.assertEqual(stats["strategies"], stats["filterings"])
@@ -290,4 +290,54 @@ class TestCheck(TestCase):
             status,_,trace = check.check_ltl(formula, 10, no_invar=False)
             self.assertEqual("Ok", status)
             self.assertIsNone(trace)
-            
\ No newline at end of file
+
+    def test_check_ltl_incremental(self):
+        """
+        This tests that the incremental check finds the same violations, at
+        the same lengths, as the non incremental one.
+        """
+        cases = {"/example.smv"   : ["[](a <=> !b)", "[](a & b)",
+                                     "<>(a & b)", "() a", "()() a"],
+                 "/never_b.smv"   : ["a W b", "a U b", "b W !a"],
+                 "/philo.smv"     : ["(!<>[](p1.waiting)) & "
+                                     "(!<>[](p2.waiting))"],
+                 "/dummy_with_invar.smv": ["[] v"]}
+        for model, formulas in cases.items():
+            with tests.Configure(self, __file__, model):
+                for formula in formulas:
+                    for no_fairness in [False, True]:
+                        for no_invar in [False, True]:
+                            fml = parseLTL(formula)
+                            expected = check.check_ltl(fml, 5, no_fairness,
+                                                       no_invar)
+                            status, l, trace = check.check_ltl(
+                                                    fml, 5, no_fairness,
+                                                    no_invar,
+                                                    incremental=True)
+                            self.assertEqual(expected[0], status)
+                            self.assertEqual(expected[1], l)
+                            if trace is not None:
+                                self.assertEqual(len(expected[2]),
+                                                 len(trace))
+
+    def test_check_ltl_portfolio(self):
+        """
+        This tests that the concurrent check finds the shortest violations,
+        as the sequential one does.
+        """
+        cases = {"/example.smv"   : ["[](a <=> !b)", "<>(a & b)", "()() a"],
+                 "/never_b.smv"   : ["a U b", "b W !a"]}
+        for model, formulas in cases.items():
+            with tests.Configure(self, __file__, model):
+                path = tests.current_directory(__file__) + model
+                for formula in formulas:
+                    fml = parseLTL(formula)
+                    expected = check.check_ltl(fml, 5)
+                    status, l, trace = check.check_ltl(fml, 5, processes=2,
+                                                       model=path)
+                    self.assertEqual(expected[0], status)
+                    self.assertEqual(expected[1], l)
+                    self.assertEqual(expected[2] is None, trace is None)
+
+                with self.assertRaises(ValueError):
+                    check.check_ltl(parseLTL("a U b"), 5, processes=2)
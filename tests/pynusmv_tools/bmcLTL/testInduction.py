@@ -0,0 +1,71 @@
+'''
+This module validates the behavior of the k-induction prover defined in the
+module :mod:`pynusmv_tools.bmcLTL.induction`.
+'''
+
+from unittest             import TestCase
+from tests                import utils as tests
+
+from pynusmv_tools.bmcLTL.parsing import parseLTL
+from pynusmv_tools.bmcLTL         import induction # the tested module
+
+class TestInduction(TestCase):
+
+    def test_invariant_proposition(self):
+        formula = parseLTL("[](a <=> !b)")
+        self.assertEqual(formula.prop,
+                         induction.invariant_proposition(formula))
+
+        for text in ["<>(a <=> !b)", "a <=> !b", "[]() a", "[](a U b)"]:
+            with self.assertRaises(ValueError):
+                induction.invariant_proposition(parseLTL(text))
+
+    def test_proved(self):
+        with tests.Configure(self, __file__, "/example.smv"):
+            # inductive: preserved by every transition
+            formula            = parseLTL("[](a <=> !b)")
+            status,k,trace     = induction.check_invariant(formula, 10)
+            self.assertEqual("Proved", status)
+            self.assertEqual(0, k)
+            self.assertIsNone(trace)
+
+            # !a & !b is only reachable from a & b, which violates the
+            # invariant as well: it takes two steps to prove it
+            formula            = parseLTL("[](a | b)")
+            status,k,trace     = induction.check_invariant(formula, 10)
+            self.assertEqual("Proved", status)
+            self.assertEqual(1, k)
+            self.assertIsNone(trace)
+
+            # the induction is not long enough
+            status,k,trace     = induction.check_invariant(formula, 0)
+            self.assertEqual("Unknown", status)
+            self.assertEqual(0, k)
+            self.assertIsNone(trace)
+
+        with tests.Configure(self, __file__, "/never_b.smv"):
+            for text in ["[] a", "[] !b"]:
+                formula        = parseLTL(text)
+                status,k,trace = induction.check_invariant(formula, 10)
+                self.assertEqual("Proved", status)
+
+        with tests.Configure(self, __file__, "/numbers.smv"):
+            formula            = parseLTL("[](a < 7)")
+            status,k,trace     = induction.check_invariant(formula, 10)
+            self.assertEqual("Proved", status)
+
+    def test_violation(self):
+        with tests.Configure(self, __file__, "/example.smv"):
+            # already violated in the initial state
+            formula            = parseLTL("[](a & b)")
+            status,k,trace     = induction.check_invariant(formula, 10)
+            self.assertEqual("Violation", status)
+            self.assertEqual(0, k)
+            self.assertEqual(0, len(trace))
+
+            # flip --> flop
+            formula            = parseLTL("[] a")
+            status,k,trace     = induction.check_invariant(formula, 10)
+            self.assertEqual("Violation", status)
+            self.assertEqual(1, k)
+            self.assertEqual(1, len(trace))
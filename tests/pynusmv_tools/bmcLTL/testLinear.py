@@ -0,0 +1,76 @@
+'''
+This test module validates the behavior of the linear encoding of the bounded
+semantics of LTL as defined in :mod:`pynusmv_tools.bmcLTL.linear`
+'''
+from unittest                    import TestCase
+from tests                       import utils as tests
+
+from pynusmv.be.expression       import Be
+from pynusmv.sat                 import SatSolverFactory, Polarity,\
+    SatSolverResult
+
+from pynusmv_tools.bmcLTL        import ast, gen, linear
+from pynusmv_tools.bmcLTL.parsing import parseLTL
+
+class TestLinear(TestCase):
+
+    def satisfiable(self, problem):
+        cnf    = problem.to_cnf(Polarity.POSITIVE)
+        solver = SatSolverFactory.create()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        return solver.solve() == SatSolverResult.SATISFIABLE
+
+    def test_loop_variable(self):
+        with tests.Configure(self, __file__, "/example.smv"):
+            before = {str(v.name) for v in self.enc.curr_variables}
+            with linear.loop_variable(self.befsm) as loop_var:
+                during = {str(v.name) for v in self.enc.curr_variables}
+                self.assertNotIn(str(loop_var.name), before)
+                self.assertEqual(before | {str(loop_var.name)}, during)
+            after = {str(v.name) for v in self.enc.curr_variables}
+            self.assertEqual(before, after)
+
+    def test_no_loop(self):
+        with tests.Configure(self, __file__, "/example.smv"):
+            with linear.loop_variable(self.befsm) as loop_var:
+                encoding = linear.LinearEncoding(self.befsm, 0, loop_var)
+                self.assertEqual(Be.false(self.mgr), encoding.loop_exists())
+                self.assertEqual(Be.true(self.mgr),
+                                 encoding.loop_constraints())
+                # nothing exists after the bound without loop
+                a = ast.Proposition("a")
+                self.assertEqual(Be.false(self.mgr),
+                                 encoding.semantics(ast.Next(a), 0))
+                self.assertEqual(Be.false(self.mgr),
+                                 encoding.semantics(ast.Globally(a), 0))
+                self.assertEqual(a.semantic_no_loop(self.enc, 0, 0),
+                                 encoding.semantics(a, 0))
+
+    def test_same_problems(self):
+        """
+        This tests that the linear encoding finds a violation exactly when the
+        encoding of `Formula.bounded_semantics` does.
+        """
+        cases = {"/example.smv" : ["[](a <=> !b)", "[](a & b)", "<>(a & b)",
+                                   "() a", "()() a", "[]<> a", "<>[] a",
+                                   "a U b", "a W b", "!(a U b)"],
+                 "/never_b.smv" : ["a W b", "a U b", "b W !a", "<>[] a",
+                                   "[]<> b"],
+                 "/philo.smv"   : ["(!<>[](p1.waiting)) & "
+                                   "(!<>[](p2.waiting))"]}
+        for model, formulas in cases.items():
+            with tests.Configure(self, __file__, model):
+                with linear.loop_variable(self.befsm) as loop_var:
+                    for formula in formulas:
+                        fml = parseLTL(formula)
+                        for k in range(5):
+                            for no_fairness in [False, True]:
+                                loops = gen.generate_problem(fml, self.befsm,
+                                                             k, no_fairness)
+                                lin   = gen.generate_problem(fml, self.befsm,
+                                                             k, no_fairness,
+                                                             loop_var=loop_var)
+                                self.assertEqual(self.satisfiable(loops),
+                                                 self.satisfiable(lin),
+                                                 "{} ({})".format(formula, k))
@@ -654,7 +654,54 @@ class TestSemantics(TestCase):
             self.validate_bounded_semantics(1, "[](a <=> !b)", "G (a <-> !b)")
             self.validate_bounded_semantics(1, "(a U b)", "(a U b)")
             self.validate_bounded_semantics(1, "a => () b", "a -> (X b)")
-        
+
+    def test_encoding_cache(self):
+        with tests.Configure(self, __file__, "/example.smv"):
+            enc = self.enc
+            a   = ast.Proposition("a")
+            b   = ast.Proposition("b")
+
+            self.assertEqual(0, ast.And(a, b).horizon)
+            self.assertEqual(2, ast.Or(ast.Next(ast.Next(a)), b).horizon)
+            self.assertIsNone(ast.Next(ast.Eventually(a)).horizon)
+            self.assertIsNone(ast.Until(a, b).horizon)
+
+            with ast.encoding_cache() as cache:
+                # the values are shared between the bounds beyond the horizon
+                formula = ast.Next(ast.And(a, b))
+                at_2 = formula.semantic_no_loop(enc, 0, 2)
+                at_5 = formula.semantic_no_loop(enc, 0, 5)
+                self.assertEqual(at_2, at_5)
+                self.assertNotEqual(at_2, formula.semantic_no_loop(enc, 0, 0))
+                self.assertGreater(cache.hits, 0)
+
+                # and propositional values between the loops
+                formula = ast.And(a, b)
+                self.assertEqual(formula.semantic_no_loop(enc, 1, 3),
+                                 formula.semantic_with_loop(enc, 1, 3, 0))
+
+                stats = cache.stats()
+                self.assertEqual(len(cache), stats["entries"])
+                self.assertLessEqual(stats["nodes"], stats["entries"])
+
+                # the bounded semantics is the same with a shared cache
+                for k in range(4):
+                    self.validate_bounded_semantics(k, "a U () b", "a U X b")
+                    self.validate_bounded_semantics(k, "[]() (a & b)",
+                                                    "G X (a & b)")
+
+            # the context cache is not used outside of the context
+            self.assertIsNot(cache, ast.MEMOIZER)
+            cache.clear()
+            self.assertEqual(0, len(cache))
+
+            # bounded caches drop their least recently used entries
+            with ast.encoding_cache(ast.EncodingCache(max_entries=2)) as cache:
+                ast.Next(ast.Next(ast.Next(a))).semantic_no_loop(enc, 0, 5)
+                self.assertEqual(2, len(cache))
+                self.validate_bounded_semantics(3, "<>(a <=> !b)",
+                                                "F (a <-> !b)")
+
     def test_nnf_constant(self):
         with tests.Configure(self, __file__, "/example.smv"):
             formula = parseLTL("TRUE")
@@ -177,6 +177,21 @@ class TestDiagnosability(TestCase):
         res = diagnosability.verify_for_size_exactly_k(obs_names, obs_vars, (f1, f2), 3, theta, sigma_12, sigma_12)
         self.assertTrue(res.startswith("############### DIAGNOSABILITY VIOLATION"))
         
+    def test_verify_length(self):
+        for k in range(3):
+            res = diagnosability.verify_length((["mouse"],
+                                "status = active ; status = inactive",
+                                "TRUE", "TRUE", "TRUE", k))
+            self.assertIsNone(res)
+
+        self.assertIsNone(diagnosability.verify_length((["mouse"],
+                                "status = active ; status = highlight",
+                                "TRUE", "TRUE", "TRUE", 0)))
+        res = diagnosability.verify_length((["mouse"],
+                                "status = active ; status = highlight",
+                                "TRUE", "TRUE", "TRUE", 1))
+        self.assertTrue(res.startswith("############### DIAGNOSABILITY VIOLATION"))
+
     def test_mk_observable_vars(self):
         enc = master_be_fsm().encoding
         
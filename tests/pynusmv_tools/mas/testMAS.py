@@ -7,6 +7,7 @@ from pynusmv import model as md
 
 from pynusmv_tools.mas import glob
 from pynusmv_tools.mas.mas import Agent, Group
+from pynusmv_tools.utils import cache
 
 class TestMAS(unittest.TestCase):
     
@@ -153,8 +154,65 @@ class TestMAS(unittest.TestCase):
         
         self.assertEqual(fsm.equivalent_states(c1p, {"c1"}), c1p)
         self.assertEqual(fsm.equivalent_states(c1p, {"c2"}), true)
-        
-        
+
+        fsm.projection = True
+        self.assertEqual(fsm.equivalent_states(c1p, {"c1"}), c1p)
+        self.assertEqual(fsm.equivalent_states(c1p, {"c2"}), true)
+
+
+    def test_mas_projection(self):
+        glob.load_from_file("tests/pynusmv_tools/mas/cardgame.smv")
+        fsm = glob.mas(projection=True)
+        self.assertTrue(fsm.projection)
+
+
+    def test_equivalent_states_projection(self):
+        fsm = self.cardgame()
+
+        for agents in [{"player"}, {"dealer"}, {"player", "dealer"}]:
+            for state in fsm.pick_all_states(fsm.reachable_states):
+                fsm.projection = False
+                image = fsm.equivalent_states(state, agents)
+                fsm.projection = True
+                projection = fsm.equivalent_states(state, agents)
+                self.assertEqual(image, projection)
+                fsm.projection = False
+                fsm.partitioned = True
+                partitioned = fsm.equivalent_states(state, agents)
+                fsm.partitioned = False
+                self.assertEqual(image, partitioned)
+
+
+    def test_equivalence_classes(self):
+        fsm = self.cardgame()
+
+        false = BDD.false(fsm.bddEnc.DDmanager)
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+
+        for agents in [{"player"}, {"dealer"}, {"player", "dealer"}]:
+            classes = fsm.equivalence_classes(agents)
+            # The classes partition the reachable states
+            union = false
+            for eqclass in classes.values():
+                self.assertTrue((union & eqclass).is_false())
+                union |= eqclass
+            self.assertEqual(union, fsm.reachable_states)
+            # The partition is computed once
+            self.assertIs(fsm.equivalence_classes(agents), classes)
+
+            for states in [fsm.init, pa & fsm.reachable_states,
+                           fsm.reachable_states]:
+                self.assertEqual(fsm.equivalence_class(states, agents),
+                                 fsm.equivalent_states(states, agents) &
+                                 fsm.reachable_states)
+                generated = list(fsm.iter_equivalence_classes(states,
+                                                              agents))
+                for eqclass in generated:
+                    self.assertIn(eqclass, classes.values())
+                    self.assertTrue((eqclass & states).isnot_false())
+                self.assertEqual(len(generated), len(set(generated)))
+
+
     def test_reachable_states_for_simple_model(self):
         glob.load_from_file("tests/pynusmv_tools/ctlk/agents.smv")
         fsm = glob.mas()
@@ -375,6 +433,56 @@ class TestMAS(unittest.TestCase):
         self.assertTrue(fsm.init & daqa & fsm.bddEnc.statesInputsMask <= fsm.pre_strat_si(s1 & pq & da, {'dealer'}))
         
         
+    def test_image_cache(self):
+        fsm = self.premod()
+        
+        p = eval_simple_expression(fsm, "a.p = 1")
+        q = eval_simple_expression(fsm, "b.q = 1")
+        pa = eval_simple_expression(fsm, "a.a = 1")
+        
+        images = cache.stats()["mas.images"]
+        first = fsm.pre_strat_si(~p & q, {'a'}, pa)
+        second = fsm.pre_strat_si(~p & q, {'a'}, pa)
+        stats = cache.stats()["mas.images"]
+        self.assertEqual(first, second)
+        self.assertEqual(stats["hits"], images["hits"] + 1)
+        
+        # Other agents or strategies are different images
+        self.assertEqual(fsm.pre_strat_si(~p & q, {'a'}),
+                         (~p & q) | (p & ~q & ~pa))
+        self.assertEqual(cache.stats()["mas.images"]["hits"], stats["hits"])
+        
+        fsm.image_caching = False
+        self.assertEqual(fsm.pre_strat_si(~p & q, {'a'}, pa), first)
+        self.assertEqual(fsm.pre(q), fsm.pre(q))
+        self.assertEqual(cache.stats()["mas.images"]["hits"], stats["hits"])
+        
+        
+    def test_partitioned(self):
+        for model in [self.cardgame, self.premod]:
+            fsm = model()
+            fsm.image_caching = False
+            true = BDD.true(fsm.bddEnc.DDmanager)
+            sets = [true, fsm.init, fsm.reachable_states,
+                    fsm.post(fsm.init)]
+            for agents in [set(), {next(iter(fsm.agents))}, fsm.agents]:
+                expected = [(fsm.pre_strat(states, agents),
+                             fsm.pre_strat_si(states, agents),
+                             fsm.pre_nstrat(states, agents))
+                            for states in sets]
+                fsm.partitioned = True
+                results = [(fsm.pre_strat(states, agents),
+                            fsm.pre_strat_si(states, agents),
+                            fsm.pre_nstrat(states, agents))
+                           for states in sets]
+                fsm.partitioned = False
+                self.assertEqual(results, expected)
+            del fsm, sets, expected, results, true
+            glob.reset_globals()
+            deinit_nusmv()
+            init_nusmv()
+        
+        
     def test_premod_pre_strat_si(self):
         fsm = self.premod()
         
@@ -7,7 +7,8 @@ from pynusmv.mc import eval_simple_expression
 from pynusmv_tools.mucalculus import model
 from pynusmv_tools.mucalculus.formula import (MTrue, MFalse, Variable,
                                           Atom, Not, And, Or,
-                                          Diamond, Box, Mu, Nu)
+                                          Diamond, Box, Mu, Nu, EvalCache)
+from pynusmv_tools.benchmark.nested import fair, chain
 
 
 class TestEval(unittest.TestCase):
@@ -146,4 +147,49 @@ class TestEval(unittest.TestCase):
         # nu Z. ~win & pre(Z)
         NW = Nu(Variable("Z"),
                 And(Not(Atom("win")), Diamond(Variable("Z"))))
-        self.assertTrue(NW.eval(fsm) <= ~win)
\ No newline at end of file
+        self.assertTrue(NW.eval(fsm) <= ~win)
+    
+    
+    def test_eval_cache(self):
+        fsm = self.cardgame()
+        win = eval_simple_expression(fsm, "win")
+        
+        # The closed sub-formula win is evaluated once for all iterations
+        cache = EvalCache("test")
+        R = Mu(Variable("Z"), Or(Atom("win"), Diamond(Variable("Z"))))
+        self.assertEqual(R.free_variables, frozenset())
+        self.assertEqual(R.child.free_variables, {Variable("Z")})
+        reach = R.eval(fsm, cache=cache)
+        self.assertTrue(win <= reach)
+        self.assertEqual(cache.formula_stats()[Atom("win")][1], 1)
+        self.assertGreater(cache.formula_stats()[Atom("win")][0], 0)
+        self.assertEqual(R.eval(fsm, cache=cache), reach)
+        self.assertEqual(cache.formula_stats()[R], (1, 1))
+        
+        # Bounded caches give the same results
+        bounded = EvalCache("test", max_entries=1)
+        self.assertEqual(R.eval(fsm, cache=bounded), reach)
+        self.assertEqual(len(bounded), 1)
+        self.assertGreater(bounded.evictions, 0)
+        
+        model.reset_globals()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.formula_stats(), {})
+    
+    
+    def test_warm_start(self):
+        fsm = self.cardgame()
+        
+        Z = Variable("Z")
+        self.assertEqual(And(Z, Not(Diamond(Z))).signed_free_variables,
+                         {(Z, True), (Z, False)})
+        
+        # fair alternates, chain nests least fixpoints only
+        for formula in [fair(["win", "lose"]), chain(["step = 1", "win"])]:
+            cold = EvalCache("test", warm_start=False)
+            warm = EvalCache("test")
+            self.assertEqual(formula.eval(fsm, cache=warm),
+                             formula.eval(fsm, cache=cold))
+            self.assertEqual(cold.warm_starts, 0)
+        self.assertGreater(warm.warm_starts, 0)
+        self.assertLessEqual(warm.misses, cold.misses)
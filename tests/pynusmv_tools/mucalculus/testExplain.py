@@ -12,7 +12,8 @@ from pynusmv_tools.mucalculus.formula import (MTrue, MFalse, Variable,
                                           Atom, Not, And, Or,
                                           Diamond, Box, Mu, Nu,
                                           alias, SPOI, POI, POD)
-from pynusmv_tools.mucalculus import CannotExplainFalseError, hashabledict
+from pynusmv_tools.mucalculus import (CannotExplainFalseError, hashabledict,
+                                     ExplanationBudgetError)
 from pynusmv_tools.mucalculus.explanation import Obligation
 from pynusmv_tools.mucalculus.graph import domaintuple
 
@@ -533,4 +534,47 @@ class TestExplain(unittest.TestCase):
         expr = EG(Not(Atom("win")))
         state = fsm.pick_one_state(expr.eval(fsm) & fsm.init)
         expl = expr.explain(fsm, state)
-        self.assertIsNotNone(expl.dot())
\ No newline at end of file
+        self.assertIsNotNone(expl.dot())
+    
+    def test_lazy_explain(self):
+        fsm = self.cardgame()
+        
+        @alias("EX {child}")
+        def EX(child):
+            return POD(Diamond(child))
+        
+        @alias("EG {inv}")
+        def EG(inv):
+            return POI(Nu(Variable("Z"),
+                       And(POI(inv), EX(Variable("Z")))))
+        
+        # Without points of decision, the walked explanation is the eager one
+        expr = Mu(Variable("Z"), Or(Atom("win"), Diamond(Variable("Z"))))
+        state = fsm.pick_one_state(expr.eval(fsm) & fsm.init)
+        expl = expr.explain(fsm, state)
+        lazy = expr.lazy_explain(fsm, state)
+        self.assertEqual(lazy.explored, 0)
+        self.assertEqual(lazy.initial, expl.initial)
+        self.assertEqual(set(lazy.walk()), set(expl.graph.nodes))
+        self.assertEqual(lazy.graph, expl.untranslated)
+        self.assertEqual(lazy.explanation().graph, expl.graph)
+        self.assertEqual(lazy.explored, len(expl.graph.nodes))
+        
+        # Nothing is explored beyond the budget
+        lazy = expr.lazy_explain(fsm, state, budget=2)
+        with self.assertRaises(ExplanationBudgetError):
+            for node in lazy.walk():
+                pass
+        self.assertEqual(lazy.explored, 2)
+        
+        # Points of decision are unexplained until expanded
+        expr = EG(Not(Atom("win")))
+        state = fsm.pick_one_state(expr.eval(fsm) & fsm.init)
+        expl = expr.explain(fsm, state)
+        lazy = expr.lazy_explain(fsm, state)
+        self.assertEqual(set(lazy.walk()), set(expl.untranslated.nodes))
+        self.assertEqual(lazy.unexplained, expl.unexplained)
+        node = next(iter(lazy.unexplained))
+        self.assertTrue(len(lazy.expand(node)) > 0)
+        self.assertNotIn(node, lazy.unexplained)
+        self.assertIsNotNone(lazy.explanation().dot())
@@ -1,7 +1,7 @@
 import unittest
 
 
-from pynusmv_tools.mucalculus.graph import Graph, domaintuple
+from pynusmv_tools.mucalculus.graph import Graph, GraphBuilder, domaintuple
 
 
 class TestGraph(unittest.TestCase):
@@ -31,6 +31,26 @@ class TestGraph(unittest.TestCase):
                       p: frozenset(),
                       q: frozenset()})
     
+    def test_domaintuple(self):
+        s1 = domaintuple(state="s1", act=None)
+        self.assertIs(s1, domaintuple({"state": "s1"}))
+        self.assertIs(s1, domaintuple(s1))
+        self.assertEqual(s1, {"state": "s1"})
+        self.assertEqual(s1["state"], "s1")
+        self.assertEqual(s1.state, "s1")
+        self.assertIsNone(s1["act"])
+        self.assertIsNone(s1.act)
+        self.assertEqual(s1.get("act", "stay"), "stay")
+        self.assertEqual(set(s1.keys()), {"state"})
+        self.assertEqual(dict(s1.items()), {"state": "s1"})
+        
+        a = domaintuple(state="s1", act="stay")
+        b = domaintuple(act="stay", state="s1")
+        self.assertIs(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotEqual(a, s1)
+        self.assertEqual(len(a), 2)
+    
     def test_union(self):
         states1 = self.state_graph1()
         states2 = self.state_graph2()
@@ -59,6 +79,47 @@ class TestGraph(unittest.TestCase):
                                 s3: frozenset({(run, s1),
                                                (stay, s3)})}))
     
+    def test_union_sharing(self):
+        states1 = self.state_graph1()
+        states2 = self.state_graph2()
+        empty = Graph({})
+        
+        self.assertIs(states1.union(empty), states1)
+        self.assertIs(empty.union(states1), states1)
+        s3 = domaintuple(state="s3")
+        self.assertIs(states1.union(states2)[s3], states2[s3])
+    
+    def test_builder(self):
+        s1 = domaintuple(state="s1")
+        s2 = domaintuple(state="s2")
+        s3 = domaintuple(state="s3")
+        stay = domaintuple(act="stay")
+        run = domaintuple(act="run")
+        
+        builder = GraphBuilder(self.state_graph1())
+        builder.add_edge(s2, run, s3)
+        builder.add_node(s1)
+        self.assertIn(s3, builder)
+        self.assertEqual(builder[s3], set())
+        builder.update(self.state_graph2())
+        graph = builder.build()
+        self.assertTrue(graph.check())
+        self.assertEqual(graph,
+                         self.state_graph1().union(self.state_graph2())
+                         .union(Graph({s2: frozenset({(run, s3)}),
+                                       s3: frozenset()})))
+        
+        self.assertEqual(GraphBuilder().build(), Graph({}))
+    
+    def test_check(self):
+        s1 = domaintuple(state="s1")
+        s2 = domaintuple(state="s2")
+        stay = domaintuple(act="stay")
+        # Invalid graphs can be built, but are not valid
+        graph = Graph({s1: frozenset({(stay, s2)})})
+        self.assertFalse(graph.check())
+        self.assertTrue(self.state_graph1().check())
+    
     def test_intersection(self):
         states1 = self.state_graph1()
         states2 = self.state_graph2()
@@ -0,0 +1,119 @@
+import gc
+import unittest
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv.mc import eval_simple_expression
+
+from pynusmv_tools.mas import glob
+from pynusmv_tools.utils import cache as caches
+from pynusmv_tools.utils.cache import BddCache, bdd_size, key_size
+
+class TestCache(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        glob.reset_globals()
+        deinit_nusmv()
+        
+    def cardgame(self):
+        glob.load_from_file("tests/pynusmv_tools/mas/cardgame.smv")
+        fsm = glob.mas()
+        self.assertIsNotNone(fsm)
+        return fsm
+        
+    
+    def test_get_put(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        dk = eval_simple_expression(fsm, "dcard = K")
+        
+        cache = BddCache("test")
+        self.assertIsNone(cache.get("pa"))
+        cache.put("pa", pa)
+        cache.put("both", (pa, dk))
+        self.assertEqual(cache.get("pa"), pa)
+        self.assertEqual(cache.get("both"), (pa, dk))
+        self.assertEqual(cache.nodes, pa.size * 2 + dk.size)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+        
+        glob.reset_globals()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nodes, 0)
+        
+    
+    def test_lru_eviction(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        pk = eval_simple_expression(fsm, "pcard = K")
+        pq = eval_simple_expression(fsm, "pcard = Q")
+        
+        cache = BddCache("test", budget=bdd_size((pa, pk, pq)) - 1)
+        cache.put("pa", pa)
+        cache.put("pk", pk)
+        # pa is now the most recently used entry
+        cache.get("pa")
+        cache.put("pq", pq)
+        
+        self.assertIn("pa", cache)
+        self.assertNotIn("pk", cache)
+        self.assertIn("pq", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertTrue(cache.nodes <= cache.budget)
+        
+        # The new entry is kept even if it exceeds the budget
+        cache.budget = 0
+        cache.put("pk", pk)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("pk", cache)
+        
+    
+    def test_max_entries(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        pk = eval_simple_expression(fsm, "pcard = K")
+        
+        cache = BddCache("test", max_entries=1)
+        cache.put("pa", pa)
+        cache.put("pk", pk)
+        self.assertNotIn("pa", cache)
+        self.assertIn("pk", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.nodes, pk.size)
+        
+    
+    def test_key_size(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        dk = eval_simple_expression(fsm, "dcard = K")
+        
+        self.assertEqual(key_size("pa"), 0)
+        self.assertEqual(key_size((fsm, "pre", pa, None)), pa.size)
+        self.assertEqual(key_size((pa, (dk, "dk"))), pa.size + dk.size)
+        
+        # the BDDs of the keys count against the budget
+        cache = BddCache("test")
+        cache.put((fsm, "pre", pa), dk)
+        self.assertEqual(cache.nodes, pa.size + dk.size)
+        
+    
+    def test_registry(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        
+        cache = BddCache("test.registry")
+        cache.put("pa", pa)
+        self.assertIn("test.registry", caches.stats())
+        
+        # Caches are only registered while they are alive
+        del cache
+        gc.collect()
+        self.assertNotIn("test.registry", caches.stats())
+    
+    def test_budgets(self):
+        cache = BddCache("test.budgets", budget=10)
+        self.assertEqual(caches.budgets()["test.budgets"], 10)
+        caches.set_budget(20, prefix="test.budgets")
+        self.assertEqual(caches.budgets()["test.budgets"], 20)
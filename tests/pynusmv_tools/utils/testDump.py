@@ -0,0 +1,105 @@
+import io
+import os
+import tempfile
+import unittest
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv.fsm import BddFsm
+from pynusmv.mc import eval_simple_expression
+
+from pynusmv_tools.mas import glob
+from pynusmv_tools.utils.dump import (dumps, loads, dump, load, write, read,
+                                     BddDumpError)
+
+class TestDump(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        glob.reset_globals()
+        deinit_nusmv()
+        
+    def cardgame(self):
+        glob.load_from_file("tests/pynusmv_tools/mas/cardgame.smv")
+        fsm = glob.mas()
+        self.assertIsNotNone(fsm)
+        return fsm
+        
+    
+    def test_dumps_loads(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        dk = eval_simple_expression(fsm, "dcard = K")
+        true = eval_simple_expression(fsm, "TRUE")
+        false = eval_simple_expression(fsm, "FALSE")
+        
+        bdds = [pa, ~pa | dk, fsm.reachable_states, fsm.protocol({"player"}),
+                true, false]
+        self.assertEqual(loads(fsm, dumps(fsm, bdds)), bdds)
+        
+    
+    def test_deep(self):
+        # A BDD deeper than the recursion limit
+        names = ["v" + str(i) for i in range(1500)]
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "deep.smv")
+        try:
+            with open(path, "w") as f:
+                f.write("MODULE main\nVAR\n")
+                for name in names:
+                    f.write("    " + name + " : boolean;\n")
+            fsm = BddFsm.from_filename(path)
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
+        
+        conjunction = eval_simple_expression(fsm, "TRUE")
+        for name in names:
+            conjunction &= eval_simple_expression(fsm, name)
+        self.assertEqual(loads(fsm, dumps(fsm, [conjunction])),
+                         [conjunction])
+        
+    
+    def test_write_read(self):
+        fsm = self.cardgame()
+        pa = eval_simple_expression(fsm, "pcard = Ac")
+        
+        # Dumps are read sequentially, one after the other
+        f = io.BytesIO()
+        write(fsm, [fsm.reachable_states, pa], f)
+        write(fsm, [fsm.init], f)
+        f.seek(0)
+        self.assertEqual(read(fsm, f), [fsm.reachable_states, pa])
+        self.assertEqual(read(fsm, f), [fsm.init])
+        self.assertEqual(f.read(), b"")
+        
+    
+    def test_dump_load_across_runs(self):
+        fsm = self.cardgame()
+        reach = fsm.reachable_states
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            dump(fsm, [reach, reach & fsm.init], path)
+            del fsm, reach
+            
+            glob.reset_globals()
+            deinit_nusmv()
+            init_nusmv()
+            
+            fsm = self.cardgame()
+            reach, init = load(fsm, path)
+            self.assertEqual(reach, fsm.reachable_states)
+            self.assertEqual(init, fsm.init & fsm.reachable_states)
+        finally:
+            os.remove(path)
+        
+    
+    def test_malformed(self):
+        fsm = self.cardgame()
+        data = dumps(fsm, [fsm.init])
+        with self.assertRaises(BddDumpError):
+            loads(fsm, b"NOTADUMP" + data[8:])
+        with self.assertRaises(BddDumpError):
+            loads(fsm, data[:-2])
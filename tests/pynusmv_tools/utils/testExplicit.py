@@ -0,0 +1,69 @@
+import unittest
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv import glob
+
+from pynusmv_tools.utils.explicit import extract
+from pynusmv_tools.compare import states_transitions
+
+class TestExplicit(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        deinit_nusmv()
+        
+    def cardgame(self):
+        glob.load_from_file("tests/pynusmv_tools/mas/cardgame.smv")
+        glob.compute_model()
+        fsm = glob.prop_database().master.bddFsm
+        self.assertIsNotNone(fsm)
+        return fsm
+        
+    
+    def test_extract(self):
+        fsm = self.cardgame()
+        graph = extract(fsm, state_labels={"init": fsm.init},
+                        inputs_labels={"all": fsm.bddEnc.inputsMask})
+        
+        # States are the reachable ones, each of them once
+        states = fsm.pick_all_states(fsm.reachable_states)
+        values = [frozenset(graph.state_values(s).items())
+                  for s in range(graph.nb_states)]
+        self.assertEqual(len(values), len(states))
+        self.assertEqual(set(values),
+                         {frozenset(s.get_str_values().items())
+                          for s in states})
+        
+        # Values are encoded by their position in the value dictionary
+        for s in range(graph.nb_states):
+            row = graph.states[s * len(graph.variables):
+                               (s + 1) * len(graph.variables)]
+            self.assertEqual(graph.state_values(s),
+                             {var: graph.values[var][value]
+                              for var, value in zip(graph.variables, row)})
+        
+        # Initial states
+        self.assertEqual({values[s] for s in graph.initial},
+                         {frozenset(s.get_str_values().items())
+                          for s in fsm.pick_all_states(fsm.init)})
+        self.assertEqual(set(graph.initial), set(graph.state_labels["init"]))
+        self.assertEqual(len(graph.inputs_labels["all"]), graph.nb_inputs)
+        
+        # Edges are the transitions between reachable states
+        expected = set()
+        for s1 in states:
+            for s2 in fsm.pick_all_states(fsm.post(s1)):
+                for i in fsm.pick_all_inputs(
+                                      fsm.get_inputs_between_states(s1, s2)):
+                    expected.add((frozenset(s1.get_str_values().items()),
+                                  frozenset(i.get_str_values().items()),
+                                  frozenset(s2.get_str_values().items())))
+        edges = {(values[s1], frozenset(graph.inputs_values(i).items()),
+                  values[s2])
+                 for s1, i, s2 in graph.iter_edges()}
+        self.assertEqual(edges, expected)
+        self.assertEqual(graph.nb_edges, len(expected))
+        
+        self.assertEqual(states_transitions(fsm), (set(values), expected))
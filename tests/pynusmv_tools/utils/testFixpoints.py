@@ -0,0 +1,91 @@
+import unittest
+
+from pynusmv.fsm import BddFsm
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv.parser import parse_simple_expression as parseSexp
+from pynusmv import prop
+
+from pynusmv_tools.ctl.eval import eval_ctl
+from pynusmv_tools.fairctl.eval import eval_ctl as eval_fairctl
+from pynusmv_tools.utils import fixpoints, fairness
+
+
+class TestFixpoints(unittest.TestCase):
+
+    def setUp(self):
+        init_nusmv()
+
+    def tearDown(self):
+        fixpoints.set_strategy("full")
+        fairness.reset()
+        deinit_nusmv()
+
+
+    def model(self):
+        fsm = BddFsm.from_filename("tests/pynusmv_tools/ctl/admin.smv")
+        self.assertIsNotNone(fsm)
+        return fsm
+
+
+    def test_strategies(self):
+        fsm = self.model()
+        init = fsm.init
+        post = lambda states: fsm.post(states)
+        pre = lambda states: fsm.pre(states)
+
+        results = [fixpoints.least_fixpoint(init, post, strategy=strategy)
+                   for strategy in fixpoints.STRATEGIES]
+        for result in results:
+            self.assertEqual(result, fsm.reachable_states)
+
+        results = [fixpoints.least_fixpoint(init, [post, pre],
+                                            restrict=fsm.reachable_states,
+                                            strategy=strategy)
+                   for strategy in fixpoints.STRATEGIES]
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+
+    def test_eu(self):
+        fsm = self.model()
+        spec = prop.Spec(parseSexp("admin = none"))
+        ef = prop.ef(spec)
+        results = []
+        for strategy in fixpoints.STRATEGIES:
+            fixpoints.set_strategy(strategy)
+            results.append(eval_fairctl(fsm, ef))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+
+    def test_ctl_eu(self):
+        # The EU of ctl stays frontier-based, whatever the default strategy
+        fsm = self.model()
+        spec = prop.Spec(parseSexp("admin = none"))
+        with fixpoints.tracing() as traces:
+            eval_ctl(fsm, prop.ef(spec))
+        self.assertEqual([trace["strategy"] for trace in traces
+                          if trace["name"] == "ctl.eu"], ["frontier"])
+
+
+    def test_tracing(self):
+        fsm = self.model()
+        with fixpoints.tracing() as traces:
+            fixpoints.least_fixpoint(fsm.init, fsm.post, name="reachable",
+                                     strategy="frontier")
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0]["name"], "reachable")
+        self.assertEqual(traces[0]["strategy"], "frontier")
+        self.assertGreater(len(traces[0]["iterations"]), 0)
+        # The last frontier is empty
+        self.assertEqual(traces[0]["iterations"][-1][0], 1)
+
+
+    def test_default_strategy(self):
+        # Evaluators keep their textbook fixpoints unless asked otherwise
+        self.assertEqual(fixpoints.get_strategy(), "full")
+
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            fixpoints.set_strategy("unknown")
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+from pynusmv.fsm import BddFsm
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv.parser import parse_simple_expression as parseSexp
+from pynusmv import prop
+
+from pynusmv_tools.ctl.eval import eval_ctl
+from pynusmv_tools.utils import profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        init_nusmv()
+
+    def tearDown(self):
+        deinit_nusmv()
+
+
+    def model(self):
+        fsm = BddFsm.from_filename("tests/pynusmv_tools/ctl/admin.smv")
+        self.assertIsNotNone(fsm)
+        return fsm
+
+
+    def test_operators(self):
+        fsm = self.model()
+        spec = prop.ag(prop.ef(prop.Spec(parseSexp("admin = none"))))
+        with profiler.profiling() as profile:
+            eval_ctl(fsm, spec)
+        stats = profile.stats()
+        self.assertIn("eu", stats)
+        self.assertIn("ex", stats)
+        self.assertGreater(stats["eu"]["calls"], 0)
+        self.assertGreater(stats["eu"]["iterations"], 0)
+        self.assertGreater(stats["eu"]["max_bdd_size"], 0)
+        self.assertGreater(stats["eu"]["max_dd_nodes"], 0)
+        # ex is called by eu
+        self.assertIn(("eu", "ex"), profile.stacks)
+
+
+    def test_inactive(self):
+        fsm = self.model()
+        spec = prop.ef(prop.Spec(parseSexp("admin = none")))
+        with profiler.profiling() as profile:
+            pass
+        eval_ctl(fsm, spec)
+        self.assertEqual(profile.stats(), {})
+
+
+    def test_fixpoint(self):
+        fsm = self.model()
+        with profiler.profiling() as profile:
+            reachable = profiler.fixpoint(lambda Z: fsm.init | fsm.post(Z),
+                                          fsm.init & ~fsm.init)
+        self.assertEqual(reachable, fsm.reachable_states)
+        self.assertGreater(profile.stats()[profiler.TOPLEVEL]["iterations"],
+                           0)
+
+
+    def test_generator(self):
+        fsm = self.model()
+
+        @profiler.profiled("post")
+        def post(states):
+            return fsm.post(states)
+
+        @profiler.profiled("steps")
+        def steps(states, count):
+            for _ in range(count):
+                states = post(states)
+                profiler.iteration(states)
+                yield states
+
+        @profiler.profiled("consume")
+        def consume(generator):
+            return list(generator)
+
+        with profiler.profiling() as profile:
+            generator = steps(fsm.init, 3)
+            self.assertNotIn("steps", profile.stats())
+            consume(generator)
+        stats = profile.stats()
+        # One call, whose steps are charged to the generator
+        self.assertEqual(stats["steps"]["calls"], 1)
+        self.assertEqual(stats["steps"]["iterations"], 3)
+        self.assertEqual(stats["post"]["calls"], 3)
+        self.assertIn(("consume", "steps", "post"), profile.stacks)
+        self.assertNotIn(("consume", "post"), profile.stacks)
+
+
+    def test_export(self):
+        fsm = self.model()
+        spec = prop.ef(prop.Spec(parseSexp("admin = none")))
+        with profiler.profiling() as profile:
+            eval_ctl(fsm, spec)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "profile")
+            profile.write_json(path + ".json")
+            profile.write_stacks(path + ".stacks")
+            with open(path + ".stacks") as f:
+                lines = f.read().splitlines()
+            self.assertGreater(len(lines), 0)
+            for line in lines:
+                stack, elapsed = line.rsplit(" ", 1)
+                self.assertTrue(stack)
+                self.assertGreaterEqual(int(elapsed), 0)
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
@@ -0,0 +1,135 @@
+import os
+import io
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv.mc import eval_simple_expression
+
+from pynusmv_tools.mas import glob
+from pynusmv_tools.ctl.CTLcheck import check
+from pynusmv_tools.utils.results import ResultCache
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_key(self):
+        results = ResultCache(self.directory)
+        key = results.key("MODULE main", "atlk_po", "<'a'> F p", "SF")
+        self.assertEqual(key,
+                         results.key(b"MODULE main", "atlk_po", "<'a'> F p",
+                                     "SF"))
+        self.assertNotEqual(key,
+                            results.key("MODULE main ", "atlk_po",
+                                        "<'a'> F p", "SF"))
+        self.assertNotEqual(key,
+                            results.key("MODULE main", "atlk_po",
+                                        "<'a'> F p", "FS"))
+        self.assertNotEqual(results.key("", "ab", "c"),
+                            results.key("", "a", "bc"))
+
+
+    def test_get_put(self):
+        results = ResultCache(self.directory)
+        key = results.key("MODULE main", "ctl")
+        self.assertIsNone(results.get(key))
+        results.put(key, [["AG p", True]])
+        self.assertEqual(results.get(key), [["AG p", True]])
+        # Persistent
+        self.assertEqual(ResultCache(self.directory).get(key),
+                         [["AG p", True]])
+        results.clear()
+        self.assertIsNone(results.get(key))
+
+
+    def test_eviction(self):
+        results = ResultCache(self.directory, max_size=150)
+        keys = [results.key("MODULE main", str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            results.put(key, "x" * 40)
+            # Make the entries clearly ordered in time
+            os.utime(os.path.join(self.directory, key + ".json"),
+                     (i, i))
+        # The first entry is used again, the second one is the least recent
+        results.get(keys[0])
+        results.put(results.key("MODULE main", "3"), "x" * 40)
+        self.assertIsNotNone(results.get(keys[0]))
+        self.assertIsNone(results.get(keys[1]))
+
+
+    def test_temporary_files(self):
+        results = ResultCache(self.directory)
+        # A failed write leaves no temporary file behind
+        with self.assertRaises(TypeError):
+            results._write(os.path.join(self.directory, "entry.json"), 42,
+                           "w")
+        self.assertEqual(os.listdir(self.directory), [])
+        # Temporary files left behind by dead processes are removed
+        stale = os.path.join(self.directory, "stale.tmp")
+        recent = os.path.join(self.directory, "recent.tmp")
+        for path in [stale, recent]:
+            with open(path, "w") as f:
+                f.write("x" * 40)
+        os.utime(stale, (0, 0))
+        results.evict()
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(recent))
+
+
+    def test_evicted_entry(self):
+        results = ResultCache(self.directory)
+        key = results.key("MODULE main", "ctl")
+        results.put(key, True)
+        # Another process evicts the entry after it is read
+        with mock.patch("os.utime", side_effect=FileNotFoundError):
+            self.assertTrue(results.get(key))
+        # Another process evicts an entry while this one lists them
+        results.max_size = 0
+        listdir = os.listdir
+        with mock.patch("os.listdir",
+                        lambda path: listdir(path) + ["evicted.json"]):
+            results.evict()
+            results.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+    def test_bdds(self):
+        results = ResultCache(self.directory)
+        init_nusmv()
+        try:
+            glob.load_from_file("tests/pynusmv_tools/mas/cardgame.smv")
+            fsm = glob.mas()
+            key = results.key("cardgame", "reachable")
+            self.assertIsNone(results.get_bdds(key, fsm))
+            pa = eval_simple_expression(fsm, "pcard = Ac")
+            results.put_bdds(key, fsm, [fsm.reachable_states, pa])
+            self.assertEqual(results.get_bdds(key, fsm),
+                             [fsm.reachable_states, pa])
+            del fsm, pa
+        finally:
+            glob.reset_globals()
+            deinit_nusmv()
+
+
+    def test_ctl_check(self):
+        results = ResultCache(self.directory)
+        model = "tests/pynusmv_tools/ctl/admin.smv"
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            check(model, cache=results)
+        self.assertIsNotNone(results.get(results.file_key(model, "ctl")))
+
+        cached = io.StringIO()
+        with redirect_stdout(cached):
+            check(model, cache=results)
+        self.assertEqual(output.getvalue(), cached.getvalue())